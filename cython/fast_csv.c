@@ -2736,24 +2736,24 @@ static __pyx_mstatetype * const __pyx_mstate_global = &__pyx_mstate_global_stati
 #define __pyx_n_u_first_line __pyx_string_tab[37]
 #define __pyx_n_u_func __pyx_string_tab[38]
 #define __pyx_n_u_headers __pyx_string_tab[39]
-#define __pyx_n_u_ignore __pyx_string_tab[40]
-#define __pyx_n_u_int __pyx_string_tab[41]
-#define __pyx_n_u_is_coroutine __pyx_string_tab[42]
-#define __pyx_n_u_is_first __pyx_string_tab[43]
-#define __pyx_n_u_items __pyx_string_tab[44]
-#define __pyx_n_u_line __pyx_string_tab[45]
-#define __pyx_n_u_main __pyx_string_tab[46]
-#define __pyx_n_u_module __pyx_string_tab[47]
-#define __pyx_n_u_name __pyx_string_tab[48]
-#define __pyx_n_u_next __pyx_string_tab[49]
-#define __pyx_n_u_object __pyx_string_tab[50]
-#define __pyx_n_u_open __pyx_string_tab[51]
-#define __pyx_n_u_pandas __pyx_string_tab[52]
-#define __pyx_n_u_pd __pyx_string_tab[53]
-#define __pyx_n_u_pop __pyx_string_tab[54]
-#define __pyx_n_u_qualname __pyx_string_tab[55]
-#define __pyx_n_u_r __pyx_string_tab[56]
-#define __pyx_n_u_readline __pyx_string_tab[57]
+#define __pyx_n_u_int __pyx_string_tab[40]
+#define __pyx_n_u_is_coroutine __pyx_string_tab[41]
+#define __pyx_n_u_is_first __pyx_string_tab[42]
+#define __pyx_n_u_items __pyx_string_tab[43]
+#define __pyx_n_u_line __pyx_string_tab[44]
+#define __pyx_n_u_main __pyx_string_tab[45]
+#define __pyx_n_u_module __pyx_string_tab[46]
+#define __pyx_n_u_name __pyx_string_tab[47]
+#define __pyx_n_u_next __pyx_string_tab[48]
+#define __pyx_n_u_object __pyx_string_tab[49]
+#define __pyx_n_u_open __pyx_string_tab[50]
+#define __pyx_n_u_pandas __pyx_string_tab[51]
+#define __pyx_n_u_pd __pyx_string_tab[52]
+#define __pyx_n_u_pop __pyx_string_tab[53]
+#define __pyx_n_u_qualname __pyx_string_tab[54]
+#define __pyx_n_u_r __pyx_string_tab[55]
+#define __pyx_n_u_readline __pyx_string_tab[56]
+#define __pyx_n_u_replace __pyx_string_tab[57]
 #define __pyx_n_u_return __pyx_string_tab[58]
 #define __pyx_n_u_row_count __pyx_string_tab[59]
 #define __pyx_n_u_rows __pyx_string_tab[60]
@@ -2768,9 +2768,9 @@ static __pyx_mstatetype * const __pyx_mstate_global = &__pyx_mstate_global_stati
 #define __pyx_n_u_throw __pyx_string_tab[69]
 #define __pyx_n_u_value __pyx_string_tab[70]
 #define __pyx_n_u_values __pyx_string_tab[71]
-#define __pyx_kp_b_iso88591_1_a_Qj_Yj_A_HA_t6_wa __pyx_string_tab[72]
-#define __pyx_kp_b_iso88591_A_Qj_Yj_A_Qiq_AQ __pyx_string_tab[73]
-#define __pyx_kp_b_iso88591_Q_q_E_G_1_Qj_Yj_A_HA_4waq_t1_T __pyx_string_tab[74]
+#define __pyx_kp_b_iso88591_1_a_Qj_Yj_Q_HA_t6_wa __pyx_string_tab[72]
+#define __pyx_kp_b_iso88591_A_Qj_Yj_Q_Qiq_AQ __pyx_string_tab[73]
+#define __pyx_kp_b_iso88591_Q_q_E_G_1_Qj_Yj_Q_HA_4waq_t1_T __pyx_string_tab[74]
 #define __pyx_kp_b_iso88591__8 __pyx_string_tab[75]
 #define __pyx_int_0 __pyx_number_tab[0]
 #define __pyx_int_1 __pyx_number_tab[1]
@@ -3341,7 +3341,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
  *     cdef int row_count = 0
  * 
  *     if auto_detect:             # <<<<<<<<<<<<<<
- *         with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *         with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *             first_line = f.readline()
 */
   if (__pyx_v_auto_detect) {
@@ -3349,7 +3349,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
     /* "fast_csv.pyx":64
  * 
  *     if auto_detect:
- *         with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *         with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *             first_line = f.readline()
  *             delimiter = _detect_delimiter(first_line)
 */
@@ -3361,7 +3361,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
         __pyx_t_4 = __Pyx_MakeVectorcallBuilderKwds(2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 64, __pyx_L1_error)
         __Pyx_GOTREF(__pyx_t_4);
         if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_encoding, __pyx_v_encoding, __pyx_t_4, __pyx_callargs+3, 0) < (0)) __PYX_ERR(0, 64, __pyx_L1_error)
-        if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_errors, __pyx_mstate_global->__pyx_n_u_ignore, __pyx_t_4, __pyx_callargs+3, 1) < (0)) __PYX_ERR(0, 64, __pyx_L1_error)
+        if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_errors, __pyx_mstate_global->__pyx_n_u_replace, __pyx_t_4, __pyx_callargs+3, 1) < (0)) __PYX_ERR(0, 64, __pyx_L1_error)
         __pyx_t_1 = __Pyx_Object_Vectorcall_CallFromBuilder((PyObject*)__pyx_builtin_open, __pyx_callargs+__pyx_t_3, (3-__pyx_t_3) | (__pyx_t_3*__Pyx_PY_VECTORCALL_ARGUMENTS_OFFSET), __pyx_t_4);
         __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
         __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
@@ -3410,7 +3410,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
 
             /* "fast_csv.pyx":65
  *     if auto_detect:
- *         with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *         with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *             first_line = f.readline()             # <<<<<<<<<<<<<<
  *             delimiter = _detect_delimiter(first_line)
  * 
@@ -3429,11 +3429,11 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
             __pyx_t_6 = 0;
 
             /* "fast_csv.pyx":66
- *         with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *         with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *             first_line = f.readline()
  *             delimiter = _detect_delimiter(first_line)             # <<<<<<<<<<<<<<
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
 */
             __pyx_t_6 = __pyx_v_first_line;
             __Pyx_INCREF(__pyx_t_6);
@@ -3447,7 +3447,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
             /* "fast_csv.pyx":64
  * 
  *     if auto_detect:
- *         with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *         with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *             first_line = f.readline()
  *             delimiter = _detect_delimiter(first_line)
 */
@@ -3529,7 +3529,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
  *     cdef int row_count = 0
  * 
  *     if auto_detect:             # <<<<<<<<<<<<<<
- *         with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *         with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *             first_line = f.readline()
 */
   }
@@ -3537,7 +3537,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
   /* "fast_csv.pyx":68
  *             delimiter = _detect_delimiter(first_line)
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *         for line in f:
  *             line = line.rstrip('\n\r')
 */
@@ -3549,7 +3549,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
       __pyx_t_1 = __Pyx_MakeVectorcallBuilderKwds(2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 68, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_1);
       if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_encoding, __pyx_v_encoding, __pyx_t_1, __pyx_callargs+3, 0) < (0)) __PYX_ERR(0, 68, __pyx_L1_error)
-      if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_errors, __pyx_mstate_global->__pyx_n_u_ignore, __pyx_t_1, __pyx_callargs+3, 1) < (0)) __PYX_ERR(0, 68, __pyx_L1_error)
+      if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_errors, __pyx_mstate_global->__pyx_n_u_replace, __pyx_t_1, __pyx_callargs+3, 1) < (0)) __PYX_ERR(0, 68, __pyx_L1_error)
       __pyx_t_4 = __Pyx_Object_Vectorcall_CallFromBuilder((PyObject*)__pyx_builtin_open, __pyx_callargs+__pyx_t_3, (3-__pyx_t_3) | (__pyx_t_3*__Pyx_PY_VECTORCALL_ARGUMENTS_OFFSET), __pyx_t_1);
       __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
       __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
@@ -3598,7 +3598,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
 
           /* "fast_csv.pyx":69
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         for line in f:             # <<<<<<<<<<<<<<
  *             line = line.rstrip('\n\r')
  *             if not line:
@@ -3657,7 +3657,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
             __pyx_t_4 = 0;
 
             /* "fast_csv.pyx":70
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         for line in f:
  *             line = line.rstrip('\n\r')             # <<<<<<<<<<<<<<
  *             if not line:
@@ -3802,7 +3802,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
 
             /* "fast_csv.pyx":69
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         for line in f:             # <<<<<<<<<<<<<<
  *             line = line.rstrip('\n\r')
  *             if not line:
@@ -3814,7 +3814,7 @@ static PyObject *__pyx_pf_8fast_csv_fast_read_csv(CYTHON_UNUSED PyObject *__pyx_
           /* "fast_csv.pyx":68
  *             delimiter = _detect_delimiter(first_line)
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *         for line in f:
  *             line = line.rstrip('\n\r')
 */
@@ -4298,14 +4298,14 @@ static PyObject *__pyx_gb_8fast_csv_4generator(__pyx_CoroutineObject *__pyx_gene
  *     cdef bint is_first = True
  *     cdef int row_count = 0             # <<<<<<<<<<<<<<
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
 */
   __pyx_cur_scope->__pyx_v_row_count = 0;
 
   /* "fast_csv.pyx":110
  *     cdef int row_count = 0
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *         first_line = f.readline()
  *         delimiter = _detect_delimiter(first_line)
 */
@@ -4317,7 +4317,7 @@ static PyObject *__pyx_gb_8fast_csv_4generator(__pyx_CoroutineObject *__pyx_gene
       __pyx_t_4 = __Pyx_MakeVectorcallBuilderKwds(2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 110, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_4);
       if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_encoding, __pyx_cur_scope->__pyx_v_encoding, __pyx_t_4, __pyx_callargs+3, 0) < (0)) __PYX_ERR(0, 110, __pyx_L1_error)
-      if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_errors, __pyx_mstate_global->__pyx_n_u_ignore, __pyx_t_4, __pyx_callargs+3, 1) < (0)) __PYX_ERR(0, 110, __pyx_L1_error)
+      if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_errors, __pyx_mstate_global->__pyx_n_u_replace, __pyx_t_4, __pyx_callargs+3, 1) < (0)) __PYX_ERR(0, 110, __pyx_L1_error)
       __pyx_t_1 = __Pyx_Object_Vectorcall_CallFromBuilder((PyObject*)__pyx_builtin_open, __pyx_callargs+__pyx_t_3, (3-__pyx_t_3) | (__pyx_t_3*__Pyx_PY_VECTORCALL_ARGUMENTS_OFFSET), __pyx_t_4);
       __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
       __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
@@ -4365,7 +4365,7 @@ static PyObject *__pyx_gb_8fast_csv_4generator(__pyx_CoroutineObject *__pyx_gene
 
           /* "fast_csv.pyx":111
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         first_line = f.readline()             # <<<<<<<<<<<<<<
  *         delimiter = _detect_delimiter(first_line)
  *         f.seek(0)
@@ -4385,7 +4385,7 @@ static PyObject *__pyx_gb_8fast_csv_4generator(__pyx_CoroutineObject *__pyx_gene
           __pyx_t_6 = 0;
 
           /* "fast_csv.pyx":112
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         first_line = f.readline()
  *         delimiter = _detect_delimiter(first_line)             # <<<<<<<<<<<<<<
  *         f.seek(0)
@@ -4771,7 +4771,7 @@ static PyObject *__pyx_gb_8fast_csv_4generator(__pyx_CoroutineObject *__pyx_gene
           /* "fast_csv.pyx":110
  *     cdef int row_count = 0
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *         first_line = f.readline()
  *         delimiter = _detect_delimiter(first_line)
 */
@@ -5100,7 +5100,7 @@ static PyObject *__pyx_pf_8fast_csv_5detect_delimiter(CYTHON_UNUSED PyObject *__
   /* "fast_csv.pyx":148
  *         Delimitador detectado: ',', '\\t', '|', ';'
  *     """
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *         first_line = f.readline()
  *     return _detect_delimiter(first_line)
 */
@@ -5112,7 +5112,7 @@ static PyObject *__pyx_pf_8fast_csv_5detect_delimiter(CYTHON_UNUSED PyObject *__
       __pyx_t_4 = __Pyx_MakeVectorcallBuilderKwds(2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 148, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_4);
       if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_encoding, __pyx_v_encoding, __pyx_t_4, __pyx_callargs+3, 0) < (0)) __PYX_ERR(0, 148, __pyx_L1_error)
-      if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_errors, __pyx_mstate_global->__pyx_n_u_ignore, __pyx_t_4, __pyx_callargs+3, 1) < (0)) __PYX_ERR(0, 148, __pyx_L1_error)
+      if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_errors, __pyx_mstate_global->__pyx_n_u_replace, __pyx_t_4, __pyx_callargs+3, 1) < (0)) __PYX_ERR(0, 148, __pyx_L1_error)
       __pyx_t_1 = __Pyx_Object_Vectorcall_CallFromBuilder((PyObject*)__pyx_builtin_open, __pyx_callargs+__pyx_t_3, (3-__pyx_t_3) | (__pyx_t_3*__Pyx_PY_VECTORCALL_ARGUMENTS_OFFSET), __pyx_t_4);
       __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
       __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
@@ -5161,7 +5161,7 @@ static PyObject *__pyx_pf_8fast_csv_5detect_delimiter(CYTHON_UNUSED PyObject *__
 
           /* "fast_csv.pyx":149
  *     """
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         first_line = f.readline()             # <<<<<<<<<<<<<<
  *     return _detect_delimiter(first_line)
  * 
@@ -5182,7 +5182,7 @@ static PyObject *__pyx_pf_8fast_csv_5detect_delimiter(CYTHON_UNUSED PyObject *__
           /* "fast_csv.pyx":148
  *         Delimitador detectado: ',', '\\t', '|', ';'
  *     """
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *         first_line = f.readline()
  *     return _detect_delimiter(first_line)
 */
@@ -5261,7 +5261,7 @@ static PyObject *__pyx_pf_8fast_csv_5detect_delimiter(CYTHON_UNUSED PyObject *__
   }
 
   /* "fast_csv.pyx":150
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         first_line = f.readline()
  *     return _detect_delimiter(first_line)             # <<<<<<<<<<<<<<
  * 
@@ -5463,7 +5463,7 @@ static PyObject *__pyx_pf_8fast_csv_7count_rows_fast(CYTHON_UNUSED PyObject *__p
   /* "fast_csv.pyx":163
  *     cdef str line
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *         for line in f:
  *             if line.strip():
 */
@@ -5475,7 +5475,7 @@ static PyObject *__pyx_pf_8fast_csv_7count_rows_fast(CYTHON_UNUSED PyObject *__p
       __pyx_t_4 = __Pyx_MakeVectorcallBuilderKwds(2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 163, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_4);
       if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_encoding, __pyx_v_encoding, __pyx_t_4, __pyx_callargs+3, 0) < (0)) __PYX_ERR(0, 163, __pyx_L1_error)
-      if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_errors, __pyx_mstate_global->__pyx_n_u_ignore, __pyx_t_4, __pyx_callargs+3, 1) < (0)) __PYX_ERR(0, 163, __pyx_L1_error)
+      if (__Pyx_VectorcallBuilder_AddArg(__pyx_mstate_global->__pyx_n_u_errors, __pyx_mstate_global->__pyx_n_u_replace, __pyx_t_4, __pyx_callargs+3, 1) < (0)) __PYX_ERR(0, 163, __pyx_L1_error)
       __pyx_t_1 = __Pyx_Object_Vectorcall_CallFromBuilder((PyObject*)__pyx_builtin_open, __pyx_callargs+__pyx_t_3, (3-__pyx_t_3) | (__pyx_t_3*__Pyx_PY_VECTORCALL_ARGUMENTS_OFFSET), __pyx_t_4);
       __Pyx_XDECREF(__pyx_t_2); __pyx_t_2 = 0;
       __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
@@ -5524,7 +5524,7 @@ static PyObject *__pyx_pf_8fast_csv_7count_rows_fast(CYTHON_UNUSED PyObject *__p
 
           /* "fast_csv.pyx":164
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         for line in f:             # <<<<<<<<<<<<<<
  *             if line.strip():
  *                 count += 1
@@ -5583,7 +5583,7 @@ static PyObject *__pyx_pf_8fast_csv_7count_rows_fast(CYTHON_UNUSED PyObject *__p
             __pyx_t_1 = 0;
 
             /* "fast_csv.pyx":165
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         for line in f:
  *             if line.strip():             # <<<<<<<<<<<<<<
  *                 count += 1
@@ -5610,7 +5610,7 @@ static PyObject *__pyx_pf_8fast_csv_7count_rows_fast(CYTHON_UNUSED PyObject *__p
               __pyx_v_count = (__pyx_v_count + 1);
 
               /* "fast_csv.pyx":165
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         for line in f:
  *             if line.strip():             # <<<<<<<<<<<<<<
  *                 count += 1
@@ -5620,7 +5620,7 @@ static PyObject *__pyx_pf_8fast_csv_7count_rows_fast(CYTHON_UNUSED PyObject *__p
 
             /* "fast_csv.pyx":164
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:
  *         for line in f:             # <<<<<<<<<<<<<<
  *             if line.strip():
  *                 count += 1
@@ -5631,7 +5631,7 @@ static PyObject *__pyx_pf_8fast_csv_7count_rows_fast(CYTHON_UNUSED PyObject *__p
           /* "fast_csv.pyx":163
  *     cdef str line
  * 
- *     with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *     with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *         for line in f:
  *             if line.strip():
 */
@@ -6534,7 +6534,7 @@ static int __Pyx_InitCachedConstants(__pyx_mstatetype *__pyx_mstate) {
   /* "fast_csv.pyx":64
  * 
  *     if auto_detect:
- *         with open(filepath, 'r', encoding=encoding, errors='ignore') as f:             # <<<<<<<<<<<<<<
+ *         with open(filepath, 'r', encoding=encoding, errors='replace') as f:             # <<<<<<<<<<<<<<
  *             first_line = f.readline()
  *             delimiter = _detect_delimiter(first_line)
 */
@@ -6582,9 +6582,9 @@ static int __Pyx_InitCachedConstants(__pyx_mstatetype *__pyx_mstate) {
 static int __Pyx_InitConstants(__pyx_mstatetype *__pyx_mstate) {
   CYTHON_UNUSED_VAR(__pyx_mstate);
   {
-    const struct { const unsigned int length: 8; } index[] = {{1},{179},{1},{1},{1},{2},{0},{1},{8},{7},{6},{12},{2},{9},{5},{9},{20},{18},{11},{10},{18},{5},{7},{5},{15},{9},{16},{8},{9},{6},{8},{1},{8},{13},{21},{6},{8},{10},{8},{7},{6},{3},{13},{8},{5},{4},{8},{10},{8},{4},{6},{4},{6},{2},{3},{12},{1},{8},{6},{9},{4},{6},{4},{4},{12},{10},{3},{5},{8},{5},{5},{6},{64},{48},{234},{11}};
+    const struct { const unsigned int length: 8; } index[] = {{1},{179},{1},{1},{1},{2},{0},{1},{8},{7},{6},{12},{2},{9},{5},{9},{20},{18},{11},{10},{18},{5},{7},{5},{15},{9},{16},{8},{9},{6},{8},{1},{8},{13},{21},{6},{8},{10},{8},{7},{3},{13},{8},{5},{4},{8},{10},{8},{4},{6},{4},{6},{2},{3},{12},{1},{8},{7},{6},{9},{4},{6},{4},{4},{12},{10},{3},{5},{8},{5},{5},{6},{64},{48},{234},{11}};
     #if (CYTHON_COMPRESS_STRINGS) == 2 /* compression: bz2 (807 bytes) */
-const char* const cstring = "BZh91AY&SY\205h\356_\000\000T\377\377\347\377\357\376x\3675N\257\341t0\277\377\377\366@@@@@@@@@@@@@\000@\000@\002\235\232\333\001\255\2544\252x\322z&F\236Q\352\217FP\001\240=C@\r\032\006\203@\000z\201\241\352zj\rL\2314@C\024\36512\236\202h\000\000\000\000\000\000\320\320hzA\300\320\032\r\032\006M\000\006\200\003\023CM\003M\0004h\320\000\321\240\323QO\"\207\204\200\032\r\000\006\200\000\000\000\000hh\032<\223\332\221w\013L\303xM(\252$\225\302\270(P\222H\200D\304!?\225=a\310\320\036\317\325\220\255\202\301\304B\340W\337H1\215H4\003\020\0314\340\030l03I\216g\330\365:\350PAdZ':\363\037\247wr\375\316\247\267w\236\237w\267\2757\220~(\241\347\010M\212\374\227\274p\014\274\365\231-<\003\301\327>\205\024\335nW\247\256/1o\204\302\262\322\357Z=v\346&\203\nt9\203L\346\215c\362\260\205\346\370}oxes\003\3303s\320&\223vB\033\007\243k3&\351\017\341m\221\247\002\032^\320F\014\010\302H~pQ,*B\225\210\204,\264\301\370\370\362\"jU#\017>\222\335\"*K\177\014\320L\306\321\220dc\301\010J\004\217\342\222\022\263\217\257\013\025Cu\214\2636\016\362\344\0340\"uLe0\274\3164\224_i\265p5\266\365K\345\216\274\255H7\025!\213>\373H&\221=\311<\314c\367d\224\243r:\"\231,\017\r\263\260\274\204\3513\006E\306\216Q'\266\363]\275*s\336\"\360S\321\201\342a\265\212g!\001x\317n\213+\240\254Q\034\263=\317\"\273\006\032Rp\223\ri26\010\353\002\25368\360]\256\355I\211\014\025\220v\243\335T\320\252\323(D\306H\305\340(^\222\244\r\\f\023Q\233\214\261\"\213\255'@\204\002l\326\255}\321\210B\270<\205k9\345\\p\235D\325\2779`W(v),\365Z\261\026\266\316,y\261\202\036\014\264\0136\314Da\236\254\n\031\332\260Q\212+y\262\224\202\331C\321\020\304\223\206A\363_-U\332\220\216\021q\002\250^\304R\"\030P\274Dj\024\000\234\302h\256\030\021Vja\nl\366-\214C\004\260\204\014Sl\300C*X\241'\223\004\241\354\256\230\237\032#\013\356\025o\310Dh\272\212\370\217\203\2256V\014\234PUE\301\200v\025\t\304\356|\344\272>\330\201\313q\023\322u\006\255q\013\232\346\253\311\336\203\303\024\330x\237\321\321O\314\321\364]\225~n\235\264\311\245PHC\276\005""\250r\276\276e\254\351)\222\256\252\276Jnt\322\337\375\223\304m\336+\001\260c\325\204\225\021~A,\3056\315ML\204\307\t\004e\241|1\256J@\367\336\177\350<\320\007\262\233\320\215\364\023k\377\305\334\221N\024$!Z;\227\300";
+const char* const cstring = "BZh91AY&SY\327\340\214F\000\000T\377\377\347\377\357\376x\3675M\257\341t0\277\377\377\365@@@@@@@@@@@@@\000@\000@\002\234\235\267\016\235q\303Rd\320\230F\247\265M\240e\032\r\r\003# \323A\24044hi\220\310\311\206\247\242\rM\031\r\020\023\025?(\311\250\000\000d\000\000\000\000\000\006#@\324\301\022\200\003A\240= \014\200\030C@\000\320\000\006\200\032z\203ME<\223Sm\t\032z\214\200\000\000\000\r\000\000\000\000\017SOQ\24574\3146D\243\334}K\372?\201B\204\222E\000\346!\t]Q,L\215\001\354\255\007\304/\0065\t\024\201\222G\005\013V\020\363C\304\nsF(\331*\271K\213\t\352\240\272Kb\233h\341 u\322\232\311[|\266o\335\223v\245\253\364\323\300em\247\2151\372\313&*\212.\344\211\222\014&\225/\236\025\t\277%g\275\030\213\031\030W\205\266\0142\247\335\326q0\260\364VZz\353\003Gd0\372\025=\322\255A\260\332\033\375\010\202\014\350\t\034\223\020\334\254\026\261\272Y\t\207\207\213\201\005\365!\370X\344k\204\372\310\320E\344\010\302H\2378(\226\025!J\3048,\264\301\371+\343\270\211\262<\343\023\337J\322\321E\302\305\033@\212^\210w\016\344\347\237\010pA+P\216 \241\231F}9ay\207*\224\226l\304\024 \"ePiHb\326\306\222\213\257l+{R\374P\361]J\363\302\220\326\025\"\005\247r\n\017\372'\201\316Ph\332\270\3268\033\")T{m\276g\001\211\t\330\371\250T~\241\261\002\272\0330\303ej\323\210\213\201N\213\\$8\n\307\020\026\r7o3T3\030\206us\034E}u\320r\007!\241m8W\035\000\245\255\224x,\336\263\t\021\330\340\333\240\314\356es}w\264\237\023\022\342\211\000`\324\031^l\3430\267P\204\346\210\212'J'<\203\302\332+\356\345B\001K\000\342\025$\233\252\227<\302\325F\261V\214@\313U'U\311\020\353\241\276\315\226\214\201\017\006\252\213\270M\021\026\316\303c\331\222X3E1l\020\224%\3248\314\332\024\370\204\035,W$\337\250\211\302H\025R\332\022\220\220\302\205\342\"P\250\004\346\023r\267@\212\242\246\020\246\306\305\261\206\320H\367\275\242\233\344\003\363\235\310\016k\000t:\010\311\023\243D_\216\002\255\305\021\033\274#\032l\240\2613\324(Qa\025\330\346\007\001\247\335\n\221\255\325P\320\304\233\314\327\242F\340\262\"V\354\0268\322\300""\251=H=\247%\022\322P\017\013w\022\321\3703\031k\370\325$\375\277\241\211!\017\330@\204\267\3771\344\207\025\262;\205\335\215dX\263\235\323\222\013\202\256RR\013\203\255-\362;@\231\036\20713T\217Nr/>@\344\367\014Q\031,a\031\016DC\220\004{\032)\032X\224#\377\027rE8P\220\327\340\214F";
     PyObject *data = __Pyx_DecompressString(cstring, 807, 2);
     if (unlikely(!data)) __PYX_ERR(0, 1, __pyx_L1_error)
     const char* const bytes = __Pyx_PyBytes_AsString(data);
@@ -6592,15 +6592,15 @@ const char* const cstring = "BZh91AY&SY\205h\356_\000\000T\377\377\347\377\357\3
     if (likely(bytes)); else { Py_DECREF(data); __PYX_ERR(0, 1, __pyx_L1_error) }
     #endif
     #elif (CYTHON_COMPRESS_STRINGS) != 0 /* compression: zlib (727 bytes) */
-const char* const cstring = "x\332uRAO\0241\024^\222]DXd7\002\"jR\341\200\030!YC\014\t\032C\024\320\213a\215\027\2754\335\366\r[\230mg\333\016\260F\023\217s\234c\217s\344\310\221\243G\217{\234\343\376\004~\202o\006%&\352\244\323\276\366}\337\353\367\336\353\223w\332\001q]\346\310\253\201\353jE\244%\002B\331\001\303\034\204\003b\235\221\334\201)@\212\354\357\354\257mln\020\246\0041p\010\334Yb\343\016\017\231\265`\211\016H'\226\241\223\212\270A\004v\235\274\r\310@\307D\001\010\3424\211\020\367'\301uA\021\013\2560\310\nSJ;\346\244V\024\351R\035\254\020!\r^\"\217\241`\357\262\320\302\372\315/[\223\323/\231\020\024\321 \244e\235\020@\025s\300\254\243\334\036\257G\203\323\003.\355\325\251\210]\260\266\371\2329\266kX\017(\335\037\234\342\377\032\363\242\357\340\324\275/x\003\305\245^\347\332\350\030\345\203e\261\323T\200\303\333y7VG\324\312\317\300CtQ\211\362\014\343\320a\374\210\207\332\002\327a\334S\226\353X\271r\242F\237XZ\250)j\331\223X\277\253P\364z\017\212k\201)R\n\n\267\270\030\243\215\305\365T:J\203\337\251\224\253\001&\376\332\320R\027\210@B(l C\210\230\353\006\322 \246\324I\203XqJ\273\210\007c\345\201\322\006$\212\223\226^\347\211v\311@I={\305\3521L\020\277\236\026q\010\205\245\312\252),\225\356\024=\327\021\250\010\237\000\263\221\210tDi?f\341\025\310\024\352\2128\006\\l\024\326\201\226\025)\nb\212\267\024Y\200#l\214\240\024\373\376+4Z\002\233\020\207\016!%\212R\007\230\007u]d\036\2630\206r\262\303\312\322pi\353\242uy\253R\273\223\262\313\361\312\344\255\244\235\034\372\232\377\230\035\236\3378\377\372};\237\250'o\322\355\274>\223\270\364\231o\346\215\273\2769\252\316$')\033V\226\207\313\317/\266\221\377/\342\\\332N\245\357\347\325\251\341\324}\277\355\333\337\306F\325Z~=j\343\227\367+\265\371\264\235W\027<\2720p^-\243\337\370\326\317\247\233i3}\354w\262\273g\217\317\367.^\374\030\313\353\350\364\253Y+\257/\014\027V\317\232g\017G7\247\377+\370v\272\221\236x\206\002J\355\255\274\321\034\325\347\322\017~\336\367\263\261\021\036\366\363\306\242\177\2307\356\371\326\2501\237r\214\376([\312^e""\375\263\261|v\321\257d\315\014\335\263\351\236o\371\335kO\343\201o\027\032]\322\312'f\022\223.\"\277:\225<M>\245}?\356\273\031\373#\323\237R'\227\026";
+const char* const cstring = "x\332uR\277O\024A\024>\222;P9\340.*\002b2`\201\032%9C\214\211FC\370\245\r\341\214\2156\223\271\231\267\336\300\336\314\336\314,p\306\030\312-\267\234rKJJJK\313+\267\274?\201?\301\267\213\022\022u\263;\277\336\367\275\371\336\367\366\351\256v@\\\2279\2621p]\255\210\264D@(;`\230\203p@\2543\222;0\005H\221\275\255\275gk/\327\010S\202\030\330\007\356,\261q\207\207\314Z\260D\007\244\023\313\320IE\334 \002\273J\336\007d\240c\242\000\004q\232D\210\273Np]P\304\202+\026d\205)\245\035sR+\212t\251\276\254\020!\r^\"\017\241`o\263\320\302\352\315o\257nM\275eBPD\203\220\226uB\000U\214\001\263\216r{\270\032\r\216\277pi/OE\354\202g/7\231c\333\206\365\200\322\275\3011~\233X\027\335\205c\367\241\340\r\024\227z\225k\243c\224\017\226\305NS\001\016o\347\335X\035P+\277\002\0171D%\3123\214C\207\361\003\036j\013\\\207qOY\256c\345\312\201\032}di\241\246\360\262'\321\277\313T\364j\017\212k\201%R\n\n\2678\031\243\215\305\371X:J\203?\245\224\263\001&\376\332\320R\027\210@B(l C\210\230\353\006\322 \246\324I\203XqJ\273\210\007c%\312\222\226^U\210\353\022\213bz\366\022\337cX\032>=-\342\020\212\225*\375Rh\222\356\024\335\326\021\250\010\233\317l$\"\035Q\332\217Yx\t2\205\256\"\217\201(Dw\014\270\330(4\202\226\226\024\216\230\342g\212,\300\001vFP\212\215\377}\003\256\004v!\016\035BJ\024\245\016\260\020\352\272\310<da\014\345`\207\225\345\341\362\253\363\326\305t\245v/e\027\343\225[\323I;\331\3675\377)\333?\2338\373\376\243\235\337\250'\357\322\365\274>\223\270\364\205o\346\215y\337\034Ug\222\243\224\r+\017\207\017_\237\257#\377_\304\273i;\225\276\237W'\207\223\213~\335\267O\306F\325Z~\365\326\306/\026+\265\331\264\235W\347<\2060q^-\263O\234\364\363\251f\332L\237\370\255l\376\364\311\331\316\371\233\237\315\274\216A\3778k\345\365\271\341\334\343\323\346\351\322\350\346\324\177\005\337N\327\322#\317P@\251\275\2257\232\243\372\335\364\243\237\365\375ll\204\207\375\274\261\340\227\362\306}\337\0325fS\216\331\037e\313\331F\326?\035\313\357,\370\225\254\231a\370N\272\343[~\373*\322x\340\333\205F\227\264""\362\0333\211I\027\220_\235L\236'\237\323\276\037\367\335\214]\253\364\027\017\226\227\262";
     PyObject *data = __Pyx_DecompressString(cstring, 727, 1);
     if (unlikely(!data)) __PYX_ERR(0, 1, __pyx_L1_error)
     const char* const bytes = __Pyx_PyBytes_AsString(data);
     #if !CYTHON_ASSUME_SAFE_MACROS
     if (likely(bytes)); else { Py_DECREF(data); __PYX_ERR(0, 1, __pyx_L1_error) }
     #endif
-    #else /* compression: none (1046 bytes) */
-const char* const bytes = ",Note that Cython is deliberately stricter than PEP-484 and rejects subclasses of builtin types. If you need to pass subclasses then set the 'annotation_typing' directive to False.\t|;\n\r?add_notedisableenablefast_csv.pyxgcisenabledutf-8DataFrame__Pyx_PyDict_NextRefasyncio.coroutinesauto_detectchunk_sizecline_in_tracebackclosecolumnscountcount_rows_fastdelimiterdetect_delimiterencoding__enter__errors__exit__ffast_csvfast_read_csvfast_read_csv_chunkedfieldsfilepathfirst_line__func__headersignoreint_is_coroutineis_firstitemsline__main____module____name__nextobjectopenpandaspdpop__qualname__rreadlinereturnrow_countrowsrstripseeksend__set_name__setdefaultstrstrip__test__throwvaluevalues\320\000\"\320\";\2701\360\016\000\005\027\220a\360\006\000\n\016\210Q\210j\230\005\230Y\240j\260\007\260}\300A\330\010\014\210H\220A\330\014\017\210t\2206\230\021\330\020\031\230\021\340\004\017\210w\220a\320\000#\320#<\270A\360\016\000\n\016\210Q\210j\230\005\230Y\240j\260\007\260}\300A\330\010\025\220Q\220i\230q\330\004\013\320\013\034\230A\230Q\200\001\340\004\005\330\004\005\330\004\005\330\004\005\330\005\006\360\034\000\005\026\220Q\330\004\030\230\001\340\004\031\230\021\330\004\031\230\021\340\004\007\200q\330\r\021\220\021\220*\230E\240\031\250*\260G\270=\310\001\330\014\031\230\021\230)\2401\330\014\030\320\030)\250\021\250!\340\t\r\210Q\210j\230\005\230Y\240j\260\007\260}\300A\330\010\014\210H\220A\330\014\023\2204\220w\230a\230q\330\014\017\210t\2201\330\020\021\340\014\025\220T\230\026\230q\240\001\340\014\017\210q\330\020\032\230!\330\020\033\2301\340\020\026\220c\230\021\230(\240\"\240C\240q\250\001\330\024\032\230'\240\021\240!\330\020\024\220G\2301\230F\240\"\240C\240q\250\001\330\020\035\230Q\340\004\007\200t\2101\330\010\017\210r\220\032\2301\340\004\013\2102\210Z\220q\230\006\230h\240a\200\001\340\004\005\330\004\005\330\004\005";
+    #else /* compression: none (1047 bytes) */
+const char* const bytes = ",Note that Cython is deliberately stricter than PEP-484 and rejects subclasses of builtin types. If you need to pass subclasses then set the 'annotation_typing' directive to False.\t|;\n\r?add_notedisableenablefast_csv.pyxgcisenabledutf-8DataFrame__Pyx_PyDict_NextRefasyncio.coroutinesauto_detectchunk_sizecline_in_tracebackclosecolumnscountcount_rows_fastdelimiterdetect_delimiterencoding__enter__errors__exit__ffast_csvfast_read_csvfast_read_csv_chunkedfieldsfilepathfirst_line__func__headersint_is_coroutineis_firstitemsline__main____module____name__nextobjectopenpandaspdpop__qualname__rreadlinereplacereturnrow_countrowsrstripseeksend__set_name__setdefaultstrstrip__test__throwvaluevalues\320\000\"\320\";\2701\360\016\000\005\027\220a\360\006\000\n\016\210Q\210j\230\005\230Y\240j\260\007\260~\300Q\330\010\014\210H\220A\330\014\017\210t\2206\230\021\330\020\031\230\021\340\004\017\210w\220a\320\000#\320#<\270A\360\016\000\n\016\210Q\210j\230\005\230Y\240j\260\007\260~\300Q\330\010\025\220Q\220i\230q\330\004\013\320\013\034\230A\230Q\200\001\340\004\005\330\004\005\330\004\005\330\004\005\330\005\006\360\034\000\005\026\220Q\330\004\030\230\001\340\004\031\230\021\330\004\031\230\021\340\004\007\200q\330\r\021\220\021\220*\230E\240\031\250*\260G\270>\310\021\330\014\031\230\021\230)\2401\330\014\030\320\030)\250\021\250!\340\t\r\210Q\210j\230\005\230Y\240j\260\007\260~\300Q\330\010\014\210H\220A\330\014\023\2204\220w\230a\230q\330\014\017\210t\2201\330\020\021\340\014\025\220T\230\026\230q\240\001\340\014\017\210q\330\020\032\230!\330\020\033\2301\340\020\026\220c\230\021\230(\240\"\240C\240q\250\001\330\024\032\230'\240\021\240!\330\020\024\220G\2301\230F\240\"\240C\240q\250\001\330\020\035\230Q\340\004\007\200t\2101\330\010\017\210r\220\032\2301\340\004\013\2102\210Z\220q\230\006\230h\240a\200\001\340\004\005\330\004\005\330\004\005";
     PyObject *data = NULL;
     CYTHON_UNUSED_VAR(__Pyx_DecompressString);
     #endif
@@ -6715,17 +6715,17 @@ static int __Pyx_CreateCodeObjects(__pyx_mstatetype *__pyx_mstate) {
   {
     const __Pyx_PyCode_New_function_description descr = {5, 0, 0, 13, (unsigned int)(CO_OPTIMIZED|CO_NEWLOCALS), 37};
     PyObject* const varnames[] = {__pyx_mstate->__pyx_n_u_filepath, __pyx_mstate->__pyx_n_u_delimiter, __pyx_mstate->__pyx_n_u_auto_detect, __pyx_mstate->__pyx_n_u_chunk_size, __pyx_mstate->__pyx_n_u_encoding, __pyx_mstate->__pyx_n_u_rows, __pyx_mstate->__pyx_n_u_headers, __pyx_mstate->__pyx_n_u_line, __pyx_mstate->__pyx_n_u_is_first, __pyx_mstate->__pyx_n_u_row_count, __pyx_mstate->__pyx_n_u_f, __pyx_mstate->__pyx_n_u_first_line, __pyx_mstate->__pyx_n_u_fields};
-    __pyx_mstate_global->__pyx_codeobj_tab[1] = __Pyx_PyCode_New(descr, varnames, __pyx_mstate->__pyx_kp_u_fast_csv_pyx, __pyx_mstate->__pyx_n_u_fast_read_csv, __pyx_mstate->__pyx_kp_b_iso88591_Q_q_E_G_1_Qj_Yj_A_HA_4waq_t1_T, tuple_dedup_map); if (unlikely(!__pyx_mstate_global->__pyx_codeobj_tab[1])) goto bad;
+    __pyx_mstate_global->__pyx_codeobj_tab[1] = __Pyx_PyCode_New(descr, varnames, __pyx_mstate->__pyx_kp_u_fast_csv_pyx, __pyx_mstate->__pyx_n_u_fast_read_csv, __pyx_mstate->__pyx_kp_b_iso88591_Q_q_E_G_1_Qj_Yj_Q_HA_4waq_t1_T, tuple_dedup_map); if (unlikely(!__pyx_mstate_global->__pyx_codeobj_tab[1])) goto bad;
   }
   {
     const __Pyx_PyCode_New_function_description descr = {2, 0, 0, 4, (unsigned int)(CO_OPTIMIZED|CO_NEWLOCALS), 141};
     PyObject* const varnames[] = {__pyx_mstate->__pyx_n_u_filepath, __pyx_mstate->__pyx_n_u_encoding, __pyx_mstate->__pyx_n_u_f, __pyx_mstate->__pyx_n_u_first_line};
-    __pyx_mstate_global->__pyx_codeobj_tab[2] = __Pyx_PyCode_New(descr, varnames, __pyx_mstate->__pyx_kp_u_fast_csv_pyx, __pyx_mstate->__pyx_n_u_detect_delimiter, __pyx_mstate->__pyx_kp_b_iso88591_A_Qj_Yj_A_Qiq_AQ, tuple_dedup_map); if (unlikely(!__pyx_mstate_global->__pyx_codeobj_tab[2])) goto bad;
+    __pyx_mstate_global->__pyx_codeobj_tab[2] = __Pyx_PyCode_New(descr, varnames, __pyx_mstate->__pyx_kp_u_fast_csv_pyx, __pyx_mstate->__pyx_n_u_detect_delimiter, __pyx_mstate->__pyx_kp_b_iso88591_A_Qj_Yj_Q_Qiq_AQ, tuple_dedup_map); if (unlikely(!__pyx_mstate_global->__pyx_codeobj_tab[2])) goto bad;
   }
   {
     const __Pyx_PyCode_New_function_description descr = {2, 0, 0, 5, (unsigned int)(CO_OPTIMIZED|CO_NEWLOCALS), 153};
     PyObject* const varnames[] = {__pyx_mstate->__pyx_n_u_filepath, __pyx_mstate->__pyx_n_u_encoding, __pyx_mstate->__pyx_n_u_count, __pyx_mstate->__pyx_n_u_line, __pyx_mstate->__pyx_n_u_f};
-    __pyx_mstate_global->__pyx_codeobj_tab[3] = __Pyx_PyCode_New(descr, varnames, __pyx_mstate->__pyx_kp_u_fast_csv_pyx, __pyx_mstate->__pyx_n_u_count_rows_fast, __pyx_mstate->__pyx_kp_b_iso88591_1_a_Qj_Yj_A_HA_t6_wa, tuple_dedup_map); if (unlikely(!__pyx_mstate_global->__pyx_codeobj_tab[3])) goto bad;
+    __pyx_mstate_global->__pyx_codeobj_tab[3] = __Pyx_PyCode_New(descr, varnames, __pyx_mstate->__pyx_kp_u_fast_csv_pyx, __pyx_mstate->__pyx_n_u_count_rows_fast, __pyx_mstate->__pyx_kp_b_iso88591_1_a_Qj_Yj_Q_HA_t6_wa, tuple_dedup_map); if (unlikely(!__pyx_mstate_global->__pyx_codeobj_tab[3])) goto bad;
   }
   Py_DECREF(tuple_dedup_map);
   return 0;
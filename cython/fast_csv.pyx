@@ -61,11 +61,11 @@ def fast_read_csv(
     cdef int row_count = 0
 
     if auto_detect:
-        with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+        with open(filepath, 'r', encoding=encoding, errors='replace') as f:
             first_line = f.readline()
             delimiter = _detect_delimiter(first_line)
 
-    with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+    with open(filepath, 'r', encoding=encoding, errors='replace') as f:
         for line in f:
             line = line.rstrip('\n\r')
             if not line:
@@ -107,7 +107,7 @@ def fast_read_csv_chunked(
     cdef bint is_first = True
     cdef int row_count = 0
 
-    with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+    with open(filepath, 'r', encoding=encoding, errors='replace') as f:
         first_line = f.readline()
         delimiter = _detect_delimiter(first_line)
         f.seek(0)
@@ -145,7 +145,7 @@ def detect_delimiter(str filepath, str encoding='utf-8') -> str:
     Returns:
         Delimitador detectado: ',', '\\t', '|', ';'
     """
-    with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+    with open(filepath, 'r', encoding=encoding, errors='replace') as f:
         first_line = f.readline()
     return _detect_delimiter(first_line)
 
@@ -160,7 +160,7 @@ def count_rows_fast(str filepath, str encoding='utf-8') -> int:
     cdef int count = -1
     cdef str line
 
-    with open(filepath, 'r', encoding=encoding, errors='ignore') as f:
+    with open(filepath, 'r', encoding=encoding, errors='replace') as f:
         for line in f:
             if line.strip():
                 count += 1
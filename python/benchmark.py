@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Ultra Parquet Converter - Benchmark suite
+Throughput reproducible por motor, con datos sintéticos deterministas y
+baselines para detectar regresiones.
+
+Datasets (generados con semilla fija, cacheados en --data-dir):
+    narrow_numeric  CSV, 6 columnas numéricas
+    wide_string     CSV, 40 columnas de texto de baja cardinalidad
+    messy_csv       CSV sucio: espacios, números como texto, columna vacía,
+                    filas cortas y duplicados (ejercita la auto-reparación)
+    ndjson          JSON lines con tipos mixtos
+    columnar        Feather (Arrow IPC)
+
+Motores:
+    pandas     AdvancedParquetConverter en memoria, 1 worker
+    parallel   lectura CSV multi-proceso (PARALLEL_MIN_BYTES = 0)
+    streaming  AdvancedParquetConverter --streaming
+    cython     cython/fast_csv + reparación/normalización (si está compilado)
+    arrow      lectores nativos de pyarrow → pq.write_table (techo de referencia)
+
+Cada caso corre en un subproceso propio, así el pico de RSS es el del caso y
+no el acumulado de la suite. El resultado es un JSON por stdout; con
+--max-regression se compara contra el baseline y se sale con código 3 si
+algún caso pierde más de ese porcentaje de filas/s.
+"""
+
+import sys
+import os
+import json
+import argparse
+import platform
+import subprocess
+import tempfile
+import time
+import io
+import multiprocessing
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, Any, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from converter_advanced import (
+    AdvancedParquetConverter,
+    _peak_rss_bytes,
+    _repair_df,
+    _normalize_df,
+)
+
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_BASELINE = HERE.parent / 'benchmarks' / 'baseline.json'
+SEED = 20240705
+
+SIZES = {
+    'small':  10_000,
+    'medium': 200_000,
+    'large':  2_000_000,
+}
+
+# Código de salida cuando hay regresiones (distinto de un fallo de ejecución)
+EXIT_REGRESSION = 3
+
+
+# ========== GENERADORES ==========
+
+def _gen_narrow_numeric(rng: np.random.Generator, rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'id':       np.arange(rows, dtype=np.int64),
+        'amount':   rng.normal(100, 25, rows).round(2),
+        'quantity': rng.integers(0, 1000, rows),
+        'ratio':    rng.random(rows),
+        'score':    rng.integers(-50, 50, rows),
+        'flag':     rng.integers(0, 2, rows),
+    })
+
+
+def _gen_wide_string(rng: np.random.Generator, rows: int) -> pd.DataFrame:
+    vocab = np.array([f'valor_{i:03d}' for i in range(200)])
+    return pd.DataFrame({
+        f'col_{c:02d}': vocab[rng.integers(0, 10 + c * 4, rows)]
+        for c in range(40)
+    })
+
+
+def _gen_ndjson_frame(rng: np.random.Generator, rows: int) -> pd.DataFrame:
+    cities = np.array(['Madrid', 'Lima', 'Bogotá', 'CDMX', 'Santiago', 'Quito'])
+    return pd.DataFrame({
+        'id':      np.arange(rows, dtype=np.int64),
+        'city':    cities[rng.integers(0, len(cities), rows)],
+        'price':   rng.gamma(2.0, 30.0, rows).round(2),
+        'active':  rng.integers(0, 2, rows).astype(bool),
+        'created': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 86400 * 365, rows), unit='s'),
+    })
+
+
+def _write_messy_csv(path: Path, rng: np.random.Generator, rows: int):
+    """CSV con los defectos que la auto-reparación debe absorber."""
+    base = rows - rows // 20
+    df = pd.DataFrame({
+        'ID ':          np.arange(base),
+        ' Name':        np.array(['ana', 'luis', 'marta', 'jon', 'eva'])[rng.integers(0, 5, base)],
+        'Amount':       [f'  {v:.2f} ' for v in rng.normal(50, 10, base)],
+        'Empty Col':    '',
+        'Status':       np.array(['ok', 'OK ', ' ko', 'N/A'])[rng.integers(0, 4, base)],
+        'Count':        rng.integers(0, 100, base).astype(str),
+    })
+    # ~5% de filas duplicadas
+    df = pd.concat([df, df.sample(rows - base, random_state=SEED)], ignore_index=True)
+    text = df.to_csv(index=False)
+    lines = text.splitlines()
+    # Cada 97 filas, una fila corta (faltan los dos últimos campos)
+    for i in range(1, len(lines), 97):
+        lines[i] = lines[i].rsplit(',', 2)[0]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def _write_dataset(name: str, path: Path, rows: int):
+    rng = np.random.default_rng(SEED)
+    if name == 'narrow_numeric':
+        _gen_narrow_numeric(rng, rows).to_csv(path, index=False)
+    elif name == 'wide_string':
+        _gen_wide_string(rng, rows).to_csv(path, index=False)
+    elif name == 'messy_csv':
+        _write_messy_csv(path, rng, rows)
+    elif name == 'ndjson':
+        _gen_ndjson_frame(rng, rows).to_json(path, orient='records', lines=True, date_format='iso')
+    elif name == 'columnar':
+        import pyarrow.feather as feather
+        frame = pd.concat([_gen_narrow_numeric(rng, rows), _gen_wide_string(rng, rows).iloc[:, :6]], axis=1)
+        feather.write_feather(frame, path)
+    else:
+        raise ValueError(f"Dataset desconocido: {name}")
+
+
+# Dataset → extensión del archivo generado
+DATASETS = {
+    'narrow_numeric': 'csv',
+    'wide_string':    'csv',
+    'messy_csv':      'csv',
+    'ndjson':         'ndjson',
+    'columnar':       'feather',
+}
+
+# Motor → formatos que soporta
+ENGINES = {
+    'pandas':    {'csv', 'ndjson', 'feather'},
+    'parallel':  {'csv'},
+    'streaming': {'csv', 'ndjson'},
+    'cython':    {'csv'},
+    'arrow':     {'csv', 'ndjson', 'feather'},
+}
+
+
+def ensure_dataset(data_dir: Path, name: str, size: str) -> Path:
+    """Genera el dataset si no existe (mismo nombre ⇒ mismo contenido)."""
+    path = data_dir / f"{name}-{size}-{SEED}.{DATASETS[name]}"
+    if not path.exists():
+        tmp = path.with_name(path.name + '.tmp')
+        _write_dataset(name, tmp, SIZES[size])
+        os.replace(tmp, path)
+    return path
+
+
+# ========== MOTORES (se ejecutan en el subproceso) ==========
+
+def _cython_available() -> bool:
+    sys.path.insert(0, str(HERE.parent / 'cython'))
+    try:
+        import fast_csv  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _run_converter(path: Path, output: Path, workers: int, engine: str) -> int:
+    # El engine se fija: el benchmark mide cada camino, no la elección del planner
+    converter = AdvancedParquetConverter(
+        str(path), str(output), parallel_workers=workers, compression='snappy', engine=engine
+    )
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        code = converter.convert()
+    result = json.loads(buf.getvalue())
+    if code != 0:
+        raise RuntimeError(result.get('error', 'Error desconocido'))
+    return int(result['rows'])
+
+
+def _run_arrow(path: Path, output: Path, fmt: str) -> int:
+    if fmt == 'csv':
+        import pyarrow.csv as pacsv
+        # Filas cortas/largas se descartan (pandas las rellena o las salta)
+        table = pacsv.read_csv(path, parse_options=pacsv.ParseOptions(
+            invalid_row_handler=lambda row: 'skip'))
+    elif fmt == 'ndjson':
+        import pyarrow.json as pajson
+        table = pajson.read_json(path)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(path)
+    pq.write_table(table, output, compression='snappy')
+    return table.num_rows
+
+
+def _run_cython(path: Path, output: Path) -> int:
+    sys.path.insert(0, str(HERE.parent / 'cython'))
+    from fast_csv import fast_read_csv
+    df = _normalize_df(_repair_df(fast_read_csv(str(path))))
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), output, compression='snappy')
+    return len(df)
+
+
+def run_case(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Un caso: convierte `path` con `engine` y mide tiempo y memoria."""
+    path, engine, fmt = Path(spec['path']), spec['engine'], spec['format']
+    workers = int(spec.get('workers') or max(2, multiprocessing.cpu_count() - 1))
+    fd, out_name = tempfile.mkstemp(suffix='.parquet')
+    os.close(fd)
+    output = Path(out_name)
+    try:
+        start = time.perf_counter()
+        if engine == 'pandas':
+            rows = _run_converter(path, output, 1, 'in-memory')
+        elif engine == 'parallel':
+            rows = _run_converter(path, output, workers, 'parallel')
+        elif engine == 'streaming':
+            rows = _run_converter(path, output, workers, 'streaming')
+        elif engine == 'cython':
+            rows = _run_cython(path, output)
+        elif engine == 'arrow':
+            rows = _run_arrow(path, output, fmt)
+        else:
+            raise ValueError(f"Motor desconocido: {engine}")
+        seconds = time.perf_counter() - start
+        peak = max(_peak_rss_bytes(), _peak_rss_bytes(children=True))
+        return {
+            'success':     True,
+            'rows':        rows,
+            'seconds':     seconds,
+            'peak_rss_mb': peak / 1024 / 1024,
+            'output_size': output.stat().st_size,
+        }
+    except Exception as e:
+        return {'success': False, 'error': f"{type(e).__name__}: {e}"}
+    finally:
+        output.unlink(missing_ok=True)
+
+
+# ========== SUITE ==========
+
+class BenchmarkSuite:
+    """Orquesta datasets × tamaños × motores y compara contra el baseline."""
+
+    def __init__(self, datasets: List[str], sizes: List[str], engines: List[str],
+                 data_dir: Path, repeat: int = 3, workers: int = 0,
+                 verbose: bool = False):
+        self.datasets = datasets
+        self.sizes    = sizes
+        self.engines  = engines
+        self.data_dir = data_dir
+        self.repeat   = max(1, repeat)
+        self.workers  = workers
+        self.verbose  = verbose
+
+    def _log(self, message: str, level: str = "INFO"):
+        if self.verbose:
+            print(f"[{time.strftime('%H:%M:%S')}] [{level}] {message}", file=sys.stderr)
+
+    def _spawn_case(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        proc = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), '--run-case', json.dumps(spec)],
+            capture_output=True, text=True,
+        )
+        try:
+            return json.loads(proc.stdout.strip().splitlines()[-1])
+        except (IndexError, json.JSONDecodeError):
+            return {'success': False, 'error': proc.stderr.strip() or f"exit {proc.returncode}"}
+
+    def run(self) -> List[Dict[str, Any]]:
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        has_cython = _cython_available()
+        results = []
+
+        for name in self.datasets:
+            fmt = DATASETS[name]
+            for size in self.sizes:
+                path = ensure_dataset(self.data_dir, name, size)
+                input_size = path.stat().st_size
+                for engine in self.engines:
+                    key = f"{name}/{size}/{engine}"
+                    entry: Dict[str, Any] = {'case': key, 'dataset': name, 'size': size,
+                                             'engine': engine, 'input_size': input_size}
+                    if fmt not in ENGINES[engine]:
+                        results.append({**entry, 'skipped': f"{engine} no soporta {fmt}"})
+                        continue
+                    if engine == 'cython' and not has_cython:
+                        results.append({**entry, 'skipped': 'módulos Cython no compilados'})
+                        continue
+
+                    self._log(f"▶ {key} ({input_size / 1024 / 1024:.1f}MB) × {self.repeat}")
+                    spec = {'path': str(path), 'engine': engine, 'format': fmt, 'workers': self.workers}
+                    runs = [self._spawn_case(spec) for _ in range(self.repeat)]
+                    failed = next((r for r in runs if not r['success']), None)
+                    if failed:
+                        results.append({**entry, 'error': failed['error']})
+                        self._log(f"✖ {key}: {failed['error']}", "WARNING")
+                        continue
+
+                    times = sorted(r['seconds'] for r in runs)
+                    best = times[0]
+                    rows = runs[0]['rows']
+                    results.append({
+                        **entry,
+                        'rows':        rows,
+                        'seconds':     round(best, 4),
+                        'median_s':    round(times[len(times) // 2], 4),
+                        'rows_per_s':  round(rows / best, 1),
+                        'mb_per_s':    round(input_size / 1024 / 1024 / best, 2),
+                        'peak_rss_mb': round(max(r['peak_rss_mb'] for r in runs), 1),
+                        'output_size': runs[0]['output_size'],
+                    })
+                    self._log(f"✔ {key}: {rows / best:,.0f} filas/s")
+        return results
+
+    @staticmethod
+    def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+                max_regression: float) -> List[Dict[str, Any]]:
+        """Casos cuyo rows/s cae más de `max_regression` (fracción) bajo el baseline."""
+        regressions = []
+        for r in results:
+            base = baseline.get(r['case'])
+            if not base or 'rows_per_s' not in r:
+                continue
+            change = r['rows_per_s'] / base['rows_per_s'] - 1
+            r['baseline_rows_per_s'] = base['rows_per_s']
+            r['change'] = round(change, 4)
+            if change < -max_regression:
+                regressions.append({
+                    'case':     r['case'],
+                    'baseline': base['rows_per_s'],
+                    'current':  r['rows_per_s'],
+                    'change':   round(change, 4),
+                })
+        return regressions
+
+
+def _load_baseline(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('cases', {})
+    except FileNotFoundError:
+        return {}
+
+
+def _save_baseline(path: Path, results: List[Dict[str, Any]], env: Dict[str, Any]):
+    """Fusiona los casos medidos con los que ya había en el baseline."""
+    cases = _load_baseline(path)
+    for r in results:
+        if 'rows_per_s' in r:
+            cases[r['case']] = {k: r[k] for k in ('rows_per_s', 'mb_per_s', 'peak_rss_mb', 'rows')}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': env, 'cases': dict(sorted(cases.items()))}, f, indent=2)
+        f.write('\n')
+
+
+def _parse_regression(value: str) -> float:
+    """
+    Porcentaje tolerado → fracción: '10' o '10%' → 0.1, '0.5%' → 0.005.
+    Sin '%', un valor entre 0 y 1 es ambiguo (¿0.5% o 50%?) y se rechaza.
+    """
+    text = value.strip()
+    try:
+        number = float(text.rstrip('%'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"porcentaje no válido: {value!r}")
+    if not 0 <= number <= 100:
+        raise argparse.ArgumentTypeError(f"el porcentaje debe estar entre 0 y 100: {value!r}")
+    if not text.endswith('%') and 0 < number < 1:
+        raise argparse.ArgumentTypeError(
+            f"{value!r} es ambiguo: usa '{number:g}%' o '{number * 100:g}'")
+    return number / 100
+
+
+def _split(value: str, allowed, label: str) -> List[str]:
+    items = [v.strip() for v in value.split(',') if v.strip()]
+    unknown = [v for v in items if v not in allowed]
+    if unknown:
+        raise ValueError(f"{label} desconocido(s): {', '.join(unknown)} (válidos: {', '.join(allowed)})")
+    return items
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        'python':    platform.python_version(),
+        'pandas':    pd.__version__,
+        'pyarrow':   pa.__version__,
+        'numpy':     np.__version__,
+        'platform':  platform.platform(),
+        'cpu_count': multiprocessing.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ultra Parquet Converter — benchmark suite')
+    parser.add_argument('--datasets', default=','.join(DATASETS))
+    parser.add_argument('--sizes',    default='small,medium')
+    parser.add_argument('--engines',  default=','.join(ENGINES))
+    parser.add_argument('--repeat',   type=int, default=3)
+    parser.add_argument('--workers',  type=int, default=0)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'upc-bench'))
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Guarda los resultados como nuevo baseline')
+    parser.add_argument('--max-regression', type=_parse_regression, default=None,
+                        help='Falla (exit 3) si rows/s cae más de este %% bajo el baseline')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return 0
+
+    try:
+        suite = BenchmarkSuite(
+            datasets=_split(args.datasets, DATASETS, 'Dataset'),
+            sizes=_split(args.sizes, SIZES, 'Tamaño'),
+            engines=_split(args.engines, ENGINES, 'Motor'),
+            data_dir=Path(args.data_dir),
+            repeat=args.repeat,
+            workers=args.workers,
+            verbose=args.verbose,
+        )
+        env = environment()
+        results = suite.run()
+
+        baseline_path = Path(args.baseline)
+        regressions = []
+        if args.max_regression is not None:
+            regressions = BenchmarkSuite.compare(results, _load_baseline(baseline_path), args.max_regression)
+        if args.save_baseline:
+            _save_baseline(baseline_path, results, env)
+
+        print(json.dumps({
+            'success':        True,
+            'passed':         not regressions,
+            'environment':    env,
+            'baseline':       str(baseline_path),
+            'max_regression': args.max_regression,
+            'results':        results,
+            'regressions':    regressions,
+        }))
+        return EXIT_REGRESSION if regressions else 0
+
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }))
+        return 1
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
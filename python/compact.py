@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Ultra Parquet Converter - Compactación
+Une muchos archivos pequeños (CSV por hora, salidas de `batch`...) en pocos
+Parquet grandes con row groups bien dimensionados: cada archivo pequeño trae
+su propio footer y row groups diminutos, y eso ralentiza cada lectura
+posterior del dataset.
+
+    compact.py entradas... -o DIR [--target-size MB] [--row-group-size MB]
+                                  [--source-column NOMBRE] [--workers N]
+
+- Las entradas se leen en paralelo (hilos) y un único escritor las escribe en
+  orden, acumulando filas hasta completar un row group y rotando de archivo
+  (part-00000.parquet, part-00001.parquet...) al llegar al tamaño objetivo.
+- Los Parquet de entrada se leen con pyarrow, sin pasar por pandas; el resto
+  usa los lectores y la reparación de AdvancedParquetConverter con las reglas
+  del streaming (no se eliminan columnas vacías ni constantes, que en un
+  archivo pequeño lo son a menudo).
+- Esquemas: el de los Parquet se unifica antes de escribir (solo footers).
+  Si una entrada trae columnas nuevas o tipos más anchos, el archivo actual se
+  cierra y el siguiente usa el esquema unificado (`schema_changes`). Los tipos
+  en conflicto se ensanchan (int + float → float, int + texto → string).
+
+El resultado es un JSON por stdout, como converter_advanced.py.
+"""
+
+import sys
+import json
+import argparse
+import time
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from converter_advanced import AdvancedParquetConverter, CountingSink, _usable_cores
+from widening import _align_table, _widen_schemas
+
+
+PARQUET_SUFFIXES = {'.parquet', '.parq'}
+# Tamaños por defecto: archivos de 512 MB con row groups de ~128 MB sin
+# comprimir (lo habitual para que un lector paralelice por row group).
+TARGET_FILE_BYTES = 512 * 1024 * 1024
+ROW_GROUP_BYTES = 128 * 1024 * 1024
+
+
+def expand_inputs(inputs: List[str], exclude: Optional[Path] = None) -> List[Path]:
+    """
+    Archivos y directorios (recursivo, formatos soportados) en orden estable.
+    Lo que está bajo `exclude` (el directorio de salida) no es entrada: si no,
+    una segunda pasada volvería a leer los part-NNNNN.parquet de la primera.
+    """
+    extensions = {f'.{ext}' for ext in AdvancedParquetConverter.SUPPORTED_FORMATS} | PARQUET_SUFFIXES
+    excluded = exclude.resolve() if exclude is not None else None
+    files: List[Path] = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*')
+                                if p.is_file() and p.suffix.lower() in extensions))
+        elif path.is_file():
+            files.append(path)
+        else:
+            matches = sorted(Path().glob(item))
+            if not matches:
+                raise FileNotFoundError(f"Archivo no encontrado: {item}")
+            files.extend(p for p in matches if p.is_file())
+    if excluded is not None:
+        files = [p for p in files if excluded not in p.resolve().parents]
+    return files
+
+
+def _is_parquet(path: Path) -> bool:
+    return path.suffix.lower() in PARQUET_SUFFIXES
+
+
+def _decode_dictionaries(table: pa.Table) -> pa.Table:
+    """
+    category → valores: los diccionarios de cada archivo tienen índices de
+    distinto ancho y no unifican. El writer Parquet vuelve a codificar.
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+    return table
+
+
+def _source_array(name: str, rows: int) -> pa.DictionaryArray:
+    return pa.DictionaryArray.from_arrays(pa.array(np.zeros(rows, dtype=np.int32)),
+                                          pa.array([name], type=pa.string()))
+
+
+class PartWriter:
+    """
+    Escritor único y ordenado. Acumula tablas hasta `row_group_bytes` (tamaño
+    en memoria, sin comprimir) y las escribe como un solo row group; cuando el
+    archivo actual supera `target_bytes` en disco, el siguiente row group abre
+    uno nuevo.
+    """
+
+    def __init__(self, output_dir: Path, schema: Optional[pa.Schema] = None,
+                 compression: str = 'snappy', target_bytes: int = TARGET_FILE_BYTES,
+                 row_group_bytes: int = ROW_GROUP_BYTES):
+        self.output_dir      = output_dir
+        self.schema          = schema
+        self.compression     = compression
+        self.target_bytes    = target_bytes
+        self.row_group_bytes = row_group_bytes
+        self.files: List[Dict[str, Any]] = []
+        self.schema_changes  = 0
+        self._buffer: List[pa.Table] = []
+        self._buffered       = 0
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._sink: Optional[CountingSink] = None
+        self._file: Optional[Dict[str, Any]] = None
+
+    def write(self, table: pa.Table):
+        if self.schema is None:
+            self.schema = table.schema
+        elif not table.schema.equals(self.schema):
+            # Deriva entre entradas (int en una, texto en otra): se ensancha a string
+            unified = _widen_schemas([self.schema, table.schema])
+            if not unified.equals(self.schema):
+                if self._writer is not None:
+                    # Lo ya escrito conserva su esquema: se cierra el archivo
+                    self.flush()
+                    self._close()
+                    self.schema_changes += 1
+                self.schema = unified
+            table = _align_table(table, self.schema)
+        self._buffer.append(table)
+        self._buffered += table.nbytes
+        if self._buffered >= self.row_group_bytes:
+            self.flush()
+
+    def flush(self):
+        """Escribe lo acumulado como un row group."""
+        if not self._buffer:
+            return
+        table = pa.concat_tables([_align_table(t, self.schema) for t in self._buffer])
+        self._buffer, self._buffered = [], 0
+        if self._writer is None:
+            self._open()
+        self._writer.write_table(table, row_group_size=max(table.num_rows, 1))
+        self._file['rows'] += table.num_rows
+        self._file['row_groups'] += 1
+        if self._sink.bytes_written >= self.target_bytes:
+            self._close()
+
+    def _open(self):
+        path = self.output_dir / f'part-{len(self.files):05d}.parquet'
+        self._sink = CountingSink(open(path, 'wb'))
+        self._writer = pq.ParquetWriter(self._sink, self.schema, compression=self.compression)
+        self._file = {'path': str(path), 'rows': 0, 'row_groups': 0, 'bytes': 0}
+        self.files.append(self._file)
+
+    def _close(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._sink.raw.close()
+        self._file['bytes'] = self._sink.bytes_written
+        self._writer = self._sink = self._file = None
+
+    def close(self):
+        self.flush()
+        self._close()
+
+
+class Compactor:
+    """Lee las entradas en paralelo y las pasa en orden a un PartWriter."""
+
+    def __init__(self, inputs: List[Path], output_dir: Path, workers: int = 0,
+                 source_column: Optional[str] = None, compression: str = 'snappy',
+                 target_bytes: int = TARGET_FILE_BYTES, row_group_bytes: int = ROW_GROUP_BYTES,
+                 auto_repair: bool = True, auto_normalize: bool = True, verbose: bool = False,
+                 overwrite: bool = False):
+        self.inputs          = inputs
+        self.output_dir      = output_dir
+        self.overwrite       = overwrite
+        self.workers         = workers or max(1, _usable_cores() - 1)
+        self.source_column   = source_column
+        self.compression     = compression
+        self.target_bytes    = target_bytes
+        self.row_group_bytes = row_group_bytes
+        self.auto_repair     = auto_repair
+        self.auto_normalize  = auto_normalize
+        self.verbose         = verbose
+        self.errors: List[Dict[str, str]] = []
+
+    def _log(self, message: str, level: str = "INFO"):
+        if self.verbose:
+            print(f"[{time.strftime('%H:%M:%S')}] [{level}] {message}", file=sys.stderr)
+
+    def _read(self, path: Path) -> pa.Table:
+        if _is_parquet(path):
+            table = pq.read_table(path)
+        else:
+            converter = AdvancedParquetConverter(
+                str(path), auto_repair=False, auto_normalize=False,
+                parallel_workers=1, engine='in-memory',
+            )
+            df = converter.read_file()
+            # Reglas del streaming: una columna vacía o constante en un
+            # archivo pequeño no lo es en el dataset compactado
+            converter.auto_repair, converter.auto_normalize = self.auto_repair, self.auto_normalize
+            table = converter._transform_chunk(df, 0)
+        table = _decode_dictionaries(table.replace_schema_metadata(None))
+        if self.source_column:
+            if self.source_column in table.column_names:
+                table = table.drop_columns([self.source_column])
+            table = table.append_column(self.source_column, _source_array(str(path), table.num_rows))
+        return table
+
+    def _read_safe(self, path: Path) -> Optional[pa.Table]:
+        try:
+            return self._read(path)
+        except Exception as e:
+            self._log(f"{path}: {e}", "WARNING")
+            self.errors.append({'file': str(path), 'error': str(e)})
+            return None
+
+    def _initial_schema(self) -> Optional[pa.Schema]:
+        """Esquema unificado de las entradas Parquet, leído solo de los footers."""
+        schemas = []
+        for path in self.inputs:
+            if _is_parquet(path):
+                try:
+                    schemas.append(pq.read_schema(path).remove_metadata())
+                except (pa.ArrowException, OSError):
+                    continue  # el error se reporta al leerla
+        if not schemas:
+            return None
+        schema = _widen_schemas(schemas)
+        fields = [pa.field(f.name, f.type.value_type) if pa.types.is_dictionary(f.type) else f
+                  for f in schema]
+        if self.source_column:
+            fields = [f for f in fields if f.name != self.source_column]
+            fields.append(pa.field(self.source_column, pa.dictionary(pa.int32(), pa.string())))
+        return pa.schema(fields)
+
+    def _prepare_output(self):
+        """
+        Un directorio de salida con contenido mezclaría part-NNNNN de otra
+        pasada con los nuevos: se rechaza, salvo `overwrite`, que borra los
+        part-*.parquet anteriores (y solo esos).
+        """
+        if self.output_dir.exists():
+            if self.overwrite:
+                for part in self.output_dir.glob('part-*.parquet'):
+                    part.unlink()
+            elif any(self.output_dir.iterdir()):
+                raise ValueError(f"El directorio de salida no está vacío: {self.output_dir} "
+                                 f"(--overwrite reemplaza los part-*.parquet anteriores)")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def run(self) -> Dict[str, Any]:
+        start = time.time()
+        if not self.inputs:
+            raise ValueError("No hay entradas (el directorio de salida no cuenta como entrada)")
+        self._prepare_output()
+        writer = PartWriter(self.output_dir, self._initial_schema(), self.compression,
+                            self.target_bytes, self.row_group_bytes)
+        rows = compacted = 0
+        # Ventana acotada: como mucho 2 tablas por worker en memoria
+        window = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending: deque = deque()
+            inputs = iter(self.inputs)
+            try:
+                while True:
+                    while len(pending) < window:
+                        path = next(inputs, None)
+                        if path is None:
+                            break
+                        pending.append((path, pool.submit(self._read_safe, path)))
+                    if not pending:
+                        break
+                    path, future = pending.popleft()
+                    table = future.result()
+                    if table is None:
+                        continue
+                    writer.write(table)
+                    rows += table.num_rows
+                    compacted += 1
+                    self._log(f"{path} → {table.num_rows:,} filas")
+            finally:
+                writer.close()
+
+        if not compacted:
+            raise ValueError("Ninguna entrada se pudo leer")
+        input_size = sum(p.stat().st_size for p in self.inputs)
+        output_size = sum(f['bytes'] for f in writer.files)
+        return {
+            'success':        True,
+            'inputs':         len(self.inputs),
+            'compacted':      compacted,
+            'failed':         self.errors,
+            'rows':           rows,
+            'columns':        len(writer.schema),
+            'output_dir':     str(self.output_dir),
+            'output_files':   writer.files,
+            'row_groups':     sum(f['row_groups'] for f in writer.files),
+            'input_size':     input_size,
+            'output_size':    output_size,
+            'schema_changes': writer.schema_changes,
+            'workers':        self.workers,
+            'elapsed_time':   round(time.time() - start, 2),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Ultra Parquet Converter — compacta muchos archivos en pocos Parquet grandes'
+    )
+    parser.add_argument('inputs', nargs='+', help='Archivos, directorios o patrones glob')
+    parser.add_argument('-o', '--output-dir', required=True)
+    parser.add_argument('--target-size', type=int, default=TARGET_FILE_BYTES // 1024 // 1024,
+                        metavar='MB', help='Tamaño en disco a partir del cual se abre otro archivo')
+    parser.add_argument('--row-group-size', type=int, default=ROW_GROUP_BYTES // 1024 // 1024,
+                        metavar='MB', help='Tamaño en memoria (sin comprimir) de cada row group')
+    parser.add_argument('--source-column', metavar='NAME',
+                        help='Añade una columna con la ruta del archivo de origen')
+    parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--compression', default='snappy',
+                        choices=['snappy', 'gzip', 'brotli', 'zstd', 'lz4', 'none'])
+    parser.add_argument('--no-repair',    action='store_true')
+    parser.add_argument('--no-normalize', action='store_true')
+    parser.add_argument('--overwrite',    action='store_true',
+                        help='Borra los part-*.parquet de una pasada anterior en el directorio de salida')
+    parser.add_argument('-v', '--verbose', action='store_true')
+
+    args = parser.parse_args()
+
+    try:
+        output_dir = Path(args.output_dir)
+        compactor = Compactor(
+            expand_inputs(args.inputs, exclude=output_dir),
+            output_dir,
+            workers=args.workers,
+            source_column=args.source_column,
+            compression=args.compression,
+            target_bytes=args.target_size * 1024 * 1024,
+            row_group_bytes=args.row_group_size * 1024 * 1024,
+            auto_repair=not args.no_repair,
+            auto_normalize=not args.no_normalize,
+            verbose=args.verbose,
+            overwrite=args.overwrite,
+        )
+        print(json.dumps(compactor.run()))
+        return 0
+
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }))
+        return 1
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Ultra Parquet Converter - Información de archivos sin convertir
+Triage rápido: nunca lee el archivo entero salvo que sea pequeño.
+
+- Parquet: solo el footer. Esquema, filas, row groups, codecs, tamaño
+  comprimido/sin comprimir y estadísticas (min, max, nulos) por columna.
+- Feather/Arrow, ORC, SQLite: metadatos del formato (esquema y filas exactas).
+- Texto (CSV y familia, NDJSON): muestra acotada de la cabecera, reparada y
+  normalizada como en la conversión. Filas estimadas, codificación,
+  delimitador, esquema inferido y tamaño Parquet proyectado (la muestra se escribe en memoria con
+  el algoritmo que elegiría la compresión adaptativa).
+- Resto (Excel, JSON, XML...): no se pueden muestrear por trozos; se leen
+  enteros solo por debajo de FULL_READ_BYTES.
+
+El resultado es un JSON por stdout.
+"""
+
+import sys
+import io
+import csv
+import json
+import argparse
+import time
+import datetime
+import decimal
+import multiprocessing
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from converter_advanced import (
+    AdvancedParquetConverter,
+    AdaptiveCompressor,
+    ConversionPlanner,
+    _sql_identifier,
+    _utf8_head,
+)
+
+
+PARQUET_MAGIC = b'PAR1'
+SAMPLE_BYTES = ConversionPlanner.SAMPLE_BYTES
+# Formatos sin lectura por trozos: por debajo de este tamaño se leen enteros
+FULL_READ_BYTES = 32 * 1024 * 1024
+
+
+def _json_value(value):
+    """Estadísticas de Parquet → JSON (fechas en ISO, bytes como texto)."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return str(value)
+
+
+def _schema(schema: pa.Schema) -> List[Dict[str, Any]]:
+    return [{'name': f.name, 'type': str(f.type), 'nullable': f.nullable} for f in schema]
+
+
+def _is_parquet(path: Path) -> bool:
+    if path.suffix.lower() in ('.parquet', '.parq'):
+        return True
+    with open(path, 'rb') as f:
+        return f.read(4) == PARQUET_MAGIC
+
+
+def parquet_info(path: Path) -> Dict[str, Any]:
+    """Todo sale del footer: no se lee ninguna página de datos."""
+    pf = pq.ParquetFile(path)
+    meta = pf.metadata
+    columns = []
+    for j in range(meta.num_columns):
+        column = meta.schema.column(j)
+        info: Dict[str, Any] = {
+            'name':              column.path,
+            'physical_type':     column.physical_type,
+            'logical_type':      str(column.logical_type),
+            'compressed_size':   0,
+            'uncompressed_size': 0,
+            'codecs':            set(),
+            'encodings':         set(),
+        }
+        minimum = maximum = None
+        null_count, has_nulls, has_min_max = 0, True, meta.num_row_groups > 0
+        for i in range(meta.num_row_groups):
+            chunk = meta.row_group(i).column(j)
+            info['compressed_size'] += chunk.total_compressed_size
+            info['uncompressed_size'] += chunk.total_uncompressed_size
+            info['codecs'].add(chunk.compression)
+            info['encodings'].update(chunk.encodings)
+            stats = chunk.statistics if chunk.is_stats_set else None
+            if stats is None or not stats.has_null_count:
+                has_nulls = False
+            else:
+                null_count += stats.null_count
+            if stats is None or not stats.has_min_max:
+                has_min_max = False
+            elif has_min_max:
+                try:
+                    minimum = stats.min if minimum is None else min(minimum, stats.min)
+                    maximum = stats.max if maximum is None else max(maximum, stats.max)
+                except TypeError:
+                    has_min_max = False
+        info['codecs'] = sorted(info['codecs'])
+        info['encodings'] = sorted(info['encodings'])
+        info['null_count'] = null_count if has_nulls else None
+        info['min'] = _json_value(minimum) if has_min_max else None
+        info['max'] = _json_value(maximum) if has_min_max else None
+        columns.append(info)
+
+    return {
+        'format':            'parquet',
+        'exact':             True,
+        'rows':              meta.num_rows,
+        'columns':           meta.num_columns,
+        'row_groups':        meta.num_row_groups,
+        'row_group_rows':    [meta.row_group(i).num_rows for i in range(meta.num_row_groups)],
+        'created_by':        meta.created_by,
+        'format_version':    meta.format_version,
+        'codecs':            sorted({c for col in columns for c in col['codecs']}),
+        'compressed_size':   sum(c['compressed_size'] for c in columns),
+        'uncompressed_size': sum(c['uncompressed_size'] for c in columns),
+        'schema':            _schema(pf.schema_arrow.remove_metadata()),
+        'column_stats':      columns,
+    }
+
+
+def _columnar_info(path: Path, file_type: str) -> Optional[Dict[str, Any]]:
+    """Formatos con esquema y número de filas en sus metadatos."""
+    if file_type in ('feather', 'arrow'):
+        try:
+            with pa.memory_map(str(path)) as source:
+                reader = pa.ipc.open_file(source)
+                rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+                schema = reader.schema
+        except pa.ArrowInvalid:
+            return None  # Arrow en formato stream: sin índice de batches
+    elif file_type == 'orc':
+        import pyarrow.orc as orc
+        reader = orc.ORCFile(str(path))
+        rows, schema = reader.nrows, reader.schema
+    elif file_type in ('sqlite', 'db'):
+        import sqlite3
+        conn = sqlite3.connect(path)
+        try:
+            tables = [r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'")]
+            if not tables:
+                raise ValueError("No hay tablas en la base de datos")
+            table = _sql_identifier(tables[0])
+            rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            schema = pa.schema([pa.field(r[1], pa.string() if not r[2] else _sqlite_type(r[2]))
+                                for r in info])
+        finally:
+            conn.close()
+    else:
+        return None
+    return {'exact': True, 'rows': rows, 'columns': len(schema),
+            'schema': _schema(schema.remove_metadata())}
+
+
+def _sqlite_type(declared: str) -> pa.DataType:
+    """Afinidad de tipos de SQLite → Arrow (aproximada, como la lee pandas)."""
+    declared = declared.upper()
+    if 'INT' in declared:
+        return pa.int64()
+    if any(t in declared for t in ('REAL', 'FLOA', 'DOUB', 'NUM', 'DEC')):
+        return pa.float64()
+    if 'BLOB' in declared:
+        return pa.binary()
+    return pa.string()
+
+
+def _delimiter(file_type: str, text: str) -> Optional[str]:
+    known = ConversionPlanner.DELIMITERS.get(file_type)
+    if known:
+        return known
+    try:
+        return csv.Sniffer().sniff(text[:64 * 1024], delimiters=',;\t|').delimiter
+    except csv.Error:
+        return None
+
+
+def raw_info(path: Path, sample_bytes: int = SAMPLE_BYTES,
+             full_read_bytes: int = FULL_READ_BYTES) -> Dict[str, Any]:
+    converter = AdvancedParquetConverter(str(path), parallel_workers=1, engine='in-memory')
+    file_type = converter.detect_format()
+    size = path.stat().st_size
+    result: Dict[str, Any] = {'format': file_type}
+
+    columnar = _columnar_info(path, file_type)
+    if columnar is not None:
+        result.update(columnar)
+        return result
+
+    delimiter = None
+    if file_type in ConversionPlanner.STREAMABLE:
+        with open(path, 'rb') as f:
+            head = f.read(sample_bytes)
+        complete = len(head) >= size
+        result['encoding'] = converter.detect_encoding()
+        # Muestra en UTF-8; bytes/fila sobre el archivo original
+        head, sampled_bytes = _utf8_head(head, converter.encoding, complete)
+        if file_type in ('ndjson', 'jsonl'):
+            df = pd.read_json(io.BytesIO(head), lines=True, convert_dates=False,
+                              dtype_backend='pyarrow')
+        else:
+            delimiter = _delimiter(file_type, head.decode('utf-8', errors='replace'))
+            df = pd.read_csv(io.BytesIO(head), sep=delimiter, engine='c' if delimiter else 'python',
+                             encoding='utf-8', encoding_errors='replace', on_bad_lines='skip',
+                             dtype_backend='pyarrow')
+    elif size <= full_read_bytes:
+        df = converter.read_file()
+        complete, sampled_bytes = True, size
+    else:
+        result.update({'exact': False, 'sampled': False,
+                       'reason': f"{file_type} no se puede muestrear por trozos y supera "
+                                 f"{full_read_bytes // 1024 // 1024} MB"})
+        return result
+
+    # Reparación y normalización con las reglas del streaming: en una muestra,
+    # una columna vacía o constante no dice nada del resto del archivo.
+    table = converter._transform_chunk(df, 0) if file_type in ConversionPlanner.STREAMABLE \
+        else pa.Table.from_pandas(df, preserve_index=False)
+    rows = table.num_rows
+    estimated_rows = rows if complete or not rows else int(size / (sampled_bytes / rows))
+
+    algo = AdaptiveCompressor.analyze(df, size, False)['recommended'] \
+        if converter.compression == 'adaptive' else converter.compression
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression=algo)
+    projected = buffer.tell() if complete or not rows else int(buffer.tell() / rows * estimated_rows)
+
+    result.update({
+        'exact':                  complete,
+        'rows':                   estimated_rows,
+        'columns':                table.num_columns,
+        'sample_rows':            rows,
+        'sample_bytes':           sampled_bytes,
+        'schema':                 _schema(table.schema.remove_metadata()),
+        'compression':            algo,
+        'projected_parquet_size': projected,
+    })
+    if delimiter is not None:
+        result['delimiter'] = delimiter
+    if converter.stats['datetime_columns']:
+        result['datetime_columns'] = converter.stats['datetime_columns']
+    return result
+
+
+def file_info(path: str, sample_bytes: int = SAMPLE_BYTES) -> Dict[str, Any]:
+    start = time.perf_counter()
+    file = Path(path)
+    if not file.exists():
+        raise FileNotFoundError(f"Archivo no encontrado: {path}")
+    stat = file.stat()
+    info = parquet_info(file) if _is_parquet(file) else raw_info(file, sample_bytes)
+    return {
+        'success':  True,
+        'file':     str(file),
+        'size':     stat.st_size,
+        'modified': datetime.datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds'),
+        **info,
+        'elapsed_time': round(time.perf_counter() - start, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Ultra Parquet Converter — metadatos de archivos sin convertirlos'
+    )
+    parser.add_argument('inputs', nargs='+')
+    parser.add_argument('--sample-bytes', type=int, default=SAMPLE_BYTES // 1024, metavar='KB',
+                        help='Cabecera muestreada en formatos de texto')
+
+    args = parser.parse_args()
+    sample_bytes = args.sample_bytes * 1024
+
+    if len(args.inputs) > 1:
+        # Triage de muchos archivos en un solo proceso: un error no corta el resto
+        files = []
+        for path in args.inputs:
+            try:
+                files.append(file_info(path, sample_bytes))
+            except Exception as e:
+                files.append({"success": False, "file": path, "error": str(e),
+                              "error_type": type(e).__name__})
+        print(json.dumps({"success": True, "files": files}))
+        return 0
+
+    try:
+        print(json.dumps(file_info(args.inputs[0], sample_bytes)))
+        return 0
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "error": str(e),
+            "error_type": type(e).__name__
+        }))
+        return 1
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Ultra Parquet Converter - Proyección y filtro de filas (--columns, --filter)
+
+Python puro (ast + operator sobre pandas/pyarrow), sin el resto del
+conversor: lo cargan tanto converter_advanced.py como el núcleo de Pyodide
+(pyodide_convert.py), así un mismo --filter selecciona las mismas filas y un
+mismo --columns las mismas columnas en todos los backends.
+"""
+
+import re
+import ast
+import operator
+from functools import reduce
+from typing import Optional, Dict, Any, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+from pandas.api import types as ptypes
+
+
+def _is_text_dtype(dtype) -> bool:
+    """object (pandas < 3), str/string (python o pyarrow) o ArrowDtype de texto."""
+    return ptypes.is_string_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype)
+
+
+def _normalize_name(name) -> str:
+    """Nombre de columna tal como lo deja la normalización."""
+    return str(name).strip().lower().replace(' ', '_')
+
+
+def _sql_identifier(name) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class RowFilter:
+    """
+    Expresión de --filter: subconjunto de la sintaxis de DataFrame.query.
+    Comparaciones (==, !=, <, <=, >, >=, in, not in) entre una columna y un
+    literal, combinadas con and / or / not; `col == None` es IS NULL y los
+    nombres con espacios van entre backticks. Se traduce a una expresión de
+    pyarrow (datasets y lector CSV de Arrow), a un WHERE de SQLite con
+    parámetros y a una máscara de pandas. Los nulos siguen la lógica de SQL:
+    una comparación con null no selecciona la fila (tampoco bajo `not`).
+    """
+
+    _OPS = {ast.Eq: '==', ast.NotEq: '!=', ast.Lt: '<', ast.LtE: '<=',
+            ast.Gt: '>', ast.GtE: '>=', ast.In: 'in', ast.NotIn: 'not in'}
+    _FLIPPED = {'==': '==', '!=': '!=', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+    _PY = {'==': operator.eq, '!=': operator.ne, '<': operator.lt,
+           '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+    _SQL = {'==': '=', '!=': '<>', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.columns: List[str] = []
+        # Nombre usado en la expresión → nombre en el archivo (Projection.resolve)
+        self.names: Dict[str, Any] = {}
+        self._quoted: Dict[str, str] = {}
+        source = re.sub(r'`([^`]*)`', self._quote, expression).strip()
+        try:
+            tree = ast.parse(source, mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Filtro inválido: {expression} ({e.msg})")
+        self.tree = self._compile(tree.body)
+
+    def _quote(self, match) -> str:
+        key = f"__col{len(self._quoted)}__"
+        self._quoted[key] = match.group(1)
+        return key
+
+    def _compile(self, node):
+        if isinstance(node, ast.BoolOp):
+            kind = 'and' if isinstance(node.op, ast.And) else 'or'
+            return (kind, [self._compile(v) for v in node.values])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ('not', self._compile(node.operand))
+        if isinstance(node, ast.Compare):
+            # a < b < c → (a < b) and (b < c)
+            parts, left = [], node.left
+            for op, right in zip(node.ops, node.comparators):
+                parts.append(self._comparison(left, op, right))
+                left = right
+            return parts[0] if len(parts) == 1 else ('and', parts)
+        raise ValueError(f"Filtro no soportado: {self.expression}")
+
+    def _comparison(self, left, op, right):
+        name = self._OPS.get(type(op))
+        if name is None:
+            raise ValueError(f"Operador no soportado en el filtro: {self.expression}")
+        if isinstance(left, ast.Name):
+            column, value = self._column(left), self._literal(right)
+        elif isinstance(right, ast.Name) and name in self._FLIPPED:
+            column, value, name = self._column(right), self._literal(left), self._FLIPPED[name]
+        else:
+            raise ValueError(f"Cada comparación del filtro necesita una columna y un literal: {self.expression}")
+        if name in ('in', 'not in') and not isinstance(value, list):
+            raise ValueError(f"'{name}' espera una lista: {self.expression}")
+        if value is None and name not in ('==', '!='):
+            raise ValueError(f"None solo admite == / != : {self.expression}")
+        return ('cmp', name, column, value)
+
+    def _column(self, node) -> str:
+        column = self._quoted.get(node.id, node.id)
+        if column not in self.columns:
+            self.columns.append(column)
+        return column
+
+    def _literal(self, node):
+        try:
+            value = ast.literal_eval(node)
+        except ValueError:
+            raise ValueError(f"Se esperaba un literal en el filtro: {ast.unparse(node)}")
+        return list(value) if isinstance(value, (list, tuple, set)) else value
+
+    def _walk(self, node, combine, compare):
+        kind = node[0]
+        if kind == 'cmp':
+            return compare(*node[1:])
+        if kind == 'not':
+            return combine('not', [self._walk(node[1], combine, compare)])
+        return combine(kind, [self._walk(n, combine, compare) for n in node[1]])
+
+    def _name(self, column: str):
+        return self.names.get(column, column)
+
+    # ── Traducciones ──
+
+    def to_arrow(self, schema: Optional[pa.Schema] = None):
+        """pc.Expression; con `schema` los literales se castean al tipo de la columna."""
+        import pyarrow.compute as pc
+        def literal(value, column):
+            array = pa.array(value if isinstance(value, list) else [value])
+            if schema is not None and column in schema.names:
+                target = schema.field(column).type
+                # Un número contra una columna de texto no se castea a string
+                # (compararía como texto): que falle y lo resuelva pandas.
+                if not (pa.types.is_string(target) or pa.types.is_large_string(target)) \
+                        or pa.types.is_string(array.type):
+                    try:
+                        array = array.cast(target)
+                    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                        pass
+            return array if isinstance(value, list) else array[0]
+
+        def compare(op, column, value):
+            name = self._name(column)
+            field = pc.field(name)
+            if value is None:
+                return field.is_null() if op == '==' else field.is_valid()
+            if op in ('in', 'not in'):
+                # isin da False (no null) con nulls: se excluyen aparte
+                found = field.isin(literal(value, name)) & field.is_valid()
+                return ~found & field.is_valid() if op == 'not in' else found
+            return self._PY[op](field, literal(value, name))
+
+        def combine(kind, parts):
+            if kind == 'not':
+                return ~parts[0]
+            return reduce(operator.and_ if kind == 'and' else operator.or_, parts)
+
+        return self._walk(self.tree, combine, compare)
+
+    def to_sql(self) -> Tuple[str, list]:
+        """(cláusula WHERE, parámetros) para sqlite3."""
+        params: list = []
+
+        def compare(op, column, value):
+            ident = _sql_identifier(self._name(column))
+            if value is None:
+                return f"{ident} IS NULL" if op == '==' else f"{ident} IS NOT NULL"
+            if op in ('in', 'not in'):
+                params.extend(value)
+                marks = ', '.join('?' * len(value))
+                return f"{ident} {'NOT IN' if op == 'not in' else 'IN'} ({marks})"
+            params.append(value)
+            return f"{ident} {self._SQL[op]} ?"
+
+        def combine(kind, parts):
+            if kind == 'not':
+                return f"(NOT {parts[0]})"
+            return '(' + f' {kind.upper()} '.join(parts) + ')'
+
+        return self._walk(self.tree, combine, compare), params
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        """Máscara booleana con lógica de tres valores (NA) hasta el final."""
+        def compare(op, column, value):
+            series = df[self._name(column)]
+            if value is None:
+                result = series.isna() if op == '==' else series.notna()
+                return result.astype('boolean')
+            if op in ('in', 'not in'):
+                result = series.isin(value).astype('boolean')
+                result[series.isna()] = pd.NA
+                return ~result if op == 'not in' else result
+            series, value = self._coerce(series, value)
+            result = self._PY[op](series, value).astype('boolean')
+            # NaN de numpy compara como False, no como NA: también es null
+            result[series.isna()] = pd.NA
+            return result
+
+        def combine(kind, parts):
+            if kind == 'not':
+                return ~parts[0]
+            return reduce(operator.and_ if kind == 'and' else operator.or_, parts)
+
+        return self._walk(self.tree, combine, compare).fillna(False).astype(bool)
+
+    @staticmethod
+    def _coerce(series: pd.Series, value):
+        """Texto crudo vs número → numérico; fecha vs string → Timestamp."""
+        if isinstance(value, (int, float)) and not isinstance(value, bool) \
+                and _is_text_dtype(series.dtype):
+            return pd.to_numeric(series.astype(str).str.strip(), errors='coerce'), value
+        if isinstance(value, str) and ptypes.is_datetime64_any_dtype(series.dtype):
+            stamp = pd.Timestamp(value)
+            tz = getattr(series.dtype, 'tz', None) or getattr(
+                getattr(series.dtype, 'pyarrow_dtype', None), 'tz', None)
+            if tz and stamp.tzinfo is None:
+                stamp = stamp.tz_localize(tz)
+            return series, stamp
+        return series, value
+
+
+class Projection:
+    """
+    --columns y --filter. Los nombres pedidos casan con los del archivo tal
+    cual o en su forma normalizada (los que salen en el Parquet). Cada lector
+    empuja lo que su formato permite (usecols, include_columns, SELECT ...
+    WHERE, filtros de dataset) y apply() completa el resto tras la lectura:
+    filtra si el lector no lo hizo y deja las columnas pedidas en su orden.
+    """
+
+    def __init__(self, columns: Optional[List[str]] = None,
+                 row_filter: Optional[str] = None):
+        self.columns = [c.strip() for c in columns if c.strip()] if columns else None
+        self.filter = RowFilter(row_filter) if row_filter else None
+        self.names: Dict[str, Any] = {}
+
+    @property
+    def active(self) -> bool:
+        return bool(self.columns or self.filter)
+
+    @property
+    def requested(self) -> List[str]:
+        """Columnas a leer: las pedidas más las que usa el filtro."""
+        names = list(self.columns or [])
+        if self.filter:
+            names += [c for c in self.filter.columns if c not in names]
+        return names
+
+    def matches(self, name) -> bool:
+        """Predicado para usecols cuando la cabecera no se conoce de antemano."""
+        wanted = self.requested
+        return str(name) in wanted or _normalize_name(name) in {_normalize_name(c) for c in wanted}
+
+    def resolve(self, available, names: Optional[List[str]] = None) -> Optional[List[Any]]:
+        """
+        Columnas del archivo a leer, en su orden; None si hacen falta todas.
+        `names` limita la comprobación (por defecto, pedidas + filtro).
+        """
+        available = list(available)
+        exact = {str(c): c for c in available}
+        normalized: Dict[str, Any] = {}
+        for c in available:
+            normalized.setdefault(_normalize_name(c), c)
+        missing = []
+        for name in self.requested if names is None else names:
+            actual = exact.get(name, normalized.get(_normalize_name(name)))
+            if actual is None:
+                missing.append(name)
+            else:
+                self.names[name] = actual
+        if missing:
+            raise ValueError(f"Columnas no encontradas: {', '.join(missing)}")
+        if self.filter:
+            self.filter.names = self.names
+        if not self.columns:
+            return None
+        wanted = set(self.names.values())
+        return [c for c in available if c in wanted]
+
+    def output(self) -> Optional[List[Any]]:
+        """Columnas de salida (nombres del archivo) en el orden pedido."""
+        if not self.columns:
+            return None
+        return list(dict.fromkeys(self.names[c] for c in self.columns))
+
+    def apply(self, df: pd.DataFrame, filtered: bool = False) -> pd.DataFrame:
+        if not self.active:
+            return df
+        # Con el filtro ya aplicado sus columnas pueden no haberse leído
+        self.resolve(df.columns, self.columns if filtered else None)
+        if self.filter and not filtered:
+            df = df[self.filter.mask(df)]
+        columns = self.output()
+        if columns is not None and list(df.columns) != columns:
+            df = df[columns]
+        return df
@@ -5,26 +5,46 @@ Single source of truth for the WASM path. Loaded verbatim into Pyodide by BOTH:
   - the Node.js backend  (src/backends/pyodide-backend.ts)
   - the browser worker   (web/worker.js)
 
-Data is injected through Pyodide globals — NOT string interpolation into source:
-  - text mode   → global `_upc_text`  (str)
-  - binary mode → global `_upc_bytes` (bytes-like, written via FS or globals)
-
-The entry point `upc_convert(mode, auto_repair, compression)` returns a JSON string.
+Data moves through the Pyodide virtual filesystem — NOT through JS strings or
+JSON arrays:
+  - input  → the caller streams the payload in chunks into `input_path`
+             (FS.open/FS.write), so no single JS string has to hold the file.
+  - output → the Parquet file is written to `output_path`; the caller reads it
+             back with FS.readFile() as a Uint8Array and can transfer its buffer.
+
+The entry point `upc_convert(mode, auto_repair, compression, input_path,
+output_path, columns, row_filter)` returns a small JSON string with the
+conversion stats only.
+`upc_merge(part_paths, output_path, compression)` stitches the shard outputs
+of a worker pool (web/pyodide-loader.js) into a single Parquet file.
 Keeping everything in one real .py file means there is no duplicated Python
 codegen to drift between the two callers, and no fragile escaping.
 """
 
 import json
-from io import StringIO, BytesIO
+import os
 
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+# Shared with the native converter; the host bundles python/projection.py and
+# python/widening.py ahead of this file (see loadPyodideSource / web/worker.js).
+from projection import Projection
+from widening import _align_table, _widen_schemas
+
 
 # Pyodide cannot use zstd/brotli/lz4 codecs reliably; snappy/gzip/none are safe.
 _SAFE_CODECS = {"snappy", "gzip", "none"}
 
+# Default locations inside the Emscripten MEMFS.
+WORK_DIR = "/upc"
+INPUT_PATH = WORK_DIR + "/input"
+OUTPUT_PATH = WORK_DIR + "/output.parquet"
+
+# Bytes sniffed from the head of the input to pick a reader.
+_SNIFF_BYTES = 4096
+
 
 def _normalize_compression(compression):
     """Map requested compression to a codec Pyodide/pyarrow-wasm supports."""
@@ -33,76 +53,155 @@ def _normalize_compression(compression):
     return compression if compression in _SAFE_CODECS else "snappy"
 
 
-def _read_text(data_str):
-    """Detect CSV / TSV / PSV / JSON from a text payload and return a DataFrame."""
-    stripped = data_str.lstrip()
+def _sniff_text(path):
+    """Return the first decoded characters of a text payload (BOM-safe)."""
+    with open(path, "rb") as f:
+        head = f.read(_SNIFF_BYTES)
+    return head.decode("utf-8-sig", errors="ignore")
+
+
+def _read_text(path):
+    """Detect CSV / TSV / PSV / JSON / NDJSON from a text file and return a DataFrame."""
+    head = _sniff_text(path)
+    stripped = head.lstrip()
+    first_line = head.split("\n", 1)[0]
+
+    lines = [l.strip() for l in stripped.splitlines() if l.strip()]
+    if len(lines) > 1 and lines[0].startswith("{") and lines[0].endswith("}"):
+        return pd.read_json(path, lines=True), "ndjson"
     if stripped[:1] in ("[", "{"):
-        return pd.read_json(StringIO(data_str)), "json"
+        return pd.read_json(path), "json"
 
-    first_line = data_str.split("\n", 1)[0]
     if "\t" in first_line:
-        return pd.read_csv(StringIO(data_str), sep="\t"), "tsv"
+        return pd.read_csv(path, sep="\t"), "tsv"
     if "|" in first_line:
-        return pd.read_csv(StringIO(data_str), sep="|"), "psv"
-    return pd.read_csv(StringIO(data_str)), "csv"
+        return pd.read_csv(path, sep="|"), "psv"
+    return pd.read_csv(path), "csv"
 
 
-def _read_binary(raw):
-    """Read Excel first, fall back to Parquet, from a bytes payload."""
-    buffer = BytesIO(raw)
+def _read_binary(path):
+    """Read Excel first, fall back to Parquet, from a binary file."""
     try:
-        return pd.read_excel(buffer), "excel"
+        return pd.read_excel(path), "excel"
     except Exception:
-        buffer.seek(0)
         try:
-            return pd.read_parquet(buffer), "parquet"
+            return pd.read_parquet(path), "parquet"
         except Exception:
             raise ValueError("Binary format not supported (Excel/Parquet only)")
 
 
-def upc_convert(mode, auto_repair=True, compression="snappy"):
+def _project(df, columns=None, row_filter=None):
     """
-    Convert the injected payload to Parquet bytes.
+    Apply --columns / --filter after the read (there is no pushdown here)
+    with the native converter's Projection: the same filter subset with SQL
+    null logic, and names matched as-is or in their normalized form.
+    """
+    return Projection(columns, row_filter).apply(df)
+
+
+def prepare_workspace():
+    """Create the MEMFS work dir and remove leftovers from a previous call."""
+    os.makedirs(WORK_DIR, exist_ok=True)
+    for path in (INPUT_PATH, OUTPUT_PATH):
+        if os.path.exists(path):
+            os.remove(path)
+    return WORK_DIR
+
+
+def upc_convert(mode, auto_repair=True, compression="snappy",
+                input_path=INPUT_PATH, output_path=OUTPUT_PATH,
+                columns=None, row_filter=None):
+    """
+    Convert the file at `input_path` to Parquet at `output_path`.
+
+    The input file is removed once it has been parsed so MEMFS does not hold
+    the raw payload and the Parquet output at the same time.
 
     Returns a JSON string with either:
       {success: True, rows, columns, input_size, output_size,
-       compression_ratio, compression_used, file_type, parquet_bytes}
+       compression_ratio, compression_used, file_type, output_path}
     or:
       {success: False, error}
     """
     result = {"success": False, "error": "Unknown error"}
     try:
+        input_size = os.path.getsize(input_path)
         if mode == "binary":
-            raw = bytes(globals()["_upc_bytes"])
-            df, file_type = _read_binary(raw)
-            input_size = len(raw)
+            df, file_type = _read_binary(input_path)
         else:
-            data_str = globals()["_upc_text"]
-            df, file_type = _read_text(data_str)
-            input_size = len(data_str)
+            df, file_type = _read_text(input_path)
+        os.remove(input_path)
+        df = _project(df, columns, row_filter)
 
         if auto_repair:
-            df = df.dropna(axis=1, how="all")
+            # Requested columns stay even if the filter left them empty
+            if not (columns or row_filter):
+                df = df.dropna(axis=1, how="all")
             df = df.drop_duplicates()
 
         codec = _normalize_compression(compression)
         table = pa.Table.from_pandas(df, preserve_index=False)
-        out = BytesIO()
-        pq.write_table(table, out, compression=codec)
-        parquet_bytes = out.getvalue()
+        del df
+        pq.write_table(table, output_path, compression=codec)
+        output_size = os.path.getsize(output_path)
 
         result = {
             "success": True,
-            "rows": int(len(df)),
-            "columns": int(len(df.columns)),
+            "rows": int(table.num_rows),
+            "columns": int(table.num_columns),
             "input_size": int(input_size),
-            "output_size": int(len(parquet_bytes)),
-            "compression_ratio": round((1 - len(parquet_bytes) / max(input_size, 1)) * 100, 2),
+            "output_size": int(output_size),
+            "compression_ratio": round((1 - output_size / max(input_size, 1)) * 100, 2),
             "compression_used": codec,
             "file_type": file_type,
-            "parquet_bytes": list(parquet_bytes),
+            "output_path": output_path,
         }
     except Exception as exc:  # noqa: BLE001 — surface any failure as JSON
         result = {"success": False, "error": str(exc)}
 
     return json.dumps(result)
+
+
+# ── Shard stitching (worker pool) ─────────────────────────────────────────────
+
+def upc_merge(part_paths, output_path=OUTPUT_PATH, compression="snappy"):
+    """
+    Concatenate the row groups of several shard Parquet files into one file.
+
+    Only footers are read up front (to widen the schema, as the native
+    converter does); row groups are then copied one at a time, so peak
+    memory is one row group, not the dataset.
+    Shard files are removed as soon as they have been copied.
+
+    Returns a JSON string with {success, rows, columns, row_groups,
+    output_size, compression_used, output_path} or {success: False, error}.
+    """
+    part_paths = list(part_paths)
+    try:
+        codec = _normalize_compression(compression)
+        schema = _widen_schemas(pq.read_schema(p).remove_metadata() for p in part_paths)
+        rows = row_groups = 0
+        writer = pq.ParquetWriter(output_path, schema, compression=codec)
+        try:
+            for path in part_paths:
+                part = pq.ParquetFile(path)
+                for i in range(part.num_row_groups):
+                    table = _align_table(part.read_row_group(i), schema)
+                    writer.write_table(table)
+                    rows += table.num_rows
+                    row_groups += 1
+                os.remove(path)
+        finally:
+            writer.close()
+
+        return json.dumps({
+            "success": True,
+            "rows": int(rows),
+            "columns": len(schema),
+            "row_groups": row_groups,
+            "output_size": int(os.path.getsize(output_path)),
+            "compression_used": codec,
+            "output_path": output_path,
+        })
+    except Exception as exc:  # noqa: BLE001 — surface any failure as JSON
+        return json.dumps({"success": False, "error": str(exc)})
@@ -73,6 +73,7 @@ export class CythonBackend implements BackendInterface {
           CYTHON_MODULES: modules.join(','),
         },
       },
+      options?.onProgress,
     );
   }
 
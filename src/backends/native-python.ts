@@ -35,6 +35,20 @@ export function buildPythonArgs(
   }
   args.push('--compression', compression);
 
+  if (options?.memoryLimit)  args.push('--memory-limit', String(options.memoryLimit));
+  if (options?.engine && options.engine !== 'auto') args.push('--engine', options.engine);
+  if (options?.explain)      args.push('--explain');
+  if (options?.columns?.length) args.push('--columns', options.columns.join(','));
+  if (options?.filter)       args.push('--filter', options.filter);
+  if (options?.inputFormat)  args.push('--format', options.inputFormat);
+  if (options?.profile)      args.push('--profile');
+  if (options?.profileTrace) args.push('--profile-trace', options.profileTrace);
+  if (options?.progress || options?.onProgress) args.push('--progress');
+  if (options?.metricsFile)  args.push('--metrics-file', options.metricsFile);
+  if (options?.encoding)     args.push('--encoding', options.encoding);
+  if (options?.sample != null) args.push('--sample', String(options.sample));
+  if (options?.sampleSeed != null) args.push('--seed', String(options.sampleSeed));
+
   return args;
 }
 
@@ -51,7 +65,7 @@ export class NativePythonBackend implements BackendInterface {
       execError:       (m) => `Error ejecutando Python: ${m}`,
       parseError:      (e) => `Error al parsear respuesta: ${e.message}`,
       nonZeroCode:     (code) => `Error (código ${code})`,
-    });
+    }, undefined, options?.onProgress);
   }
 
   private getPythonCommand(): string {
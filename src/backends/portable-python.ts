@@ -35,7 +35,7 @@ export class PortablePythonBackend implements BackendInterface {
       execError:       (m) => `Error Python: ${m}`,
       parseError:      (e) => `Error al parsear: ${e.message}`,
       nonZeroCode:     (code) => `Error (código ${code})`,
-    });
+    }, undefined, options?.onProgress);
   }
 
   static async isAvailable(): Promise<boolean> {
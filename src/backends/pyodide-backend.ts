@@ -6,12 +6,16 @@
  *    convierte y ESCRIBE el .parquet a disco. Cumple BackendInterface, así que
  *    el selector puede enrutar a WASM sin romperse.
  *  - convertData(data, options)    → API de datos (browser/programático): sin
- *    filesystem; devuelve parquet_bytes.
+ *    filesystem del host; devuelve parquet_bytes como Uint8Array.
  *  - El código Python vive en python/pyodide_convert.py (fuente ÚNICA, sin
  *    duplicación con web/worker.js). Se carga una vez y se define upc_convert.
- *  - Los datos se inyectan por globals de Pyodide (texto) y toPy/bytes (binario),
- *    NO por interpolación de string → sin escaping frágil ni bytes([...]) gigante.
- *  - loader / logger / sourceLoader / indexURL inyectables → 100% testeable.
+ *  - Los datos viajan por el FS virtual de Pyodide (MEMFS): la entrada se
+ *    escribe por chunks (acepta streams) y la salida se lee con FS.readFile →
+ *    Uint8Array transferible. Nada de `list(bytes)` en JSON ni strings gigantes.
+ *  - Arranque en caliente: el intérprete se comparte entre instancias del
+ *    proceso (mismo loader + indexURL) y los paquetes se cachean en disco
+ *    (packageCacheDir).
+ *  - loader / logger / sourceLoader / indexURL / cache inyectables → 100% testeable.
  */
 
 import { ConversionOptions, ConversionResult } from '../types';
@@ -19,12 +23,19 @@ import {
   isNodeRuntime,
   defaultIndexURL,
   loadPyodideSource,
+  defaultCacheDir,
+  PyodideCache,
 } from '../utils/runtime';
 
 // ─── Types ────────────────────────────────────────────────────────────────────
 
+export interface PyodideLoadOptions {
+  indexURL: string;
+  packageCacheDir?: string;
+}
+
 export type PyodideLoader = () => Promise<{
-  loadPyodide: (opts: { indexURL: string }) => Promise<PyodideInstance>;
+  loadPyodide: (opts: PyodideLoadOptions) => Promise<PyodideInstance>;
 }>;
 
 export interface PyodideLogger {
@@ -33,12 +44,28 @@ export interface PyodideLogger {
   error(msg: string): void;
 }
 
+/** Subconjunto del FS de Emscripten que usamos para mover datos sin copias JSON. */
+export interface PyodideFS {
+  open(path: string, flags: string): unknown;
+  write(stream: unknown, buffer: Uint8Array, offset: number, length: number): number;
+  close(stream: unknown): void;
+  readFile(path: string): Uint8Array;
+  unlink(path: string): void;
+}
+
 interface PyodideInstance {
   loadPackage(packages: readonly string[]): Promise<void>;
   runPythonAsync(code: string): Promise<string>;
   runPython(code: string): unknown;
-  toPy(obj: unknown): unknown;
-  globals: { set(name: string, value: unknown): void };
+  FS: PyodideFS;
+}
+
+/** Intérprete compartido por todas las instancias con el mismo loader + indexURL. */
+interface SharedRuntime {
+  pyodide: PyodideInstance;
+  sourceLoaded: boolean;
+  /** Serializa conversiones: todas usan las mismas rutas de MEMFS. */
+  lock: Promise<unknown>;
 }
 
 interface PyodideRawResult {
@@ -50,10 +77,21 @@ interface PyodideRawResult {
   compression_ratio: number;
   compression_used: string;
   file_type: string;
-  parquet_bytes: number[];
+  output_path?: string;
   error?: string;
 }
 
+/**
+ * Entrada aceptada por convertData: texto, binario o un stream de chunks
+ * (p. ej. fs.createReadStream, ReadableStream del navegador) para archivos que
+ * no caben en un único string de JS.
+ */
+export type PyodideInput =
+  | string
+  | ArrayBuffer
+  | Uint8Array
+  | AsyncIterable<string | Uint8Array>;
+
 // ─── Constants ────────────────────────────────────────────────────────────────
 
 const REQUIRED_PACKAGES = ['pandas', 'pyarrow', 'numpy'] as const;
@@ -66,6 +104,13 @@ const LIMITATIONS       = [
 /** Extensiones que deben leerse como binario (Excel/Parquet). */
 const BINARY_EXTENSIONS = new Set(['.xlsx', '.xls', '.parquet', '.feather', '.arrow', '.orc']);
 
+/** Rutas en MEMFS — deben coincidir con INPUT_PATH/OUTPUT_PATH de pyodide_convert.py. */
+const FS_INPUT_PATH  = '/upc/input';
+const FS_OUTPUT_PATH = '/upc/output.parquet';
+
+/** Tamaño de bloque al volcar texto/archivos al FS virtual. */
+const STREAM_CHUNK_BYTES = 8 * 1024 * 1024;
+
 const defaultLoader: PyodideLoader = () => import('pyodide') as any;
 
 // console satisface {info,warn,error}; evita un objeto wrapper sin cubrir.
@@ -73,29 +118,89 @@ const defaultLogger: PyodideLogger = console;
 
 const defaultSourceLoader = (): Promise<string> => loadPyodideSource();
 
+const defaultCache = (): PyodideCache | null =>
+  isNodeRuntime() ? { packageCacheDir: defaultCacheDir() } : null;
+
+/** Intérpretes vivos del proceso, por loader y luego por indexURL. */
+const sharedRuntimes = new WeakMap<PyodideLoader, Map<string, Promise<SharedRuntime>>>();
+
+// ─── MEMFS streaming ──────────────────────────────────────────────────────────
+
+/** Parte un string en trozos sin cortar pares surrogate (UTF-16). */
+function* sliceText(text: string, size: number): Generator<string> {
+  let start = 0;
+  while (start < text.length) {
+    let end = Math.min(start + size, text.length);
+    const last = text.charCodeAt(end - 1);
+    if (end < text.length && last >= 0xd800 && last <= 0xdbff) end -= 1;
+    yield text.slice(start, end);
+    start = end;
+  }
+}
+
+function toChunks(
+  data: PyodideInput,
+  chunkSize: number,
+): Iterable<string | Uint8Array> | AsyncIterable<string | Uint8Array> {
+  if (typeof data === 'string') return sliceText(data, chunkSize);
+  if (data instanceof ArrayBuffer) return [new Uint8Array(data)];
+  if (data instanceof Uint8Array) return [data];
+  return data;
+}
+
+/**
+ * Vuelca la entrada al FS virtual por chunks. Devuelve los bytes escritos.
+ * Exportada para tests y para reutilizarla desde otros hosts de Pyodide.
+ */
+export async function writeInputToFS(
+  fs: PyodideFS,
+  path: string,
+  data: PyodideInput,
+  chunkSize: number = STREAM_CHUNK_BYTES,
+): Promise<number> {
+  const encoder = new TextEncoder();
+  const stream = fs.open(path, 'w');
+  let written = 0;
+  try {
+    for await (const chunk of toChunks(data, chunkSize)) {
+      const bytes = typeof chunk === 'string' ? encoder.encode(chunk) : chunk;
+      fs.write(stream, bytes, 0, bytes.length);
+      written += bytes.length;
+    }
+  } finally {
+    fs.close(stream);
+  }
+  return written;
+}
+
 // ─── PyodideBackend ───────────────────────────────────────────────────────────
 
 export class PyodideBackend {
   private pyodide: PyodideInstance | null = null;
+  private runtime: SharedRuntime | null = null;
   private isInitialized = false;
   private initPromise: Promise<void> | null = null;
-  private sourceLoaded = false;
+  private sourcePromise: Promise<string> | null = null;
 
   private readonly loader: PyodideLoader;
   private readonly logger: PyodideLogger;
   private readonly indexURL: string;
   private readonly sourceLoader: () => Promise<string>;
+  private readonly cache: PyodideCache | null;
 
   constructor(opts?: {
     loader?: PyodideLoader;
     logger?: PyodideLogger;
     indexURL?: string;
     sourceLoader?: () => Promise<string>;
+    /** Caché de paquetes; `null` la desactiva. */
+    cache?: PyodideCache | null;
   }) {
     this.loader       = opts?.loader ?? defaultLoader;
     this.logger       = opts?.logger ?? defaultLogger;
     this.indexURL     = opts?.indexURL ?? defaultIndexURL();
     this.sourceLoader = opts?.sourceLoader ?? defaultSourceLoader;
+    this.cache        = opts?.cache !== undefined ? opts.cache : defaultCache();
   }
 
   // ── Initialize ────────────────────────────────────────────────────────────
@@ -113,37 +218,97 @@ export class PyodideBackend {
   }
 
   private async _doInitialize(): Promise<void> {
+    let byURL = sharedRuntimes.get(this.loader);
+    if (!byURL) {
+      byURL = new Map();
+      sharedRuntimes.set(this.loader, byURL);
+    }
+
+    let boot = byURL.get(this.indexURL);
+    if (!boot) {
+      const registry = byURL;
+      boot = this.bootRuntime().catch((err) => {
+        registry.delete(this.indexURL); // el siguiente intento arranca de cero
+        throw err;
+      });
+      byURL.set(this.indexURL, boot);
+    }
+
+    this.runtime = await boot;
+    this.pyodide = this.runtime.pyodide;
+    this.isInitialized = true;
+  }
+
+  /** Arranca un intérprete con los paquetes instalados (desde la caché si la hay). */
+  private async bootRuntime(): Promise<SharedRuntime> {
     this.logger.info('🌐 Cargando Pyodide...');
     const { loadPyodide } = await this.loader();
-    this.pyodide = await loadPyodide({ indexURL: this.indexURL });
+    const pyodide = await loadPyodide({
+      indexURL: this.indexURL,
+      ...(this.cache ? { packageCacheDir: this.cache.packageCacheDir } : {}),
+    });
 
     this.logger.info('📦 Instalando paquetes Python (pandas, pyarrow, numpy)...');
-    await this.pyodide.loadPackage(REQUIRED_PACKAGES);
+    await pyodide.loadPackage(REQUIRED_PACKAGES);
 
-    this.isInitialized = true;
     this.logger.info('✅ Pyodide listo');
+    return { pyodide, sourceLoaded: false, lock: Promise.resolve() };
+  }
+
+  /** La fuente .py se lee una sola vez por instancia. */
+  private loadSource(): Promise<string> {
+    if (!this.sourcePromise) this.sourcePromise = this.sourceLoader();
+    return this.sourcePromise;
   }
 
   /** Define upc_convert() en el intérprete una sola vez. */
   private async ensureSource(): Promise<void> {
-    if (this.sourceLoaded) return;
-    const source = await this.sourceLoader();
-    await this.pyodide!.runPythonAsync(source);
-    this.sourceLoaded = true;
+    const runtime = this.runtime!;
+    if (runtime.sourceLoaded) return;
+    await this.pyodide!.runPythonAsync(await this.loadSource());
+    runtime.sourceLoaded = true;
+  }
+
+  /** Ejecuta `fn` en exclusiva sobre el intérprete compartido. */
+  private exclusive<T>(fn: () => Promise<T>): Promise<T> {
+    const runtime = this.runtime!;
+    const run = runtime.lock.then(fn, fn);
+    runtime.lock = run.catch(() => undefined);
+    return run;
   }
 
   // ── convertData (browser / programático) ──────────────────────────────────
 
   /**
-   * Convierte datos en memoria a Parquet. Devuelve el resultado con
-   * `parquet_bytes`. No toca el filesystem.
+   * Convierte datos en memoria (o un stream de chunks) a Parquet. Devuelve el
+   * resultado con `parquet_bytes` como Uint8Array. No toca el filesystem del host.
    */
   async convertData(
-    data: string | ArrayBuffer,
+    data: PyodideInput,
+    options?: ConversionOptions,
+  ): Promise<ConversionResult> {
+    const binary = data instanceof ArrayBuffer || data instanceof Uint8Array;
+    return this.convertInput(data, binary ? 'binary' : 'text', options);
+  }
+
+  private async convertInput(
+    data: PyodideInput,
+    mode: 'text' | 'binary',
     options?: ConversionOptions,
   ): Promise<ConversionResult> {
     await this.initialize();
     if (!this.pyodide) throw new Error('Pyodide no inicializado correctamente');
+    const pyodide = this.pyodide;
+
+    return this.exclusive(() => this.runConversion(pyodide, data, mode, options));
+  }
+
+  private async runConversion(
+    pyodide: PyodideInstance,
+    data: PyodideInput,
+    mode: 'text' | 'binary',
+    options?: ConversionOptions,
+  ): Promise<ConversionResult> {
     await this.ensureSource();
 
     const startTime = Date.now();
@@ -151,17 +316,14 @@ export class PyodideBackend {
     const compression = options?.compression ?? 'snappy';
 
     try {
-      let mode: 'text' | 'binary';
-      if (data instanceof ArrayBuffer) {
-        mode = 'binary';
-        this.pyodide.globals.set('_upc_bytes', this.pyodide.toPy(new Uint8Array(data)));
-      } else {
-        mode = 'text';
-        this.pyodide.globals.set('_upc_text', data);
-      }
+      pyodide.runPython('prepare_workspace()');
+      await writeInputToFS(pyodide.FS, FS_INPUT_PATH, data);
 
-      const call = `upc_convert(${JSON.stringify(mode)}, ${autoRepair ? 'True' : 'False'}, ${JSON.stringify(compression)})`;
-      const raw = await this.pyodide.runPythonAsync(call);
+      // Una lista/string JSON es también un literal Python válido
+      let call = `upc_convert(${JSON.stringify(mode)}, ${autoRepair ? 'True' : 'False'}, ${JSON.stringify(compression)}`;
+      if (options?.columns?.length) call += `, columns=${JSON.stringify(options.columns)}`;
+      if (options?.filter)          call += `, row_filter=${JSON.stringify(options.filter)}`;
+      const raw = await pyodide.runPythonAsync(call + ')');
 
       let parsed: PyodideRawResult;
       try {
@@ -174,13 +336,20 @@ export class PyodideBackend {
         throw new Error(parsed.error ?? 'Error desconocido en Pyodide');
       }
 
+      // FS.readFile devuelve una copia con ArrayBuffer propio → transferible.
+      const outputPath = parsed.output_path ?? FS_OUTPUT_PATH;
+      const parquetBytes = pyodide.FS.readFile(outputPath);
+      pyodide.FS.unlink(outputPath);
+      const { output_path, ...stats } = parsed;
+
       return {
-        ...parsed,
+        ...stats,
         success:           true,
         backend:           'pyodide',
         compression_used:  parsed.compression_used as ConversionResult['compression_used'],
         elapsed_time:      (Date.now() - startTime) / 1000,
         limitations:       [...LIMITATIONS],
+        parquet_bytes:     parquetBytes,
       } as ConversionResult;
     } catch (error: any) {
       if (error.message?.startsWith('Pyodide conversion failed:')) throw error;
@@ -191,8 +360,9 @@ export class PyodideBackend {
   // ── convert (Node, API de archivo — cumple BackendInterface) ───────────────
 
   /**
-   * Convierte un archivo a Parquet en Node: lo lee, lo convierte vía WASM y
-   * escribe el .parquet a disco. Devuelve input_file / output_file reales.
+   * Convierte un archivo a Parquet en Node: lo transmite por chunks al FS
+   * virtual (sin leerlo entero como string), lo convierte vía WASM y escribe
+   * el .parquet a disco. Devuelve input_file / output_file reales.
    */
   async convert(inputFile: string, options?: ConversionOptions): Promise<ConversionResult> {
     if (!isNodeRuntime()) {
@@ -207,15 +377,14 @@ export class PyodideBackend {
     }
 
     const ext = path.extname(inputFile).toLowerCase();
-    const payload: string | ArrayBuffer = BINARY_EXTENSIONS.has(ext)
-      ? (fs.readFileSync(inputFile).buffer as ArrayBuffer)
-      : fs.readFileSync(inputFile, 'utf8');
+    const mode = BINARY_EXTENSIONS.has(ext) ? 'binary' : 'text';
+    const stream = fs.createReadStream(inputFile, { highWaterMark: STREAM_CHUNK_BYTES });
 
-    const result = await this.convertData(payload, options);
+    const result = await this.convertInput(stream, mode, options);
 
     const outputFile = options?.output
       ?? path.join(path.dirname(inputFile), path.basename(inputFile, ext) + '.parquet');
-    fs.writeFileSync(outputFile, Buffer.from(result.parquet_bytes ?? []));
+    fs.writeFileSync(outputFile, result.parquet_bytes!);
 
     const inputSize = fs.statSync(inputFile).size;
     const { parquet_bytes, ...rest } = result;
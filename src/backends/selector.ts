@@ -1,18 +1,75 @@
 /**
- * Smart Backend Selector v1.3.0
- * Elige automáticamente el mejor backend disponible
+ * Smart Backend Selector v1.4.0
+ * Elige el backend con un modelo de coste (arranque + throughput + memoria).
+ * Engine, workers y streaming los decide después el planner de Python.
  */
 
-import { BackendType, ConversionOptions, ConversionResult } from '../types';
+import { existsSync, statSync } from 'fs';
+import {
+  BackendCandidate, BackendPlan, BackendType, ConversionOptions, ConversionResult, Environment,
+} from '../types';
 import { detectEnvironment } from '../utils/detect';
 import { NativePythonBackend } from './native-python';
 import { PortablePythonBackend } from './portable-python';
 import { PyodideBackend } from './pyodide-backend';
 import { CythonBackend } from './cython-backend';
 
+// ─── Modelo de coste ──────────────────────────────────────────────────────────
+// Valores de referencia (arranque y MB/s convirtiendo CSV); se recalibran con
+// `ultra-parquet-converter benchmark`.
+
+export const BACKEND_COSTS: Record<BackendType, { startupS: number; mbPerS: number }> = {
+  'cython':          { startupS: 0.6, mbPerS: 90 },
+  'native-python':   { startupS: 0.3, mbPerS: 50 },
+  'portable-python': { startupS: 0.5, mbPerS: 45 },  // la descarga es única: no cuenta
+  'pyodide':         { startupS: 4,   mbPerS: 6 },
+};
+
+// Pyodide no tiene streaming: archivo, DataFrame y tabla Arrow conviven en la
+// memoria lineal de wasm32, que en la práctica no pasa de ~2GB.
+export const PYODIDE_HEAP_BYTES = 2 * 1024 ** 3;
+const PYODIDE_EXPANSION = 4;
+
+const BACKEND_LABELS: Record<BackendType, string> = {
+  'cython':          '🚀 Usando Cython (ultra-rápido para archivos grandes)',
+  'native-python':   '⚡ Usando Python nativo (rápido)',
+  'portable-python': '📦 Usando Portable Python (descarga automática)',
+  'pyodide':         '🌐 Usando Pyodide (WebAssembly)',
+};
+
+function isAvailable(env: Environment, backend: BackendType): boolean {
+  switch (backend) {
+    case 'cython':          return env.hasCython;
+    case 'native-python':   return env.hasPython;
+    case 'portable-python': return env.isNode;
+    case 'pyodide':         return env.isBrowser || env.hasWebAssembly;
+  }
+}
+
+/**
+ * Ordena los backends disponibles por tiempo estimado. Los backends Python
+ * hacen streaming si el archivo no cabe en RAM, así que siempre caben.
+ */
+export function rankBackends(env: Environment, fileSize = 0): BackendCandidate[] {
+  const mb = fileSize / (1024 * 1024);
+  return (Object.keys(BACKEND_COSTS) as BackendType[])
+    .filter((backend) => isAvailable(env, backend))
+    .map((backend) => {
+      const cost = BACKEND_COSTS[backend];
+      return {
+        backend,
+        estimated_s: Math.round((cost.startupS + mb / cost.mbPerS) * 100) / 100,
+        fits: backend !== 'pyodide' || fileSize * PYODIDE_EXPANSION <= PYODIDE_HEAP_BYTES,
+      };
+    })
+    .sort((a, b) => a.estimated_s - b.estimated_s);
+}
+
 export class BackendSelector {
   private static instance: BackendSelector;
   private currentBackend: BackendType | null = null;
+  // true si currentBackend lo eligió el modelo de coste: se recalcula por archivo
+  private autoSelected = false;
   private backends: Map<BackendType, any> = new Map();
 
   private constructor() {
@@ -31,6 +88,7 @@ export class BackendSelector {
    */
   reset(): void {
     this.currentBackend = null;
+    this.autoSelected = false;
   }
 
   private initializeBackends() {
@@ -53,33 +111,38 @@ export class BackendSelector {
       return options.forceBackend;
     }
 
-    const env = await detectEnvironment();
-
-    // Prioridad 1: Cython (si disponible y archivos grandes)
-    if (env.hasCython && options?.fileSize && options.fileSize > 50_000_000) {
-      console.log('🚀 Usando Cython (ultra-rápido para archivos grandes)');
-      return 'cython';
-    }
+    const plan = await this.planBackend(options);
+    console.log(`${BACKEND_LABELS[plan.backend]} — ${plan.reason}`);
+    return plan.backend;
+  }
 
-    // Prioridad 2: Python Nativo (el más rápido)
-    if (env.hasPython) {
-      console.log('⚡ Usando Python nativo (rápido)');
-      return 'native-python';
-    }
+  /**
+   * Estima el coste de cada backend disponible para el tamaño de archivo y
+   * elige el más rápido que cabe en memoria.
+   */
+  async planBackend(options?: ConversionOptions): Promise<BackendPlan> {
+    const env = await detectEnvironment();
+    const fileSize = options?.fileSize ?? 0;
+    const candidates = rankBackends(env, fileSize);
 
-    // Prioridad 3: Portable Python (auto-descarga si no existe)
-    if (env.isNode) {
-      console.log('📦 Usando Portable Python (descarga automática)');
-      return 'portable-python';
+    if (candidates.length === 0) {
+      throw new Error('No hay backend disponible en este entorno');
     }
 
-    // Prioridad 4: Pyodide (navegador o WASM)
-    if (env.isBrowser || env.hasWebAssembly) {
-      console.log('🌐 Usando Pyodide (WebAssembly)');
-      return 'pyodide';
+    const chosen = candidates.find((c) => c.fits);
+    if (!chosen) {
+      // Solo queda Pyodide y el archivo no cabe en su heap: se intenta igual
+      console.warn(`⚠️  ${(fileSize / 1024 / 1024).toFixed(0)}MB probablemente no caben en memoria con ${candidates[0].backend}`);
     }
+    const backend = (chosen ?? candidates[0]).backend;
+    const estimate = (chosen ?? candidates[0]).estimated_s;
 
-    throw new Error('No hay backend disponible en este entorno');
+    return {
+      backend,
+      file_size: fileSize,
+      reason: `~${estimate}s estimados para ${(fileSize / 1024 / 1024).toFixed(1)}MB`,
+      candidates,
+    };
   }
 
   /**
@@ -89,11 +152,19 @@ export class BackendSelector {
     inputFile: string,
     options?: ConversionOptions
   ): Promise<ConversionResult> {
-    // forceBackend siempre reemplaza el backend actual
+    // forceBackend siempre reemplaza el backend actual; una elección
+    // automática se rehace por archivo (el tamaño cambia el coste).
+    let backendPlan: BackendPlan | undefined;
     if (options?.forceBackend) {
       this.currentBackend = options.forceBackend;
-    } else if (!this.currentBackend) {
-      this.currentBackend = await this.selectBackend(options);
+      this.autoSelected = false;
+    } else if (!this.currentBackend || this.autoSelected) {
+      const fileSize = options?.fileSize ??
+        (existsSync(inputFile) ? statSync(inputFile).size : undefined);
+      backendPlan = await this.planBackend({ ...options, fileSize });
+      console.log(`${BACKEND_LABELS[backendPlan.backend]} — ${backendPlan.reason}`);
+      this.currentBackend = backendPlan.backend;
+      this.autoSelected = true;
     }
 
     const backend = this.backends.get(this.currentBackend);
@@ -104,6 +175,9 @@ export class BackendSelector {
 
     const result = await backend.convert(inputFile, options);
     result.backend = this.currentBackend;
+    if (options?.explain && backendPlan) {
+      result.backend_plan = backendPlan;
+    }
 
     return result;
   }
@@ -125,7 +199,7 @@ export class BackendSelector {
         available: env.hasCython,
         speed: '🚀🚀🚀🚀🚀',
         description: 'Módulos Cython compilados (ultra-rápido)',
-        limitations: 'Solo para archivos grandes'
+        limitations: 'Compensa su arranque a partir de ~30MB'
       },
       'portable-python': {
         available: env.isNode,
@@ -137,7 +211,7 @@ export class BackendSelector {
         available: env.isBrowser || env.hasWebAssembly,
         speed: '⚡⚡',
         description: 'Python en WebAssembly (sin instalación)',
-        limitations: 'Más lento, sin filesystem nativo'
+        limitations: 'Más lento, sin filesystem nativo, sin streaming (heap ~2GB)'
       }
     };
   }
@@ -150,6 +224,7 @@ export class BackendSelector {
       throw new Error(`Backend '${backend}' no existe`);
     }
     this.currentBackend = backend;
+    this.autoSelected = false;
   }
 
   /**
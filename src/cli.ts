@@ -12,8 +12,15 @@ import cliProgress from 'cli-progress';
 import { watch, FSWatcher } from 'fs';
 import { basename, extname, join, dirname, resolve } from 'path';
 import { existsSync, statSync, readdirSync, mkdirSync } from 'fs';
-import { convertToParquet, checkPythonSetup, getAvailableBackends, setBackend } from './index';
-import { BackendType, CompressionType } from './types';
+import {
+  convertToParquet, convertStream, checkPythonSetup, getAvailableBackends, setBackend, runBenchmark,
+  compactFiles, getFilesInfo,
+} from './index';
+import {
+  BackendPlan, BackendType, CompressionType, ConversionEngine, ConversionPlan, ConversionProfile,
+  FileInfo, ProgressEvent,
+} from './types';
+import { ConversionProgressBar, formatProgressEvent } from './utils/progress';
 
 // ========== UTILIDADES ==========
 
@@ -32,6 +39,9 @@ function formatTime(seconds: number): string {
   return `${minutes}m ${secs}s`;
 }
 
+/** "a, b,c" → ['a', 'b', 'c'] (undefined si no hay valor). */
+const splitList = (v?: string) => v ? v.split(',').map((s) => s.trim()).filter(Boolean) : undefined;
+
 function findFiles(pattern: string): string[] {
   const dir = dirname(pattern) || '.';
   const filePattern = basename(pattern);
@@ -58,78 +68,142 @@ const SUPPORTED_EXTENSIONS = new Set([
 // ========== PROGRESS BAR HELPER ==========
 
 /**
- * Crea y gestiona una progress bar para conversiones largas.
- * Simula progreso basado en tiempo estimado (Python no reporta % en tiempo real).
+ * Ejecuta conversión con progress bar en vivo: los backends Python emiten
+ * eventos de progreso (--progress) con etapa, filas/s, MB/s y ETA reales.
+ * Pyodide no los emite: la barra salta al 100% al terminar.
  */
-function createProgressBar(label: string = 'Convirtiendo') {
-  const bar = new cliProgress.SingleBar({
-    format: `${chalk.cyan(label)} |${chalk.cyan('{bar}')}| {percentage}% | {status}`,
-    barCompleteChar: '█',
-    barIncompleteChar: '░',
-    hideCursor: true,
-    clearOnComplete: false,
-  }, cliProgress.Presets.shades_classic);
-
-  return bar;
+async function convertWithProgress(input: string, options: any): Promise<any> {
+  const bar = new ConversionProgressBar('Convirtiendo');
+  try {
+    const result = await convertToParquet(input, { ...options, onProgress: bar.update });
+    bar.complete();
+    return result;
+  } catch (err) {
+    bar.stop(chalk.red('Error'));
+    throw err;
+  }
 }
 
 /**
- * Ejecuta conversión con progress bar animada.
- * Incrementa progreso cada 200ms hasta 90%, luego espera resultado real.
+ * convert con '-' (stdin/stdout): el Python nativo lee/escribe los pipes del
+ * proceso directamente, sin archivos temporales ni progress bar.
  */
-async function convertWithProgress(
-  input: string,
-  options: any,
-  fileSizeMB: number
-): Promise<any> {
-  const bar = createProgressBar('Convirtiendo');
-
-  // Estima tiempo según tamaño (aprox 50MB/s)
-  const estimatedSeconds = Math.max(2, fileSizeMB / 50);
-  const totalSteps = 100;
-  const intervalMs = (estimatedSeconds * 1000 * 0.9) / totalSteps; // 90% del tiempo estimado
-
-  bar.start(totalSteps, 0, { status: 'Iniciando...' });
-
-  let currentStep = 0;
-  const statuses = [
-    'Detectando formato...',
-    'Leyendo datos...',
-    'Procesando chunks...',
-    'Aplicando reparación...',
-    'Normalizando columnas...',
-    'Convirtiendo a Arrow...',
-    'Escribiendo Parquet...',
-    'Optimizando compresión...',
-    'Finalizando...',
-  ];
-
-  // Avanza la barra mientras Python trabaja
-  const interval = setInterval(() => {
-    if (currentStep < 90) {
-      currentStep += 1;
-      const statusIndex = Math.floor((currentStep / 90) * (statuses.length - 1));
-      bar.update(currentStep, { status: statuses[statusIndex] ?? 'Procesando...' });
-    }
-  }, intervalMs);
+async function convertStdio(input: string, options: any, toStdout: boolean): Promise<any> {
+  if (options.backend && options.backend !== 'native-python') {
+    console.log(chalk.yellow(`⚠️  stdin/stdout solo con native-python (ignorado --backend ${options.backend})`));
+  }
+  if (input !== '-' && !existsSync(input)) {
+    throw new Error(`Archivo no encontrado: ${input}`);
+  }
+  return convertStream(
+    input === '-' ? process.stdin : input,
+    toStdout ? process.stdout : options.output,
+    toConversionOptions(options),
+  );
+}
 
-  try {
-    const result = await convertToParquet(input, options);
+function toConversionOptions(options: any) {
+  return {
+    output:          options.output,
+    verbose:         options.verbose,
+    streaming:       options.streaming || false,
+    autoRepair:      options.repair !== false,
+    autoNormalize:   options.normalize !== false,
+    compression:     options.compression as CompressionType,
+    parallelWorkers: parseInt(options.workers, 10) || 0,
+    memoryLimit:     options.memoryLimit ? parseInt(options.memoryLimit, 10) : undefined,
+    engine:          options.engine as ConversionEngine,
+    explain:         options.explain || false,
+    columns:         splitList(options.columns),
+    filter:          options.filter,
+    inputFormat:     options.format,
+    encoding:        options.encoding,
+    sample:          options.sample,
+    sampleSeed:      options.seed != null ? parseInt(options.seed, 10) : undefined,
+    metricsFile:     options.metricsFile,
+    profile:         options.benchmark || false,
+    profileTrace:    options.profileTrace,
+  };
+}
+
+// ========== PRINT RESULTS ==========
 
-    clearInterval(interval);
-    bar.update(totalSteps, { status: chalk.green('¡Completado!') });
-    bar.stop();
+/** Tabla por etapa del `profile` de Python: dónde se fue el tiempo. */
+function printProfile(profile: ConversionProfile) {
+  const total = profile.total_wall_s || 1;
+  const pad = (s: string, n: number) => s.padEnd(n);
+  const num = (s: string, n: number) => s.padStart(n);
+
+  console.log(chalk.bold('\n⏱️  Profile por etapa:\n'));
+  console.log(chalk.gray(`   ${pad('Etapa', 22)}${num('Wall', 10)}${num('CPU', 10)}${num('%', 7)}${num('Filas/s', 14)}${num('RSS', 11)}`));
+  for (const s of profile.stages) {
+    const share = (s.wall_s / total) * 100;
+    const color = share >= 40 ? chalk.red : share >= 15 ? chalk.yellow : chalk.white;
+    console.log(color(
+      `   ${pad(s.name + (s.calls > 1 ? ` ×${s.calls}` : ''), 22)}` +
+      `${num(formatTime(s.wall_s), 10)}${num(formatTime(s.cpu_s), 10)}` +
+      `${num(share.toFixed(1), 7)}` +
+      `${num(s.rows_per_s != null ? Math.round(s.rows_per_s).toLocaleString() : '—', 14)}` +
+      `${num(s.peak_rss_mb.toFixed(0) + ' MB', 11)}`,
+    ));
+  }
 
-    return result;
-  } catch (err) {
-    clearInterval(interval);
-    bar.update(currentStep, { status: chalk.red('Error') });
-    bar.stop();
-    throw err;
+  if (profile.workers.length > 0) {
+    const walls = profile.workers.map((w) => w.wall_s);
+    const slowest = Math.max(...walls);
+    const mean = walls.reduce((a, b) => a + b, 0) / walls.length;
+    console.log(chalk.white(`\n   Workers:            ${chalk.yellow(profile.workers.length)}` +
+      chalk.gray(` (media ${formatTime(mean)}, más lento ${formatTime(slowest)}, desbalance ${(slowest / (mean || 1)).toFixed(2)}x)`)));
   }
+
+  console.log(chalk.white(`   CPU total:          ${chalk.cyan(formatTime(profile.total_cpu_s))}` +
+    chalk.gray(` / wall ${formatTime(profile.total_wall_s)}`)));
+  console.log(chalk.white(`   Pico RSS:           ${chalk.magenta(profile.peak_rss_mb.toFixed(0) + ' MB')}` +
+    (profile.peak_rss_children_mb > 0 ? chalk.gray(` (workers ${profile.peak_rss_children_mb.toFixed(0)} MB)`) : '')));
 }
 
-// ========== PRINT RESULTS ==========
+/** Plan del modelo de coste (--explain): backend, engine y estimaciones. */
+function printPlan(plan: ConversionPlan, backendPlan?: BackendPlan) {
+  const pad = (s: string, n: number) => s.padEnd(n);
+  const num = (s: string, n: number) => s.padStart(n);
+
+  console.log(chalk.bold('\n🧭 Plan de ejecución:\n'));
+  if (backendPlan) {
+    const ranking = backendPlan.candidates
+      .map((c) => `${c.backend} ~${c.estimated_s}s${c.fits ? '' : ' (no cabe)'}`)
+      .join(' · ');
+    console.log(chalk.white(`   Backend:            ${chalk.magenta(backendPlan.backend)}`) + chalk.gray(` (${ranking})`));
+  }
+  console.log(chalk.white(`   Engine:             ${chalk.magenta(plan.engine)}`) + chalk.gray(` — ${plan.reason}`));
+  console.log(chalk.white(`   Workers:            ${chalk.yellow(plan.workers)}`) +
+    (plan.streaming ? chalk.gray(` · chunks de ${plan.chunk_rows.toLocaleString()} filas · techo ${plan.memory_limit_mb} MB`) : ''));
+  if (plan.sample) {
+    console.log(chalk.white(`   Muestra:            ${chalk.cyan(plan.sample.rows.toLocaleString() + ' filas')}`) +
+      chalk.gray(` · ${plan.sample.columns} columnas · ${plan.sample.bytes_per_row} B/fila en disco · expansión ${plan.sample.expansion}x`));
+  }
+  if (plan.estimated_rows != null) {
+    console.log(chalk.white(`   Filas estimadas:    ${chalk.yellow(plan.estimated_rows.toLocaleString())}`));
+  }
+  const sys = plan.system;
+  console.log(chalk.white(`   Sistema:            ${chalk.cyan(sys.cores + ' cores')}`) +
+    chalk.gray(sys.available_memory_mb != null
+      ? ` · ${sys.available_memory_mb.toFixed(0)} MB libres · presupuesto ${sys.memory_budget_mb?.toFixed(0)} MB`
+      : ' · RAM desconocida'));
+
+  console.log(chalk.gray(`\n   ${pad('Engine', 14)}${num('Tiempo', 10)}${num('Pico', 12)}${num('Cabe', 7)}`));
+  for (const [engine, e] of Object.entries(plan.estimates)) {
+    if (!e) continue;
+    const color = engine === plan.engine ? chalk.green : chalk.white;
+    console.log(color(`   ${pad(engine, 14)}${num(formatTime(e.seconds), 10)}` +
+      `${num(e.peak_memory_mb.toFixed(0) + ' MB', 12)}${num(e.fits ? 'sí' : 'no', 7)}`));
+  }
+  if (plan.overrides.length > 0) {
+    console.log(chalk.gray(`\n   Fijado por el usuario: ${plan.overrides.join(', ')}`));
+  }
+  for (const w of plan.warnings) {
+    console.log(chalk.yellow(`   ⚠️  ${w}`));
+  }
+}
 
 function printResults(result: any, input: string, elapsed: number, showBenchmark: boolean) {
   console.log(chalk.bold('\n📊 Resultados:\n'));
@@ -137,7 +211,21 @@ function printResults(result: any, input: string, elapsed: number, showBenchmark
   console.log(chalk.white(`   Archivo origen:     ${chalk.cyan(basename(result.input_file || input))}`));
   console.log(chalk.white(`   Archivo destino:    ${chalk.cyan(basename(result.output_file || 'output.parquet'))}`));
   console.log(chalk.white(`   Tipo detectado:     ${chalk.blue((result.file_type || '?').toUpperCase())}`));
+  if (result.encoding && result.encoding !== 'utf-8') {
+    console.log(chalk.white(`   Codificación:       ${chalk.blue(result.encoding)}` +
+      chalk.gray(` (${result.encoding_detection})`)));
+  }
+  if (result.replaced_bytes) {
+    console.log(chalk.white(`   Bytes sustituidos:  ${chalk.yellow(result.replaced_bytes.toLocaleString())}` +
+      chalk.gray(` (no válidos en ${result.encoding}, ahora U+FFFD)`)));
+  }
   console.log(chalk.white(`   Filas:              ${chalk.yellow(result.rows.toLocaleString())}`));
+  if (result.sample) {
+    const s = result.sample;
+    const population = (s.exact_population ? '' : '~') + s.population_rows.toLocaleString();
+    console.log(chalk.white(`   Muestra:            ${chalk.yellow(s.method)}`) +
+      chalk.gray(` · ${s.requested} de ${population} filas · ${formatBytes(s.bytes_read)} leídos · semilla ${s.seed}`));
+  }
   console.log(chalk.white(`   Columnas:           ${chalk.yellow(result.columns)}`));
   console.log(chalk.white(`   Tamaño original:    ${chalk.magenta(formatBytes(result.input_size))}`));
   console.log(chalk.white(`   Tamaño Parquet:     ${chalk.magenta(formatBytes(result.output_size))}`));
@@ -169,6 +257,14 @@ function printResults(result: any, input: string, elapsed: number, showBenchmark
     console.log(chalk.white(`   Chunks:             ${chalk.yellow(result.chunks_processed)}`));
   }
 
+  if (showBenchmark && result.pipeline) {
+    const p = result.pipeline;
+    const pct = (v: number) => `${Math.round(v * 100)}%`;
+    console.log(chalk.white(`   Pipeline:           ${chalk.gray(`lectura ${pct(p.utilization.read)} · transformación ${pct(p.utilization.transform)} · escritura ${pct(p.utilization.write)}`)}`));
+    console.log(chalk.white(`   Cuello de botella:  ${chalk.yellow(p.bottleneck)}` +
+      chalk.gray(` (pico en vuelo ${p.peak_inflight_mb} / ${p.memory_limit_mb} MB)`)));
+  }
+
   if (result.errors_fixed && result.errors_fixed > 0) {
     console.log(chalk.white(`   Errores corregidos: ${chalk.green(result.errors_fixed)}`));
   }
@@ -177,17 +273,74 @@ function printResults(result: any, input: string, elapsed: number, showBenchmark
     console.log(chalk.white(`   Cols eliminadas:    ${chalk.yellow(result.columns_removed)}`));
   }
 
+  if (result.datetime_columns && Object.keys(result.datetime_columns).length > 0) {
+    const cols = Object.entries(result.datetime_columns).map(([c, f]) => `${c} (${f})`);
+    console.log(chalk.white(`   Cols de fecha:      ${chalk.cyan(cols.join(', '))}`));
+  }
+
   if (showBenchmark && result.rows > 0) {
     const t = result.elapsed_time || elapsed;
     const speed = Math.round(result.rows / t);
     console.log(chalk.bold('\n⚡ Benchmark:\n'));
     console.log(chalk.white(`   Velocidad:          ${chalk.cyan(speed.toLocaleString())} filas/s`));
     console.log(chalk.white(`   Throughput:         ${chalk.cyan(formatBytes(result.input_size / t))}/s`));
+    if (result.profile) printProfile(result.profile);
+  }
+
+  if (result.profile_trace) {
+    console.log(chalk.white(`\n   Trace:              ${chalk.cyan(result.profile_trace)}`));
   }
 
+  if (result.plan) printPlan(result.plan, result.backend_plan);
+
   console.log();
 }
 
+/** Metadatos de `info`: footer en Parquet, muestra en los formatos de entrada. */
+function printFileInfo(info: FileInfo) {
+  const approx = info.exact === false ? '~' : '';
+  const textDetails = [
+    info.delimiter ? `delimitador ${JSON.stringify(info.delimiter)}` : '',
+    info.encoding ?? '',
+  ].filter(Boolean);
+  console.log(chalk.white(`   Formato:     ${chalk.blue(info.format.toUpperCase())}` +
+    (textDetails.length ? chalk.gray(` (${textDetails.join(', ')})`) : '')));
+  if (info.sampled === false) {
+    console.log(chalk.gray(`   ${info.reason}`));
+    return;
+  }
+  if (info.rows != null) {
+    console.log(chalk.white(`   Filas:       ${chalk.yellow(approx + info.rows.toLocaleString())}` +
+      (info.sample_rows != null && info.exact === false ? chalk.gray(` (muestra de ${info.sample_rows.toLocaleString()})`) : '')));
+  }
+  if (info.row_groups != null) {
+    console.log(chalk.white(`   Row groups:  ${chalk.yellow(info.row_groups)}` +
+      chalk.gray(` · ${info.codecs?.join(', ') || '-'} · ${info.created_by ?? ''}`)));
+    console.log(chalk.white(`   Datos:       ${chalk.magenta(formatBytes(info.compressed_size ?? 0))}` +
+      chalk.gray(` comprimidos / ${formatBytes(info.uncompressed_size ?? 0)} sin comprimir`)));
+  }
+  if (info.projected_parquet_size != null) {
+    console.log(chalk.white(`   Parquet:     ${chalk.magenta(approx + formatBytes(info.projected_parquet_size))}` +
+      chalk.gray(` proyectado con ${info.compression?.toUpperCase()}`)));
+  }
+  if (!info.schema?.length) return;
+
+  const stats = new Map((info.column_stats ?? []).map((c) => [c.name, c]));
+  console.log(chalk.bold(`\n   Esquema (${info.schema.length} columnas):\n`));
+  for (const field of info.schema) {
+    const c = stats.get(field.name);
+    let detail = '';
+    if (c) {
+      const range = c.min != null ? ` · ${JSON.stringify(c.min)} … ${JSON.stringify(c.max)}` : '';
+      const nulls = c.null_count != null ? ` · ${c.null_count.toLocaleString()} nulos` : '';
+      detail = chalk.gray(` ${formatBytes(c.compressed_size)} / ${formatBytes(c.uncompressed_size)}${nulls}${range}`);
+    } else if (info.datetime_columns?.[field.name]) {
+      detail = chalk.gray(` ${info.datetime_columns[field.name]}`);
+    }
+    console.log(chalk.white(`   ${field.name.padEnd(24)} ${chalk.cyan(field.type.padEnd(16))}`) + detail);
+  }
+}
+
 // ========== PROGRAMA ==========
 
 program
@@ -200,8 +353,8 @@ program
 program
   .command('convert <input>')
   .alias('c')
-  .description('Convierte un archivo a Parquet')
-  .option('-o, --output <file>',        'Archivo de salida')
+  .description("Convierte un archivo a Parquet ('-' = stdin)")
+  .option('-o, --output <file>',        "Archivo de salida ('-' = stdout)")
   .option('-v, --verbose',              'Modo verbose')
   .option('--streaming',                'Modo streaming para archivos grandes')
   .option('--no-repair',                'Desactivar auto-reparación')
@@ -209,9 +362,25 @@ program
   .option('--backend <type>',           'Forzar backend (native-python, pyodide, cython)')
   .option('--compression <type>',       'Algoritmo de compresión (adaptive, snappy, zstd, lz4, gzip, brotli, none)', 'adaptive')
   .option('--workers <n>',              'Workers paralelos (0=auto)', '0')
-  .option('--benchmark',                'Mostrar benchmark de velocidad')
+  .option('--memory-limit <mb>',        'Techo de memoria en vuelo en streaming (MB)')
+  .option('--engine <type>',            'Forzar engine (in-memory, parallel, streaming; auto=planner)', 'auto')
+  .option('--explain',                  'Mostrar el plan del modelo de coste (backend, engine, memoria)')
+  .option('--columns <list>',           'Solo estas columnas, separadas por comas')
+  .option('--filter <expr>',            'Filtro de filas, p. ej. "status == \'OK\' and amount > 100"')
+  .option('--format <type>',            'Formato de entrada en vez de detectarlo (csv, ndjson...; útil con stdin)')
+  .option('--encoding <name>',          'Codificación de la entrada de texto en vez de detectarla (latin-1, cp1252, utf-16...)')
+  .option('--sample <n|p%>',            'Muestra aleatoria de N filas o del P% (salida por defecto: <nombre>.sample.parquet)')
+  .option('--seed <n>',                 'Semilla de --sample para repetir la misma muestra')
+  .option('--benchmark',                'Mostrar benchmark de velocidad (incluye profile por etapa)')
+  .option('--profile-trace <file>',     'Exportar profile como Chrome trace (.json) o JSON lines (.jsonl)')
+  .option('--metrics-file <file>',      'Métricas en vivo: texto de Prometheus (.prom) o JSON')
   .option('--no-progress',              'Desactivar progress bar')
   .action(async (input: string, options: any) => {
+    const stdio = input === '-' || options.output === '-';
+    // stdout lleva el Parquet: todos los mensajes van a stderr
+    const toStdout = options.output === '-' || (input === '-' && !options.output);
+    if (toStdout) console.log = console.error;
+
     console.log(chalk.bold.cyan('\n🔄 Ultra Parquet Converter v1.4.0\n'));
 
     // Pyodide (WASM) no requiere Python del sistema — solo verificamos para
@@ -232,6 +401,18 @@ program
       console.log(chalk.blue('🌐 Backend Pyodide (WebAssembly) — sin Python del sistema'));
     }
 
+    if (stdio) {
+      try {
+        const startTime = Date.now();
+        const result = await convertStdio(input, options, toStdout);
+        printResults(result, input, (Date.now() - startTime) / 1000, options.benchmark);
+      } catch (error: any) {
+        console.error(chalk.red(`\n❌ ${error.message}\n`));
+        process.exit(1);
+      }
+      return;
+    }
+
     if (!existsSync(input)) {
       console.log(chalk.red(`\n❌ Archivo no encontrado: ${input}\n`));
       process.exit(1);
@@ -245,22 +426,14 @@ program
     const fileSizeMB = statSync(input).size / (1024 * 1024);
     const useProgress = options.progress !== false && fileSizeMB > 1; // solo si >1MB
 
-    const conversionOptions = {
-      output:          options.output,
-      verbose:         options.verbose,
-      streaming:       options.streaming || false,
-      autoRepair:      options.repair !== false,
-      autoNormalize:   options.normalize !== false,
-      compression:     options.compression as CompressionType,
-      parallelWorkers: parseInt(options.workers, 10) || 0,
-    };
+    const conversionOptions = toConversionOptions(options);
 
     try {
       const startTime = Date.now();
       let result: any;
 
       if (useProgress) {
-        result = await convertWithProgress(input, conversionOptions, fileSizeMB);
+        result = await convertWithProgress(input, conversionOptions);
       } else {
         const convertSpinner = ora('Convirtiendo archivo...').start();
         result = await convertToParquet(input, conversionOptions);
@@ -291,6 +464,10 @@ program
   .option('--streaming',              'Activar streaming para todos los archivos')
   .option('--compression <type>',     'Algoritmo de compresión', 'adaptive')
   .option('--workers <n>',            'Workers paralelos (0=auto)', '0')
+  .option('--columns <list>',         'Solo estas columnas, separadas por comas')
+  .option('--filter <expr>',          'Filtro de filas (sintaxis de DataFrame.query)')
+  .option('--encoding <name>',        'Codificación de todos los archivos de texto en vez de detectarla')
+  .option('--metrics-file <file>',    'Métricas en vivo del archivo en curso (.prom o JSON)')
   .action(async (pattern: string, options: any) => {
     console.log(chalk.bold.cyan('\n📦 Ultra Parquet Converter — Modo Batch v1.4.0\n'));
 
@@ -333,6 +510,10 @@ program
           streaming: options.streaming || false,
           compression: options.compression as CompressionType,
           parallelWorkers: parseInt(options.workers, 10) || 0,
+          columns: splitList(options.columns),
+          filter: options.filter,
+          encoding: options.encoding,
+          metricsFile: options.metricsFile,
         });
 
         totalRows += result.rows;
@@ -361,6 +542,69 @@ program
     console.log();
   });
 
+// ── Comando: compact ────────────────────────────────────────────────────
+
+program
+  .command('compact <inputs...>')
+  .description('Une muchos archivos pequeños (o Parquet de batch) en pocos Parquet grandes')
+  .requiredOption('-o, --output-dir <dir>', 'Directorio de salida (part-00000.parquet, ...)')
+  .option('--target-size <mb>',         'Tamaño en disco de cada archivo de salida (MB)', '512')
+  .option('--row-group-size <mb>',      'Tamaño en memoria de cada row group (MB)', '128')
+  .option('--source-column <name>',     'Añadir una columna con el archivo de origen')
+  .option('--workers <n>',              'Hilos lectores (0=auto)', '0')
+  .option('--compression <type>',       'snappy, zstd, lz4, gzip, brotli, none', 'snappy')
+  .option('--no-repair',                'Desactivar auto-reparación')
+  .option('--no-normalize',             'Desactivar auto-normalización')
+  .option('--overwrite',                'Reemplazar los part-*.parquet de una pasada anterior')
+  .option('-v, --verbose',              'Mostrar cada archivo leído')
+  .action(async (inputs: string[], options: any) => {
+    console.log(chalk.bold.cyan('\n🗜️  Ultra Parquet Converter — Compactación\n'));
+
+    const spinner = options.verbose ? null : ora(`Compactando ${inputs.length} entrada(s)...`).start();
+    try {
+      const result = await compactFiles(inputs, {
+        outputDir:     options.outputDir,
+        targetSize:    parseInt(options.targetSize, 10) || undefined,
+        rowGroupSize:  parseInt(options.rowGroupSize, 10) || undefined,
+        sourceColumn:  options.sourceColumn,
+        workers:       parseInt(options.workers, 10) || 0,
+        compression:   options.compression,
+        autoRepair:    options.repair !== false,
+        autoNormalize: options.normalize !== false,
+        overwrite:     options.overwrite || false,
+        verbose:       options.verbose,
+      });
+      spinner?.succeed(chalk.green('✅ Compactación completada'));
+
+      console.log(chalk.bold('\n📊 Resultados:\n'));
+      console.log(chalk.white(`   Entradas:           ${chalk.yellow(result.compacted.toLocaleString())} de ${result.inputs.toLocaleString()}`));
+      console.log(chalk.white(`   Filas:              ${chalk.yellow(result.rows.toLocaleString())}`));
+      console.log(chalk.white(`   Columnas:           ${chalk.yellow(result.columns)}`));
+      console.log(chalk.white(`   Archivos Parquet:   ${chalk.cyan(result.output_files.length)} (${result.row_groups} row groups)`));
+      console.log(chalk.white(`   Tamaño entrada:     ${chalk.magenta(formatBytes(result.input_size))}`));
+      console.log(chalk.white(`   Tamaño Parquet:     ${chalk.magenta(formatBytes(result.output_size))}`));
+      console.log(chalk.white(`   Tiempo:             ${chalk.cyan(formatTime(result.elapsed_time))}`));
+      if (result.schema_changes > 0) {
+        console.log(chalk.yellow(`   Cambios de esquema: ${result.schema_changes} (se abrió un archivo nuevo con el esquema ampliado)`));
+      }
+      for (const f of result.output_files) {
+        console.log(chalk.gray(`   ${basename(f.path)}  ${f.rows.toLocaleString()} filas · ${f.row_groups} RG · ${formatBytes(f.bytes)}`));
+      }
+      if (result.failed.length > 0) {
+        console.log(chalk.red(`\n❌ ${result.failed.length} entrada(s) con error:`));
+        for (const f of result.failed) {
+          console.log(chalk.red(`   ${basename(f.file)}: ${f.error}`));
+        }
+        process.exitCode = 1;
+      }
+      console.log();
+    } catch (error: any) {
+      spinner?.fail(chalk.red('Compactación fallida'));
+      console.error(chalk.red(`\n❌ ${error.message}\n`));
+      process.exit(1);
+    }
+  });
+
 // ── Comando: watch ──────────────────────────────────────────────────────
 
 program
@@ -373,6 +617,7 @@ program
   .option('--compression <type>',     'Algoritmo de compresión', 'adaptive')
   .option('--workers <n>',            'Workers paralelos (0=auto)', '0')
   .option('--debounce <ms>',          'Espera antes de convertir (ms)', '500')
+  .option('--metrics-file <file>',    'Métricas en vivo del archivo en curso (.prom o JSON)')
   .action(async (directory: string, options: any) => {
     console.log(chalk.bold.cyan('\n👁️  Ultra Parquet Converter — Modo Watch v1.4.0\n'));
 
@@ -419,23 +664,36 @@ program
         : 0;
 
       const timestamp = new Date().toLocaleTimeString();
-      process.stdout.write(
+      const prefix =
         chalk.gray(`[${timestamp}] `) +
         chalk.white(`📄 ${basename(filePath)} `) +
         chalk.yellow(`(${fileSizeMB.toFixed(1)}MB)`) +
-        chalk.gray(' → ')
-      );
+        chalk.gray(' → ');
+      process.stdout.write(prefix);
+
+      // En una terminal, la línea del archivo muestra el progreso en vivo
+      // (throughput y ETA) hasta que se sustituye por el resultado.
+      const live = Boolean(process.stdout.isTTY);
+      const onProgress = live
+        ? (event: ProgressEvent) => {
+          const percent = event.percent !== null ? `${Math.floor(event.percent)}% ` : '';
+          process.stdout.write('\r\x1b[K' + prefix + chalk.gray(percent + formatProgressEvent(event)));
+        }
+        : undefined;
 
       try {
         const startTime = Date.now();
         const result = await convertToParquet(filePath, {
           output: outputFile,
           verbose: options.verbose,
-          streaming: options.streaming || fileSizeMB > 100,
+          streaming: options.streaming || false,
           compression: options.compression as CompressionType,
           parallelWorkers: parseInt(options.workers, 10) || 0,
+          metricsFile: options.metricsFile,
+          onProgress,
         });
 
+        if (live) process.stdout.write('\r\x1b[K' + prefix);
         const elapsed = ((Date.now() - startTime) / 1000).toFixed(2);
         sessionConverted++;
 
@@ -454,6 +712,7 @@ program
 
       } catch (error: any) {
         sessionErrors++;
+        if (live) process.stdout.write('\r\x1b[K' + prefix);
         console.log(chalk.red(`❌ Error: ${error.message}`));
       } finally {
         processing.delete(filePath);
@@ -540,25 +799,130 @@ program
     console.log();
   });
 
+// ── Comando: benchmark ──────────────────────────────────────────────────
+
+program
+  .command('benchmark')
+  .description('Benchmark reproducible por motor con datos sintéticos (y control de regresiones)')
+  .option('--datasets <list>',        'narrow_numeric,wide_string,messy_csv,ndjson,columnar')
+  .option('--sizes <list>',           'small,medium,large', 'small,medium')
+  .option('--engines <list>',         'pandas,parallel,streaming,cython,arrow')
+  .option('--repeat <n>',             'Ejecuciones por caso (se toma la mejor)', '3')
+  .option('--workers <n>',            'Workers para parallel/streaming (0=auto)', '0')
+  .option('--data-dir <dir>',         'Caché de datasets generados')
+  .option('--baseline <file>',        'Archivo de baseline (default: benchmarks/baseline.json)')
+  .option('--save-baseline',          'Guardar los resultados como baseline')
+  .option('--max-regression <pct>',   'Fallar si filas/s cae más de este % frente al baseline')
+  .option('-v, --verbose',            'Mostrar progreso de cada caso')
+  .action(async (options: any) => {
+    console.log(chalk.bold.cyan('\n⏱️  Ultra Parquet Converter — Benchmark\n'));
+
+    const spinner = options.verbose ? null : ora('Ejecutando benchmark...').start();
+    try {
+      const report = await runBenchmark({
+        datasets:      splitList(options.datasets),
+        sizes:         splitList(options.sizes),
+        engines:       splitList(options.engines),
+        repeat:        parseInt(options.repeat, 10) || 1,
+        workers:       parseInt(options.workers, 10) || 0,
+        dataDir:       options.dataDir,
+        baseline:      options.baseline,
+        saveBaseline:  options.saveBaseline || false,
+        maxRegression: options.maxRegression != null ? parseFloat(options.maxRegression) : undefined,
+        verbose:       options.verbose,
+      });
+      spinner?.stop();
+
+      const env = report.environment;
+      console.log(chalk.gray(`   Python ${env.python} · pandas ${env.pandas} · pyarrow ${env.pyarrow} · ${env.cpu_count} CPUs\n`));
+      console.log(chalk.gray(`   ${'Caso'.padEnd(34)}${'Filas/s'.padStart(13)}${'MB/s'.padStart(9)}${'RSS'.padStart(10)}${'Δ base'.padStart(9)}`));
+
+      for (const r of report.results) {
+        if (r.skipped || r.error) {
+          console.log(chalk.gray(`   ${r.case.padEnd(34)}  ${r.skipped ? '— ' + r.skipped : chalk.red('✖ ' + r.error)}`));
+          continue;
+        }
+        const change = r.change != null
+          ? (r.change >= 0 ? chalk.green : chalk.red)(`${r.change >= 0 ? '+' : ''}${(r.change * 100).toFixed(1)}%`.padStart(9))
+          : ''.padStart(9);
+        console.log(
+          chalk.white(`   ${r.case.padEnd(34)}`) +
+          chalk.cyan(Math.round(r.rows_per_s!).toLocaleString().padStart(13)) +
+          chalk.white(r.mb_per_s!.toFixed(1).padStart(9)) +
+          chalk.magenta(`${r.peak_rss_mb!.toFixed(0)} MB`.padStart(10)) +
+          change,
+        );
+      }
+
+      if (options.saveBaseline) {
+        console.log(chalk.green(`\n💾 Baseline guardado: ${report.baseline}`));
+      }
+      if (report.max_regression != null) {
+        if (report.passed) {
+          console.log(chalk.green(`\n✅ Sin regresiones (tolerancia ${+(report.max_regression * 100).toFixed(2)}%)`));
+        } else {
+          console.log(chalk.red(`\n❌ ${report.regressions.length} regresión(es) > ${+(report.max_regression * 100).toFixed(2)}%:`));
+          for (const reg of report.regressions) {
+            console.log(chalk.red(`   ${reg.case}: ${Math.round(reg.baseline).toLocaleString()} → ${Math.round(reg.current).toLocaleString()} filas/s (${(reg.change * 100).toFixed(1)}%)`));
+          }
+          process.exitCode = 3;
+        }
+      }
+      console.log();
+    } catch (error: any) {
+      spinner?.fail(chalk.red('Benchmark fallido'));
+      console.error(chalk.red(`\n❌ ${error.message}\n`));
+      process.exit(1);
+    }
+  });
+
 // ── Comando: info ───────────────────────────────────────────────────────
 
 program
-  .command('info <file>')
+  .command('info <files...>')
   .alias('i')
-  .description('Muestra información del archivo')
-  .action((file: string) => {
-    console.log(chalk.bold.cyan('\n📋 Información del Archivo\n'));
-    if (!existsSync(file)) {
-      console.log(chalk.red(`❌ Archivo no encontrado: ${file}\n`));
-      process.exit(1);
+  .description('Metadatos sin convertir: footer en Parquet, muestra acotada en el resto')
+  .option('--json',                     'Imprimir el resultado como JSON')
+  .option('--sample-kb <kb>',           'Cabecera muestreada en formatos de texto (KB)')
+  .action(async (files: string[], options: any) => {
+    const sampleBytes = options.sampleKb ? parseInt(options.sampleKb, 10) * 1024 : undefined;
+    let infos: FileInfo[] | null = null;
+    let error: string | undefined;
+    try {
+      infos = await getFilesInfo(files, { sampleBytes });
+    } catch (e: any) {
+      // Sin Python: solo lo que da el sistema de archivos
+      error = e.message;
     }
-    const stats = statSync(file);
-    console.log(chalk.white(`   Nombre:      ${chalk.cyan(basename(file))}`));
-    console.log(chalk.white(`   Ruta:        ${chalk.gray(resolve(file))}`));
-    console.log(chalk.white(`   Extensión:   ${chalk.blue(extname(file).toLowerCase())}`));
-    console.log(chalk.white(`   Tamaño:      ${chalk.magenta(formatBytes(stats.size))}`));
-    console.log(chalk.white(`   Modificado:  ${chalk.yellow(stats.mtime.toLocaleString())}`));
-    console.log();
+
+    if (options.json) {
+      const out: Partial<FileInfo>[] = infos ?? files.map((file) => ({ success: false, file, error }));
+      console.log(JSON.stringify(files.length === 1 ? out[0] : out, null, 2));
+      if (out.some((i) => !i.success)) process.exitCode = 1;
+      return;
+    }
+
+    console.log(chalk.bold.cyan('\n📋 Información del Archivo\n'));
+    files.forEach((file, i) => {
+      if (!existsSync(file)) {
+        console.log(chalk.red(`❌ Archivo no encontrado: ${file}\n`));
+        process.exitCode = 1;
+        return;
+      }
+      const stats = statSync(file);
+      console.log(chalk.white(`   Nombre:      ${chalk.cyan(basename(file))}`));
+      console.log(chalk.white(`   Ruta:        ${chalk.gray(resolve(file))}`));
+      console.log(chalk.white(`   Extensión:   ${chalk.blue(extname(file).toLowerCase())}`));
+      console.log(chalk.white(`   Tamaño:      ${chalk.magenta(formatBytes(stats.size))}`));
+      console.log(chalk.white(`   Modificado:  ${chalk.yellow(stats.mtime.toLocaleString())}`));
+      const info = infos?.[i];
+      if (info?.success) {
+        printFileInfo(info);
+      } else {
+        console.log(chalk.gray(`   (sin metadatos: ${info?.error ?? error})`));
+      }
+      console.log();
+    });
   });
 
 // ── Default ─────────────────────────────────────────────────────────────
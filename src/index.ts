@@ -8,8 +8,16 @@ export * from './types/index';
 
 export { NativePythonBackend } from './backends/native-python';
 export { PortablePythonBackend } from './backends/portable-python';
-export { PyodideBackend } from './backends/pyodide-backend';
+export { PyodideBackend, writeInputToFS } from './backends/pyodide-backend';
+export type { PyodideInput, PyodideFS } from './backends/pyodide-backend';
+export { defaultCacheDir } from './utils/runtime';
+export type { PyodideCache } from './utils/runtime';
 export { CythonBackend } from './backends/cython-backend';
+export { runBenchmark, buildBenchmarkArgs } from './utils/benchmark';
+export { convertStream, buildStreamArgs } from './utils/stream';
+export { compactFiles, buildCompactArgs } from './utils/compact';
+export { getFileInfo, getFilesInfo } from './utils/info';
+export type { StreamSource, StreamTarget } from './utils/stream';
 
 export async function convertToParquet(
   inputFile: string,
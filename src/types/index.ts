@@ -7,6 +7,9 @@ export type BackendType = 'native-python' | 'portable-python' | 'pyodide' | 'cyt
 // 'adaptive' = elige automáticamente el mejor algoritmo
 export type CompressionType = 'snappy' | 'gzip' | 'brotli' | 'zstd' | 'lz4' | 'none' | 'adaptive';
 
+// 'auto' = lo decide el planner de converter_advanced.py
+export type ConversionEngine = 'auto' | 'in-memory' | 'parallel' | 'streaming';
+
 export interface ConversionOptions {
   output?: string;
   verbose?: boolean;
@@ -17,6 +20,36 @@ export interface ConversionOptions {
   forceBackend?: BackendType;
   compression?: CompressionType;
   parallelWorkers?: number;
+  profile?: boolean;          // añade `profile` (tiempos por etapa) al resultado
+  profileTrace?: string;      // exporta Chrome trace (.json) o JSON lines (.jsonl); implica profile
+  memoryLimit?: number;       // MB en vuelo en el pipeline de streaming (default: según RAM)
+  engine?: ConversionEngine;  // fuerza el engine en vez de dejarlo al planner
+  explain?: boolean;          // añade `plan` y `backend_plan` (estimaciones del modelo de coste)
+  columns?: string[];         // solo estas columnas (nombre original o normalizado)
+  filter?: string;            // filtro de filas, sintaxis de DataFrame.query (p. ej. "amount > 100")
+  inputFormat?: string;       // formato de entrada (csv, ndjson...) en vez de detectarlo; útil con streams
+  progress?: boolean;         // pide eventos de progreso a Python (implícito con onProgress)
+  onProgress?: (event: ProgressEvent) => void;  // recibe cada evento en vivo (backends Python)
+  metricsFile?: string;       // métricas en vivo: texto de Prometheus (.prom) o JSON
+  encoding?: string;          // codificación de la entrada de texto (latin-1, cp1252, utf-16...) en vez de detectarla
+  sample?: number | string;   // muestra aleatoria: N filas (1000) o porcentaje ('1%') en vez del archivo entero
+  sampleSeed?: number;        // semilla de la muestra (sin ella se elige una y se reporta)
+}
+
+// Evento de progreso en vivo (--progress: una línea JSON por stderr)
+export interface ProgressEvent {
+  event: 'progress';
+  stage: string;                 // detect | plan | read | repair | normalize | compression_analysis | pipeline | to_arrow | write | done | failed
+  elapsed_s: number;
+  bytes_read: number;            // bytes de entrada consumidos
+  total_bytes: number | null;    // null con stdin
+  rows_read: number;
+  rows_written: number;
+  rows_per_s: number | null;     // null en el primer intervalo
+  mb_per_s: number | null;
+  rss_mb: number;
+  percent: number | null;        // null si no hay forma de estimarlo (stdin)
+  eta_s: number | null;
 }
 
 export interface CompressionAnalysis {
@@ -27,6 +60,99 @@ export interface CompressionAnalysis {
   size_score: number;            // 1-5 (5=más pequeño)
 }
 
+// Métricas de una etapa (acumuladas si se ejecuta por chunk)
+export interface StageProfile {
+  name: string;                  // detect | plan | read | repair | normalize | compression_analysis | to_arrow | write
+  calls: number;
+  wall_s: number;
+  cpu_s: number;
+  rows: number;
+  bytes: number;
+  peak_rss_mb: number;
+  rows_per_s: number | null;
+  mb_per_s: number | null;
+}
+
+// Tiempos de un worker de los caminos paralelos
+export interface WorkerProfile {
+  stage: string;                 // parallel_csv | transform (pipeline de streaming)
+  index: number;
+  pid: number;
+  wall_s: number;
+  cpu_s: number;
+  rows: number;
+  success: boolean;
+}
+
+export interface ConversionProfile {
+  total_wall_s: number;
+  total_cpu_s: number;
+  peak_rss_mb: number;
+  peak_rss_children_mb: number;
+  stages: StageProfile[];
+  workers: WorkerProfile[];
+}
+
+// Pipeline de streaming lector → transformadores → escritor
+export interface PipelineStats {
+  wall_s: number;
+  chunks: number;
+  transform_workers: number;
+  queue_size: number;
+  busy_s: { read: number; transform: number; write: number };
+  wait_s: { read_backpressure: number; write_starved: number };
+  utilization: { read: number; transform: number; write: number };  // 0-1
+  bottleneck: 'read' | 'transform' | 'write';
+  memory_limit_mb: number;
+  peak_inflight_mb: number;
+}
+
+// Plan del modelo de coste (converter_advanced.py --explain)
+export interface EngineEstimate {
+  seconds: number;
+  peak_memory_mb: number;
+  fits: boolean;                 // cabe en el presupuesto de memoria
+}
+
+export interface ConversionPlan {
+  engine: Exclude<ConversionEngine, 'auto'>;
+  streaming: boolean;
+  workers: number;
+  chunk_rows: number;
+  memory_limit_mb: number;
+  estimated_rows: number | null;
+  estimated_memory_mb: number;   // DataFrame completo en pandas
+  sample: {
+    rows: number;
+    columns: number;
+    bytes: number;
+    complete: boolean;
+    bytes_per_row: number;
+    memory_per_row: number;
+    expansion: number;           // bytes en pandas / bytes en disco
+    rows_per_s: number;
+  } | null;                      // null: formato sin muestreo (factor por formato)
+  system: { cores: number; available_memory_mb: number | null; memory_budget_mb: number | null };
+  estimates: Partial<Record<Exclude<ConversionEngine, 'auto'>, EngineEstimate>>;
+  reason: string;
+  overrides: string[];           // engine · workers · memory_limit fijados por el usuario
+  warnings: string[];
+}
+
+// Elección de backend del BackendSelector
+export interface BackendCandidate {
+  backend: BackendType;
+  estimated_s: number;
+  fits: boolean;
+}
+
+export interface BackendPlan {
+  backend: BackendType;
+  file_size: number;
+  reason: string;
+  candidates: BackendCandidate[];  // solo los disponibles, de más a menos rápido
+}
+
 export interface ConversionResult {
   success: boolean;
   backend?: BackendType;
@@ -44,10 +170,174 @@ export interface ConversionResult {
   chunks_processed?: number;
   errors_fixed?: number;
   columns_removed?: number;
+  datetime_columns?: Record<string, string>; // columna → formato strftime o 'epoch:<unidad>'
+  encoding?: string;            // formatos de texto: codificación leída (nombre de Python)
+  encoding_detection?: 'user' | 'bom' | 'nul-pattern' | 'validation' | 'charset-normalizer' | 'heuristic';
+  replaced_bytes?: number;      // bytes no válidos en `encoding`, sustituidos por U+FFFD
   streaming_mode?: boolean;
   parallel_workers?: number;
   limitations?: string[];
-  parquet_bytes?: number[];
+  parquet_bytes?: Uint8Array;   // solo en memoria (convertData); buffer transferible
+  pipeline?: PipelineStats;     // solo en modo streaming
+  profile?: ConversionProfile;  // solo con profile / profileTrace
+  profile_trace?: string;
+  plan?: ConversionPlan;        // solo con explain
+  backend_plan?: BackendPlan;   // solo con explain y backend automático
+  sample?: SampleInfo;          // solo con sample
+}
+
+// Muestra aleatoria (--sample): cómo se tomó y de qué población
+export interface SampleInfo {
+  method: 'seek' | 'reservoir' | 'bernoulli';  // seek: bloques aleatorios sin leer el archivo entero
+  requested: string;             // '1000' o '1%'
+  seed: number;                  // repetir con esta semilla da la misma muestra
+  rows: number;
+  population_rows: number;       // filas del archivo (tras el filtro); estimadas con seek
+  exact_population: boolean;
+  bytes_read: number;
+  blocks?: number;               // solo seek
+  block_bytes?: number;
+}
+
+// ─── Benchmark (python/benchmark.py) ──────────────────────────────────────────
+
+export interface BenchmarkOptions {
+  datasets?: string[];       // narrow_numeric · wide_string · messy_csv · ndjson · columnar
+  sizes?: string[];          // small · medium · large
+  engines?: string[];        // pandas · parallel · streaming · cython · arrow
+  repeat?: number;           // se queda con la mejor de N ejecuciones
+  workers?: number;
+  dataDir?: string;          // caché de datasets generados
+  baseline?: string;         // default: benchmarks/baseline.json
+  saveBaseline?: boolean;
+  maxRegression?: number;    // % de caída de filas/s tolerada frente al baseline
+  verbose?: boolean;
+}
+
+export interface BenchmarkCase {
+  case: string;              // dataset/size/engine
+  dataset: string;
+  size: string;
+  engine: string;
+  input_size: number;
+  rows?: number;
+  seconds?: number;
+  median_s?: number;
+  rows_per_s?: number;
+  mb_per_s?: number;
+  peak_rss_mb?: number;
+  output_size?: number;
+  baseline_rows_per_s?: number;
+  change?: number;           // fracción vs baseline (-0.12 = 12% más lento)
+  skipped?: string;
+  error?: string;
+}
+
+export interface BenchmarkRegression {
+  case: string;
+  baseline: number;
+  current: number;
+  change: number;
+}
+
+export interface BenchmarkReport {
+  success: boolean;
+  passed: boolean;
+  environment: Record<string, string | number>;
+  baseline: string;
+  max_regression: number | null;
+  results: BenchmarkCase[];
+  regressions: BenchmarkRegression[];
+}
+
+export interface CompactOptions {
+  outputDir: string;
+  targetSize?: number;       // MB en disco por archivo de salida (default 512)
+  rowGroupSize?: number;     // MB en memoria por row group (default 128)
+  sourceColumn?: string;     // añade una columna con la ruta de origen
+  workers?: number;          // hilos lectores (0 = auto)
+  compression?: Exclude<CompressionType, 'adaptive'>;
+  autoRepair?: boolean;
+  autoNormalize?: boolean;
+  overwrite?: boolean;       // borra los part-*.parquet de una pasada anterior en outputDir
+  verbose?: boolean;
+}
+
+export interface CompactedFile {
+  path: string;
+  rows: number;
+  row_groups: number;
+  bytes: number;
+}
+
+export interface CompactResult {
+  success: boolean;
+  inputs: number;
+  compacted: number;
+  failed: { file: string; error: string }[];
+  rows: number;
+  columns: number;
+  output_dir: string;
+  output_files: CompactedFile[];
+  row_groups: number;
+  input_size: number;
+  output_size: number;
+  schema_changes: number;    // archivos cerrados antes de tiempo por un esquema más ancho
+  workers: number;
+  elapsed_time: number;
+}
+
+export interface ColumnSchema {
+  name: string;
+  type: string;              // tipo Arrow, p. ej. 'int64', 'timestamp[us]'
+  nullable: boolean;
+}
+
+// Por columna, del footer Parquet (sumado/agregado sobre los row groups)
+export interface ParquetColumnStats {
+  name: string;
+  physical_type: string;
+  logical_type: string;
+  compressed_size: number;
+  uncompressed_size: number;
+  codecs: string[];
+  encodings: string[];
+  null_count: number | null; // null si algún row group no tiene estadísticas
+  min: unknown;
+  max: unknown;
+}
+
+export interface FileInfo {
+  success: boolean;
+  file: string;
+  size: number;
+  modified: string;          // ISO 8601
+  format: string;            // 'parquet' o el formato detectado
+  exact?: boolean;           // false = filas y tamaño estimados por muestra
+  rows?: number;
+  columns?: number;
+  schema?: ColumnSchema[];
+  // Parquet (solo footer)
+  row_groups?: number;
+  row_group_rows?: number[];
+  created_by?: string;
+  format_version?: string;
+  codecs?: string[];
+  compressed_size?: number;
+  uncompressed_size?: number;
+  column_stats?: ParquetColumnStats[];
+  // Formatos de entrada (muestra acotada)
+  sample_rows?: number;
+  sample_bytes?: number;
+  encoding?: string;         // codificación detectada (formatos de texto)
+  delimiter?: string;
+  compression?: string;      // algoritmo que elegiría la compresión adaptativa
+  projected_parquet_size?: number;
+  datetime_columns?: Record<string, string>;
+  sampled?: boolean;         // false: formato no muestreable y demasiado grande
+  reason?: string;
+  error?: string;            // getFilesInfo: el archivo no se pudo leer
+  elapsed_time: number;
 }
 
 export interface Environment {
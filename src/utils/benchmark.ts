@@ -0,0 +1,54 @@
+/**
+ * Benchmark runner
+ * Lanza python/benchmark.py (datasets sintéticos × motores) y devuelve el
+ * reporte tipado. El exit code 3 de Python (regresión frente al baseline) no
+ * es un error de ejecución: se resuelve con `passed: false`.
+ */
+
+import { join } from 'path';
+import { BenchmarkOptions, BenchmarkReport } from '../types';
+import { findPython, runPythonJson } from './python-runner';
+
+/** Exit code de benchmark.py cuando hay regresiones. */
+export const EXIT_REGRESSION = 3;
+
+export function defaultBenchmarkScript(): string {
+  return join(__dirname, '..', '..', 'python', 'benchmark.py');
+}
+
+export function buildBenchmarkArgs(scriptPath: string, options: BenchmarkOptions = {}): string[] {
+  const args = [scriptPath];
+
+  if (options.datasets?.length)   args.push('--datasets', options.datasets.join(','));
+  if (options.sizes?.length)      args.push('--sizes', options.sizes.join(','));
+  if (options.engines?.length)    args.push('--engines', options.engines.join(','));
+  if (options.repeat != null)     args.push('--repeat', String(options.repeat));
+  if (options.workers != null)    args.push('--workers', String(options.workers));
+  if (options.dataDir)            args.push('--data-dir', options.dataDir);
+  if (options.baseline)           args.push('--baseline', options.baseline);
+  if (options.saveBaseline)       args.push('--save-baseline');
+  if (options.maxRegression != null) args.push('--max-regression', `${options.maxRegression}%`);
+  if (options.verbose)            args.push('-v');
+
+  return args;
+}
+
+export async function runBenchmark(
+  options: BenchmarkOptions = {},
+  deps: { python?: string; script?: string } = {},
+): Promise<BenchmarkReport> {
+  const python = deps.python ?? await findPython();
+  if (!python) {
+    throw new Error('Python no encontrado. Instala Python 3.8+');
+  }
+
+  const args = buildBenchmarkArgs(deps.script ?? defaultBenchmarkScript(), options);
+  // En verbose el progreso de Python (stderr) va directo a la terminal
+  const stdio: any = ['ignore', 'pipe', options.verbose ? 'inherit' : 'pipe'];
+
+  return runPythonJson<BenchmarkReport>(python, args, {
+    execError:   (m) => `Error ejecutando benchmark: ${m}`,
+    parseError:  (e) => `Error al parsear reporte de benchmark: ${e.message}`,
+    nonZeroCode: (code) => `Benchmark falló (código ${code})`,
+  }, { stdio }, [0, EXIT_REGRESSION]);
+}
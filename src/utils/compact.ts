@@ -0,0 +1,53 @@
+/**
+ * Compaction runner
+ * Lanza python/compact.py: muchas entradas pequeñas (o salidas de `batch`)
+ * → pocos Parquet grandes con row groups bien dimensionados.
+ */
+
+import { join } from 'path';
+import { CompactOptions, CompactResult } from '../types';
+import { findPython, runPythonJson } from './python-runner';
+
+export function defaultCompactScript(): string {
+  return join(__dirname, '..', '..', 'python', 'compact.py');
+}
+
+export function buildCompactArgs(scriptPath: string, inputs: string[], options: CompactOptions): string[] {
+  const args = [scriptPath, ...inputs, '-o', options.outputDir];
+
+  if (options.targetSize != null)   args.push('--target-size', String(options.targetSize));
+  if (options.rowGroupSize != null) args.push('--row-group-size', String(options.rowGroupSize));
+  if (options.sourceColumn)         args.push('--source-column', options.sourceColumn);
+  if (options.workers != null)      args.push('--workers', String(options.workers));
+  if (options.compression)          args.push('--compression', options.compression);
+  if (options.autoRepair === false)    args.push('--no-repair');
+  if (options.autoNormalize === false) args.push('--no-normalize');
+  if (options.overwrite)            args.push('--overwrite');
+  if (options.verbose)              args.push('-v');
+
+  return args;
+}
+
+export async function compactFiles(
+  inputs: string[],
+  options: CompactOptions,
+  deps: { python?: string; script?: string } = {},
+): Promise<CompactResult> {
+  if (!inputs.length) {
+    throw new Error('No hay archivos de entrada');
+  }
+  const python = deps.python ?? await findPython();
+  if (!python) {
+    throw new Error('Python no encontrado. Instala Python 3.8+');
+  }
+
+  const args = buildCompactArgs(deps.script ?? defaultCompactScript(), inputs, options);
+  // En verbose el log por archivo (stderr) va directo a la terminal
+  const stdio: any = ['ignore', 'pipe', options.verbose ? 'inherit' : 'pipe'];
+
+  return runPythonJson<CompactResult>(python, args, {
+    execError:   (m) => `Error ejecutando compactación: ${m}`,
+    parseError:  (e) => `Error al parsear resultado de compactación: ${e.message}`,
+    nonZeroCode: (code) => `Compactación falló (código ${code})`,
+  }, { stdio });
+}
@@ -0,0 +1,65 @@
+/**
+ * File info runner
+ * Lanza python/file_info.py: metadatos sin convertir (footer en Parquet,
+ * muestra acotada de la cabecera en los formatos de entrada). Varios archivos
+ * van en un solo proceso Python, así el arranque se paga una vez.
+ */
+
+import { join } from 'path';
+import { FileInfo } from '../types';
+import { findPython, runPythonJson } from './python-runner';
+
+export interface InfoOptions {
+  sampleBytes?: number;      // cabecera muestreada en formatos de texto (default 2 MB)
+}
+
+export function defaultInfoScript(): string {
+  return join(__dirname, '..', '..', 'python', 'file_info.py');
+}
+
+export function buildInfoArgs(scriptPath: string, files: string[], options: InfoOptions = {}): string[] {
+  const args = [scriptPath, ...files];
+  if (options.sampleBytes != null) args.push('--sample-bytes', String(Math.ceil(options.sampleBytes / 1024)));
+  return args;
+}
+
+const MESSAGES = {
+  execError:   (m: string) => `Error ejecutando info: ${m}`,
+  parseError:  (e: Error) => `Error al parsear info: ${e.message}`,
+  nonZeroCode: (code: number | null) => `Info falló (código ${code})`,
+};
+
+async function resolvePython(deps: { python?: string }): Promise<string> {
+  const python = deps.python ?? await findPython();
+  if (!python) {
+    throw new Error('Python no encontrado. Instala Python 3.8+');
+  }
+  return python;
+}
+
+export async function getFileInfo(
+  file: string,
+  options: InfoOptions = {},
+  deps: { python?: string; script?: string } = {},
+): Promise<FileInfo> {
+  const args = buildInfoArgs(deps.script ?? defaultInfoScript(), [file], options);
+  return runPythonJson<FileInfo>(await resolvePython(deps), args, MESSAGES);
+}
+
+/** Un FileInfo por archivo; los que fallan llegan con `success: false` y `error`. */
+export async function getFilesInfo(
+  files: string[],
+  options: InfoOptions = {},
+  deps: { python?: string; script?: string } = {},
+): Promise<FileInfo[]> {
+  if (files.length === 1) {
+    try {
+      return [await getFileInfo(files[0], options, deps)];
+    } catch (e: any) {
+      return [{ success: false, file: files[0], error: e.message } as FileInfo];
+    }
+  }
+  const args = buildInfoArgs(deps.script ?? defaultInfoScript(), files, options);
+  const report = await runPythonJson<{ files: FileInfo[] }>(await resolvePython(deps), args, MESSAGES);
+  return report.files;
+}
@@ -5,6 +5,45 @@
 
 import cliProgress from 'cli-progress';
 import chalk from 'chalk';
+import { ProgressEvent } from '../types';
+
+// Etapas de converter_advanced.py (--progress) → texto para la barra
+export const STAGE_LABELS: Record<string, string> = {
+  start:                'Iniciando',
+  detect:               'Detectando formato',
+  plan:                 'Planificando',
+  read:                 'Leyendo datos',
+  repair:               'Aplicando reparación',
+  normalize:            'Normalizando columnas',
+  compression_analysis: 'Analizando compresión',
+  pipeline:             'Procesando chunks',
+  to_arrow:             'Convirtiendo a Arrow',
+  write:                'Escribiendo Parquet',
+  done:                 'Finalizado',
+  failed:               'Error',
+};
+
+function formatEta(seconds: number): string {
+  if (seconds < 60) return `${Math.ceil(seconds)}s`;
+  const minutes = Math.floor(seconds / 60);
+  return `${minutes}m ${Math.round(seconds % 60)}s`;
+}
+
+/**
+ * Una línea de estado a partir de un evento de progreso:
+ * "Procesando chunks | 1,200,000 filas | 250,000 filas/s | 48.2 MB/s | 310 MB RSS | ETA 12s".
+ * Los campos que Python no puede estimar (ETA con stdin, tasas al arrancar) se omiten.
+ */
+export function formatProgressEvent(event: ProgressEvent): string {
+  const parts = [STAGE_LABELS[event.stage] ?? event.stage];
+  const rows = event.rows_written || event.rows_read;
+  if (rows) parts.push(`${rows.toLocaleString('en-US')} filas`);
+  if (event.rows_per_s) parts.push(`${Math.round(event.rows_per_s).toLocaleString('en-US')} filas/s`);
+  if (event.mb_per_s) parts.push(`${event.mb_per_s.toFixed(1)} MB/s`);
+  parts.push(`${Math.round(event.rss_mb)} MB RSS`);
+  if (event.eta_s !== null && event.stage !== 'done') parts.push(`ETA ${formatEta(event.eta_s)}`);
+  return parts.join(' | ');
+}
 
 export class ProgressBar {
   private bar: cliProgress.SingleBar;
@@ -121,6 +160,43 @@ export class FileProgressBar {
   }
 }
 
+/**
+ * Barra de una conversión alimentada por los eventos de progreso de Python:
+ * avanza con el porcentaje real (bytes leídos/filas escritas, o la estimación
+ * del planner) y muestra etapa, throughput y ETA.
+ */
+export class ConversionProgressBar {
+  private bar: cliProgress.SingleBar;
+  private percent: number = 0;
+
+  constructor(label: string = 'Convirtiendo') {
+    this.bar = new cliProgress.SingleBar({
+      format: `${chalk.cyan(label)} |${chalk.cyan('{bar}')}| {percentage}% | {status}`,
+      barCompleteChar: '\u2588',
+      barIncompleteChar: '\u2591',
+      hideCursor: true,
+      clearOnComplete: false,
+    });
+    this.bar.start(100, 0, { status: STAGE_LABELS.start + '...' });
+  }
+
+  /** Listo para pasarlo como `onProgress` de la conversión. */
+  update = (event: ProgressEvent) => {
+    if (event.percent !== null) this.percent = Math.floor(event.percent);
+    this.bar.update(this.percent, { status: formatProgressEvent(event) });
+  };
+
+  stop(status: string) {
+    this.bar.update(this.percent, { status });
+    this.bar.stop();
+  }
+
+  complete() {
+    this.percent = 100;
+    this.stop(chalk.green('¡Completado!'));
+  }
+}
+
 export class TaskProgressBar {
   private bar: cliProgress.SingleBar;
   private tasks: string[] = [];
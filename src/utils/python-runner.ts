@@ -10,7 +10,7 @@
  */
 
 import { spawn, SpawnOptions } from 'child_process';
-import { ConversionResult, BackendType } from '../types';
+import { ConversionResult, BackendType, ProgressEvent } from '../types';
 
 // ─── Python discovery ─────────────────────────────────────────────────────────
 
@@ -60,27 +60,77 @@ function safeParseJSON(str: string): any {
   return JSON.parse(str);
 }
 
+/** true si la línea es un evento de progreso de --progress. */
+export function isProgressLine(line: string): boolean {
+  return line.startsWith('{"event"');
+}
+
 /**
- * Ejecuta un comando Python que imprime JSON en stdout y resuelve el resultado
- * tipado, etiquetado con `backend`. Centraliza el patrón spawn→parse→resolve.
+ * Separa los eventos de progreso (líneas JSON con `event`) del resto de
+ * stderr a medida que llegan. Un chunk puede cortar una línea: la parte
+ * incompleta espera al siguiente. `push`/`flush` devuelven el texto que no
+ * era un evento (logs de -v, tracebacks) para acumularlo como stderr.
+ */
+export function createEventParser(onEvent: (event: ProgressEvent) => void) {
+  let pending = '';
+
+  const take = (line: string): string => {
+    let event: ProgressEvent | null = null;
+    if (isProgressLine(line)) {
+      try {
+        event = JSON.parse(line) as ProgressEvent;
+      } catch {
+        // no era JSON válido: se queda en stderr
+      }
+    }
+    if (!event) return line + '\n';
+    onEvent(event);
+    return '';
+  };
+
+  return {
+    push(chunk: string): string {
+      pending += chunk;
+      const lines = pending.split('\n');
+      pending = lines.pop() ?? '';
+      return lines.map(take).join('');
+    },
+    flush(): string {
+      const rest = pending;
+      pending = '';
+      return rest ? take(rest) : '';
+    },
+  };
+}
+
+/**
+ * Ejecuta un script Python que imprime un objeto JSON en stdout y lo devuelve
+ * parseado. `okCodes` son los exit codes cuyo stdout se considera resultado
+ * (p. ej. el benchmark sale con 3 cuando detecta regresiones). Con `onEvent`
+ * los eventos de progreso de stderr se entregan en vivo, no al final.
  */
-export function runPythonToJson(
+export function runPythonJson<T = any>(
   command: string,
   args: string[],
-  backend: BackendType,
   messages: RunMessages,
   spawnOptions: SpawnOptions = { stdio: ['ignore', 'pipe', 'pipe'] },
-): Promise<ConversionResult> {
+  okCodes: number[] = [0],
+  onEvent?: (event: ProgressEvent) => void,
+): Promise<T> {
   return new Promise((resolve, reject) => {
     const proc = spawn(command, args, spawnOptions);
 
     let stdout = '';
     let stderr = '';
+    const events = onEvent ? createEventParser(onEvent) : null;
     proc.stdout?.on('data', (d: Buffer) => { stdout += d.toString(); });
-    proc.stderr?.on('data', (d: Buffer) => { stderr += d.toString(); });
+    proc.stderr?.on('data', (d: Buffer) => {
+      stderr += events ? events.push(d.toString()) : d.toString();
+    });
 
     proc.on('close', (code) => {
-      if (code !== 0) {
+      if (events) stderr += events.flush();
+      if (!okCodes.includes(code as number)) {
         let errorData: any;
         try {
           errorData = safeParseJSON(stdout);
@@ -103,10 +153,26 @@ export function runPythonToJson(
         return reject(new Error(result.error || 'Error desconocido'));
       }
 
-      result.backend = backend;
-      resolve(result as ConversionResult);
+      resolve(result as T);
     });
 
     proc.on('error', (err) => reject(new Error(messages.execError(err.message))));
   });
 }
+
+/**
+ * Ejecuta un comando Python que imprime JSON en stdout y resuelve el resultado
+ * tipado, etiquetado con `backend`. Centraliza el patrón spawn→parse→resolve.
+ */
+export async function runPythonToJson(
+  command: string,
+  args: string[],
+  backend: BackendType,
+  messages: RunMessages,
+  spawnOptions: SpawnOptions = { stdio: ['ignore', 'pipe', 'pipe'] },
+  onEvent?: (event: ProgressEvent) => void,
+): Promise<ConversionResult> {
+  const result = await runPythonJson<ConversionResult>(command, args, messages, spawnOptions, [0], onEvent);
+  result.backend = backend;
+  return result;
+}
@@ -7,7 +7,8 @@
  * inyectables con defaults reales.
  */
 
-export const PYODIDE_CDN = 'https://cdn.jsdelivr.net/pyodide/v0.24.1/full/';
+export const PYODIDE_VERSION = '0.24.1';
+export const PYODIDE_CDN = `https://cdn.jsdelivr.net/pyodide/v${PYODIDE_VERSION}/full/`;
 
 /** ¿Estamos en Node? (determina indexURL local y lectura de la fuente .py) */
 export function isNodeRuntime(): boolean {
@@ -42,6 +43,27 @@ export interface SourceDeps {
   url?: string;
 }
 
+/** Módulos de python/ que importa pyodide_convert.py (compartidos con el conversor nativo). */
+export const PYODIDE_MODULES = ['projection', 'widening'];
+
+/**
+ * Una sola fuente ejecutable: cada módulo se registra en sys.modules antes de
+ * que pyodide_convert.py lo importe. JSON.stringify da un literal de string
+ * válido en Python.
+ */
+export function bundlePyodideSource(main: string, modules: Record<string, string>): string {
+  const lines = ['import sys as _sys, types as _types'];
+  for (const [name, source] of Object.entries(modules)) {
+    lines.push(
+      `_module = _types.ModuleType(${JSON.stringify(name)})`,
+      `exec(compile(${JSON.stringify(source)}, ${JSON.stringify(name + '.py')}, 'exec'), _module.__dict__)`,
+      `_sys.modules[${JSON.stringify(name)}] = _module`,
+    );
+  }
+  lines.push('del _sys, _types' + (Object.keys(modules).length ? ', _module' : ''));
+  return lines.join('\n') + '\n' + main;
+}
+
 /** Carga el código Python compartido: fs en Node, fetch en navegador. */
 export async function loadPyodideSource(deps: SourceDeps = {}): Promise<string> {
   const node = deps.node ?? isNodeRuntime();
@@ -49,12 +71,49 @@ export async function loadPyodideSource(deps: SourceDeps = {}): Promise<string>
     if (deps.readSource) return deps.readSource();
     const fs = require('fs');
     const path = require('path');
-    return fs.readFileSync(
-      path.join(__dirname, '..', '..', 'python', 'pyodide_convert.py'),
+    const read = (name: string) => fs.readFileSync(
+      path.join(__dirname, '..', '..', 'python', `${name}.py`),
       'utf8',
     );
+    return bundlePyodideSource(read('pyodide_convert'),
+      Object.fromEntries(PYODIDE_MODULES.map((name) => [name, read(name)])));
   }
   const doFetch = deps.fetchFn ?? (fetch as unknown as SourceDeps['fetchFn']);
-  const res = await doFetch!(deps.url ?? './python/pyodide_convert.py');
-  return res.text();
+  const url = deps.url ?? './python/pyodide_convert.py';
+  // Los módulos viven junto a pyodide_convert.py
+  const base = url.slice(0, url.lastIndexOf('/') + 1);
+  const [main, ...modules] = await Promise.all(
+    [url, ...PYODIDE_MODULES.map((name) => `${base}${name}.py`)]
+      .map(async (u) => (await doFetch!(u)).text()),
+  );
+  return bundlePyodideSource(main,
+    Object.fromEntries(PYODIDE_MODULES.map((name, i) => [name, modules[i]])));
+}
+
+// ─── Caché persistente de paquetes ────────────────────────────────────────────
+
+/**
+ * Caché de arranque de Pyodide: `packageCacheDir` se pasa a loadPyodide, así
+ * los wheels de pandas/pyarrow/numpy se descargan una sola vez.
+ */
+export interface PyodideCache {
+  packageCacheDir: string;
+}
+
+export interface CacheDirDeps {
+  env?: Record<string, string | undefined>;
+  homedir?: () => string;
+}
+
+/**
+ * Directorio de caché por defecto: $UPC_PYODIDE_CACHE, o
+ * $XDG_CACHE_HOME|~/.cache/ultra-parquet-converter/pyodide-<versión>.
+ */
+export function defaultCacheDir(deps: CacheDirDeps = {}): string {
+  const env = deps.env ?? process.env;
+  if (env.UPC_PYODIDE_CACHE) return env.UPC_PYODIDE_CACHE;
+  const path = require('path');
+  const home = (deps.homedir ?? require('os').homedir)();
+  const base = env.XDG_CACHE_HOME || path.join(home, '.cache');
+  return path.join(base, 'ultra-parquet-converter', `pyodide-${PYODIDE_VERSION}`);
 }
@@ -0,0 +1,117 @@
+/**
+ * Stream converter
+ * Convierte desde/hacia streams de Node (stdin, respuesta HTTP, uploader de
+ * object storage...) sin archivos temporales: lanza converter_advanced.py con
+ * '-' y conecta los pipes. Con salida a stream, Python escribe el Parquet por
+ * stdout (row group a row group) y el JSON de resultado por stderr.
+ */
+
+import { spawn } from 'child_process';
+import { join } from 'path';
+import { Readable, Writable, finished } from 'stream';
+import { ConversionOptions, ConversionResult } from '../types';
+import { buildPythonArgs } from '../backends/native-python';
+import { createEventParser, findPython, isProgressLine } from './python-runner';
+
+/** Ruta de archivo o stream de Node. */
+export type StreamSource = string | Readable;
+export type StreamTarget = string | Writable;
+
+const STDIO = '-';
+
+export function defaultConverterScript(): string {
+  return join(__dirname, '..', '..', 'python', 'converter_advanced.py');
+}
+
+/** Args de converter_advanced.py: '-' donde haya un stream. */
+export function buildStreamArgs(
+  scriptPath: string,
+  input: StreamSource,
+  output: StreamTarget,
+  options: ConversionOptions = {},
+): string[] {
+  return buildPythonArgs(scriptPath, typeof input === 'string' ? input : STDIO, {
+    ...options,
+    output: typeof output === 'string' ? output : STDIO,
+  });
+}
+
+/**
+ * Última línea JSON de un texto: con -v, stderr mezcla los logs con el
+ * resultado, y con --progress los eventos. null si no hay ninguna.
+ */
+export function parseLastJsonLine(text: string): any | null {
+  const lines = text.split('\n').map((l) => l.trim()).filter(Boolean);
+  for (let i = lines.length - 1; i >= 0; i--) {
+    if (!lines[i].startsWith('{') || isProgressLine(lines[i])) continue;
+    try {
+      return JSON.parse(lines[i]);
+    } catch {
+      // log que empieza por '{': sigue buscando
+    }
+  }
+  return null;
+}
+
+export async function convertStream(
+  input: StreamSource,
+  output: StreamTarget,
+  options: ConversionOptions = {},
+  deps: { python?: string; script?: string } = {},
+): Promise<ConversionResult> {
+  const python = deps.python ?? await findPython();
+  if (!python) {
+    throw new Error('Python no encontrado. Instala Python 3.8+');
+  }
+
+  const args = buildStreamArgs(deps.script ?? defaultConverterScript(), input, output, options);
+  const toStream = typeof output !== 'string';
+
+  return new Promise((resolve, reject) => {
+    const proc = spawn(python, args, {
+      stdio: [typeof input === 'string' ? 'ignore' : 'pipe', 'pipe', 'pipe'],
+    });
+
+    let stdout = '';
+    let stderr = '';
+    const events = options.onProgress ? createEventParser(options.onProgress) : null;
+    if (typeof input !== 'string') {
+      // Python cierra stdin antes de tiempo si falla (p. ej. formato no
+      // soportado): el EPIPE no es el error real, ese llega en el JSON.
+      proc.stdin?.on('error', () => {});
+      input.on('error', (err) => {
+        proc.kill();
+        reject(err);
+      });
+      input.pipe(proc.stdin as Writable);
+    }
+    if (toStream) {
+      // process.stdout no se cierra: lo comparte el resto del proceso
+      proc.stdout?.pipe(output as Writable, { end: output !== process.stdout });
+    } else {
+      proc.stdout?.on('data', (d: Buffer) => { stdout += d.toString(); });
+    }
+    proc.stderr?.on('data', (d: Buffer) => {
+      stderr += events ? events.push(d.toString()) : d.toString();
+    });
+
+    proc.on('close', (code) => {
+      if (events) stderr += events.flush();
+      const result = parseLastJsonLine(toStream ? stderr : stdout);
+      if (!result) {
+        return reject(new Error(stderr.trim() || `Error (código ${code})`));
+      }
+      if (code !== 0 || result.success === false) {
+        return reject(new Error(result.error || `Error (código ${code})`));
+      }
+      result.backend = 'native-python';
+      if (!toStream || output === process.stdout) {
+        return resolve(result as ConversionResult);
+      }
+      // Resuelve cuando el destino terminó de escribir (uploaders con buffer)
+      finished(output as Writable, (err) => (err ? reject(err) : resolve(result as ConversionResult)));
+    });
+
+    proc.on('error', (err) => reject(new Error(`Error ejecutando Python: ${err.message}`)));
+  });
+}
@@ -3,7 +3,7 @@
  */
 
 import { PortablePythonBackend } from '../src/backends/portable-python';
-import { PyodideBackend } from '../src/backends/pyodide-backend';
+import { PyodideBackend, writeInputToFS } from '../src/backends/pyodide-backend';
 import { CythonBackend } from '../src/backends/cython-backend';
 import { detectEnvironment } from '../src/utils/detect';
 import { existsSync, writeFileSync, unlinkSync, mkdirSync } from 'fs';
@@ -281,17 +281,28 @@ describe('PortablePythonBackend', () => {
 // ══════════════════════════════════════════════════════════════════════════════
 describe('PyodideBackend', () => {
 
-  // Mock de instancia Pyodide (incluye globals.set y toPy del nuevo diseño)
+  // Mock de instancia Pyodide (incluye el FS virtual por el que viajan los datos)
   function makeMockPyodide(resultJson: string) {
     return {
       loadPackage: jest.fn().mockResolvedValue(undefined),
       runPythonAsync: jest.fn().mockResolvedValue(resultJson),
       runPython: jest.fn(),
-      toPy: jest.fn((x: unknown) => x),
-      globals: { set: jest.fn() },
+      FS: {
+        open: jest.fn(() => ({ fd: 1 })),
+        write: jest.fn((_s: unknown, buf: Uint8Array) => buf.length),
+        close: jest.fn(),
+        readFile: jest.fn(() => new Uint8Array([1, 2, 3])),
+        unlink: jest.fn(),
+      },
     };
   }
 
+  // Reconstruye como texto lo que se escribió en el FS virtual
+  function writtenText(pyodide: ReturnType<typeof makeMockPyodide>): string {
+    const chunks = pyodide.FS.write.mock.calls.map((c: any[]) => Buffer.from(c[1] as Uint8Array));
+    return Buffer.concat(chunks).toString('utf8');
+  }
+
   function makeLoader(pyodide: ReturnType<typeof makeMockPyodide>) {
     return jest.fn().mockResolvedValue({ loadPyodide: jest.fn().mockResolvedValue(pyodide) });
   }
@@ -301,7 +312,7 @@ describe('PyodideBackend', () => {
       success: true, rows: 2, columns: 2,
       input_size: 20, output_size: 10,
       compression_ratio: 50, compression_used: 'snappy',
-      file_type: 'csv', parquet_bytes: [1, 2, 3],
+      file_type: 'csv', output_path: '/upc/output.parquet',
       ...overrides,
     });
   }
@@ -444,11 +455,41 @@ describe('PyodideBackend', () => {
       expect(result.limitations).toHaveLength(3);
     });
 
-    it('should set text global (not interpolate data into source)', async () => {
+    it('should write text input into the virtual FS (not interpolate data into source)', async () => {
       const pyodide = makeMockPyodide(makePyResult());
       const backend = makeBackend(pyodide);
       await backend.convertData('id,name\n1,Juan');
-      expect(pyodide.globals.set).toHaveBeenCalledWith('_upc_text', 'id,name\n1,Juan');
+      expect(pyodide.runPython).toHaveBeenCalledWith('prepare_workspace()');
+      expect(pyodide.FS.open).toHaveBeenCalledWith('/upc/input', 'w');
+      expect(writtenText(pyodide)).toBe('id,name\n1,Juan');
+      expect(pyodide.FS.close).toHaveBeenCalled();
+      expect(convertCall(pyodide)).not.toContain('Juan');
+    });
+
+    it('should return parquet_bytes as a Uint8Array read from the FS', async () => {
+      const pyodide = makeMockPyodide(makePyResult());
+      const backend = makeBackend(pyodide);
+      const result = await backend.convertData('id\n1');
+      expect(result.parquet_bytes).toBeInstanceOf(Uint8Array);
+      expect(Array.from(result.parquet_bytes!)).toEqual([1, 2, 3]);
+      expect(pyodide.FS.readFile).toHaveBeenCalledWith('/upc/output.parquet');
+      expect(pyodide.FS.unlink).toHaveBeenCalledWith('/upc/output.parquet');
+      expect((result as any).output_path).toBeUndefined();
+    });
+
+    it('should accept an async iterable of chunks (streaming input)', async () => {
+      const pyodide = makeMockPyodide(makePyResult());
+      const backend = makeBackend(pyodide);
+      async function* chunks() {
+        yield 'id,name\n';
+        yield new TextEncoder().encode('1,Juan\n');
+        yield '2,Maria';
+      }
+      const result = await backend.convertData(chunks());
+      expect(result.success).toBe(true);
+      expect(pyodide.FS.write).toHaveBeenCalledTimes(3);
+      expect(writtenText(pyodide)).toBe('id,name\n1,Juan\n2,Maria');
+      expect(convertCall(pyodide)).toContain('"text"');
     });
 
     it('should pass autoRepair=False when disabled', async () => {
@@ -475,6 +516,16 @@ describe('PyodideBackend', () => {
       expect(call).toContain('gzip');
     });
 
+    it('should pass columns and filter to upc_convert as Python literals', async () => {
+      const pyodide = makeMockPyodide(makePyResult());
+      const backend = makeBackend(pyodide);
+      await backend.convertData('id,name\n1,Juan', { columns: ['id'], filter: "name == 'Juan'" });
+      const call = convertCall(pyodide);
+      expect(call).toContain('columns=["id"]');
+      expect(call).toContain(`row_filter="name == 'Juan'"`);
+      expect(call.endsWith(')')).toBe(true);
+    });
+
     it('should throw when Python result has success=false', async () => {
       const pyodide = makeMockPyodide(JSON.stringify({ success: false, error: 'Python falló internamente' }));
       const backend = makeBackend(pyodide);
@@ -532,12 +583,18 @@ describe('PyodideBackend', () => {
       expect(result.rows).toBe(5);
     });
 
-    it('should set binary global via toPy (no giant bytes string)', async () => {
+    it('should write binary input into the virtual FS (no giant bytes string)', async () => {
       const pyodide = makeMockPyodide(makePyResult({ file_type: 'binary' }));
       const backend = makeBackend(pyodide);
       await backend.convertData(new ArrayBuffer(4));
-      expect(pyodide.toPy).toHaveBeenCalled();
-      expect(pyodide.globals.set).toHaveBeenCalledWith('_upc_bytes', expect.anything());
+      expect(pyodide.FS.write).toHaveBeenCalledWith(expect.anything(), expect.any(Uint8Array), 0, 4);
+      expect(convertCall(pyodide)).toContain('"binary"');
+    });
+
+    it('should treat a Uint8Array as binary input', async () => {
+      const pyodide = makeMockPyodide(makePyResult({ file_type: 'excel' }));
+      const backend = makeBackend(pyodide);
+      await backend.convertData(new Uint8Array([80, 75, 3, 4]));
       expect(convertCall(pyodide)).toContain('"binary"');
     });
   });
@@ -564,6 +621,8 @@ describe('PyodideBackend', () => {
       expect(result.input_file).toBe(TMP_CSV);
       expect(result.output_file).toBe(TMP_OUT);
       expect(existsSync(TMP_OUT)).toBe(true);
+      // El archivo se transmite por chunks al FS, nunca como string completo
+      expect(writtenText(pyodide)).toBe('id,name\n1,Juan\n2,Maria');
       // parquet_bytes se descarta en la ruta de archivo (coincide con native)
       expect((result as any).parquet_bytes).toBeUndefined();
     });
@@ -596,14 +655,15 @@ describe('PyodideBackend', () => {
       unlinkSync(join(FIXTURES_DIR, 'bin-out.parquet'));
     });
 
-    it('should write an empty parquet when result has no parquet_bytes', async () => {
-      const noBytes = JSON.stringify({
+    it('should fall back to the default FS output path when Python omits it', async () => {
+      const noPath = JSON.stringify({
         success: true, rows: 0, columns: 0, input_size: 0, output_size: 0,
         compression_ratio: 0, compression_used: 'snappy', file_type: 'csv',
       });
-      const pyodide = makeMockPyodide(noBytes);
+      const pyodide = makeMockPyodide(noPath);
       const backend = makeBackend(pyodide);
       const result = await backend.convert(TMP_CSV);
+      expect(pyodide.FS.readFile).toHaveBeenCalledWith('/upc/output.parquet');
       expect(existsSync(result.output_file!)).toBe(true);
     });
 
@@ -615,6 +675,31 @@ describe('PyodideBackend', () => {
     });
   });
 
+  // ── writeInputToFS ─────────────────────────────────────────────────────────
+
+  describe('writeInputToFS', () => {
+    it('should split long strings into chunks and return the bytes written', async () => {
+      const pyodide = makeMockPyodide('{}');
+      const written = await writeInputToFS(pyodide.FS, '/upc/input', 'abcdefgh', 3);
+      expect(written).toBe(8);
+      expect(pyodide.FS.write).toHaveBeenCalledTimes(3);
+      expect(writtenText(pyodide)).toBe('abcdefgh');
+    });
+
+    it('should never split a UTF-16 surrogate pair across chunks', async () => {
+      const pyodide = makeMockPyodide('{}');
+      await writeInputToFS(pyodide.FS, '/upc/input', 'ab😀cd', 3);
+      expect(writtenText(pyodide)).toBe('ab😀cd');
+    });
+
+    it('should close the FS stream even when a chunk fails', async () => {
+      const pyodide = makeMockPyodide('{}');
+      pyodide.FS.write.mockImplementationOnce(() => { throw new Error('ENOSPC'); });
+      await expect(writeInputToFS(pyodide.FS, '/upc/input', 'x')).rejects.toThrow('ENOSPC');
+      expect(pyodide.FS.close).toHaveBeenCalled();
+    });
+  });
+
   // ── comportamiento interno ────────────────────────────────────────────────
 
   describe('internal behavior', () => {
@@ -666,6 +751,53 @@ describe('PyodideBackend', () => {
     });
   });
 
+  // ── arranque en caliente (runtime compartido + caché de paquetes) ──────────────
+
+  describe('warm start', () => {
+    function makeCache() {
+      return { packageCacheDir: '/tmp/upc-cache' };
+    }
+
+    it('shares one interpreter between backends with the same loader', async () => {
+      const pyodide = makeMockPyodide(makePyResult());
+      const loader = makeLoader(pyodide);
+      const opts = { loader, logger: makeSilentLogger(), sourceLoader: async () => 'S', indexURL: 'test://shared/', cache: null };
+      const a = new PyodideBackend(opts);
+      const b = new PyodideBackend(opts);
+      await a.convertData('a\n1');
+      await b.convertData('b\n2');
+      expect(loader).toHaveBeenCalledTimes(1);
+      expect(pyodide.loadPackage).toHaveBeenCalledTimes(1);
+      // la fuente se ejecuta una sola vez en el intérprete compartido
+      expect(pyodide.runPythonAsync.mock.calls.filter((c: any[]) => c[0] === 'S')).toHaveLength(1);
+    });
+
+    it('serializes concurrent conversions on the shared interpreter', async () => {
+      const pyodide = makeMockPyodide(makePyResult());
+      const backend = makeBackend(pyodide);
+      await Promise.all([backend.convertData('a\n1'), backend.convertData('b\n2')]);
+      // prepare → write → convert de cada llamada no se intercalan
+      const order = pyodide.runPython.mock.invocationCallOrder;
+      const converts = pyodide.runPythonAsync.mock.invocationCallOrder.slice(1);
+      expect(order[0]).toBeLessThan(converts[0]);
+      expect(converts[0]).toBeLessThan(order[1]);
+    });
+
+    it('passes the package cache dir to loadPyodide', async () => {
+      const pyodide = makeMockPyodide('{}');
+      const loadPyodide = jest.fn().mockResolvedValue(pyodide);
+      const backend = new PyodideBackend({
+        loader: jest.fn().mockResolvedValue({ loadPyodide }),
+        logger: makeSilentLogger(),
+        sourceLoader: async () => 'S',
+        cache: makeCache(),
+      });
+      await backend.initialize();
+      expect(loadPyodide).toHaveBeenCalledWith(expect.objectContaining({ packageCacheDir: '/tmp/upc-cache' }));
+      expect(pyodide.loadPackage).toHaveBeenCalled();
+    });
+  });
+
   // ── logger DI ────────────────────────────────────────────────────────────────
 
   describe('logger injection', () => {
@@ -0,0 +1,123 @@
+/**
+ * Tests del runner de benchmark: construcción de argumentos y manejo del
+ * exit code de regresión (3) frente a fallos reales.
+ */
+
+import { EventEmitter } from 'events';
+
+jest.mock('child_process');
+import { spawn } from 'child_process';
+import {
+  buildBenchmarkArgs,
+  runBenchmark,
+  defaultBenchmarkScript,
+  EXIT_REGRESSION,
+} from '../src/utils/benchmark';
+
+const mockSpawn = spawn as unknown as jest.Mock;
+
+function fakeProc(code: number, stdout: string, stderr = '') {
+  const proc = new EventEmitter() as any;
+  proc.stdout = new EventEmitter();
+  proc.stderr = new EventEmitter();
+  process.nextTick(() => {
+    if (stdout) proc.stdout.emit('data', Buffer.from(stdout));
+    if (stderr) proc.stderr.emit('data', Buffer.from(stderr));
+    proc.emit('close', code);
+  });
+  return proc;
+}
+
+const REPORT = {
+  success: true,
+  passed: true,
+  environment: { python: '3.11.9', pandas: '2.2.2', pyarrow: '16.1.0', cpu_count: 8 },
+  baseline: 'benchmarks/baseline.json',
+  max_regression: null,
+  results: [{ case: 'narrow_numeric/small/pandas', dataset: 'narrow_numeric', size: 'small', engine: 'pandas', input_size: 1000, rows_per_s: 1e5 }],
+  regressions: [],
+};
+
+beforeEach(() => mockSpawn.mockReset());
+
+describe('buildBenchmarkArgs', () => {
+  it('only passes the script by default', () => {
+    expect(buildBenchmarkArgs('bench.py')).toEqual(['bench.py']);
+  });
+
+  it('maps every option to its flag', () => {
+    const args = buildBenchmarkArgs('bench.py', {
+      datasets: ['ndjson', 'columnar'],
+      sizes: ['small'],
+      engines: ['arrow', 'pandas'],
+      repeat: 5,
+      workers: 4,
+      dataDir: '/tmp/data',
+      baseline: 'b.json',
+      saveBaseline: true,
+      maxRegression: 10,
+      verbose: true,
+    });
+    expect(args).toEqual([
+      'bench.py',
+      '--datasets', 'ndjson,columnar',
+      '--sizes', 'small',
+      '--engines', 'arrow,pandas',
+      '--repeat', '5',
+      '--workers', '4',
+      '--data-dir', '/tmp/data',
+      '--baseline', 'b.json',
+      '--save-baseline',
+      '--max-regression', '10%',
+      '-v',
+    ]);
+  });
+
+  it('sends sub-1 tolerances as explicit percentages', () => {
+    // 0.5 es 0.5%, no 50%: Python solo acepta fracciones ambiguas con '%'
+    const args = buildBenchmarkArgs('bench.py', { maxRegression: 0.5 });
+    expect(args[args.indexOf('--max-regression') + 1]).toBe('0.5%');
+  });
+
+  it('points the default script at python/benchmark.py', () => {
+    expect(defaultBenchmarkScript()).toMatch(/python[\\/]benchmark\.py$/);
+  });
+});
+
+describe('runBenchmark', () => {
+  it('resolves the parsed report', async () => {
+    mockSpawn.mockImplementation(() => fakeProc(0, JSON.stringify(REPORT)));
+    const report = await runBenchmark({ sizes: ['small'] }, { python: 'python3', script: 'b.py' });
+    expect(report.passed).toBe(true);
+    expect(report.results).toHaveLength(1);
+    expect(mockSpawn).toHaveBeenCalledWith('python3', ['b.py', '--sizes', 'small'], expect.anything());
+  });
+
+  it('resolves (passed=false) when Python exits with the regression code', async () => {
+    const failed = { ...REPORT, passed: false, regressions: [{ case: 'x', baseline: 2, current: 1, change: -0.5 }] };
+    mockSpawn.mockImplementation(() => fakeProc(EXIT_REGRESSION, JSON.stringify(failed)));
+    const report = await runBenchmark({ maxRegression: 10 }, { python: 'python3', script: 'b.py' });
+    expect(report.passed).toBe(false);
+    expect(report.regressions[0].change).toBe(-0.5);
+  });
+
+  it('rejects on other non-zero exit codes', async () => {
+    mockSpawn.mockImplementation(() => fakeProc(1, JSON.stringify({ success: false, error: 'Motor desconocido: x' })));
+    await expect(runBenchmark({}, { python: 'python3', script: 'b.py' })).rejects.toThrow('Motor desconocido');
+  });
+
+  it('inherits stderr in verbose mode', async () => {
+    mockSpawn.mockImplementation(() => fakeProc(0, JSON.stringify(REPORT)));
+    await runBenchmark({ verbose: true }, { python: 'python3', script: 'b.py' });
+    expect(mockSpawn.mock.calls[0][2]).toEqual({ stdio: ['ignore', 'pipe', 'inherit'] });
+  });
+
+  it('rejects when Python is not found', async () => {
+    mockSpawn.mockImplementation(() => {
+      const proc = new EventEmitter() as any;
+      process.nextTick(() => proc.emit('error', new Error('ENOENT')));
+      return proc;
+    });
+    await expect(runBenchmark()).rejects.toThrow('Python no encontrado');
+  });
+});
@@ -0,0 +1,95 @@
+/**
+ * Tests del runner de compactación: argumentos de compact.py y manejo del
+ * resultado / errores.
+ */
+
+import { EventEmitter } from 'events';
+
+jest.mock('child_process');
+import { spawn } from 'child_process';
+import { buildCompactArgs, compactFiles, defaultCompactScript } from '../src/utils/compact';
+
+const mockSpawn = spawn as unknown as jest.Mock;
+
+function fakeProc(code: number, stdout: string, stderr = '') {
+  const proc = new EventEmitter() as any;
+  proc.stdout = new EventEmitter();
+  proc.stderr = new EventEmitter();
+  process.nextTick(() => {
+    if (stdout) proc.stdout.emit('data', Buffer.from(stdout));
+    if (stderr) proc.stderr.emit('data', Buffer.from(stderr));
+    proc.emit('close', code);
+  });
+  return proc;
+}
+
+const RESULT = {
+  success: true,
+  inputs: 3,
+  compacted: 2,
+  failed: [{ file: 'bad.csv', error: 'boom' }],
+  rows: 4000,
+  columns: 5,
+  output_dir: 'out',
+  output_files: [{ path: 'out/part-00000.parquet', rows: 4000, row_groups: 1, bytes: 12345 }],
+  row_groups: 1,
+  input_size: 50000,
+  output_size: 12345,
+  schema_changes: 0,
+  workers: 2,
+  elapsed_time: 0.4,
+};
+
+beforeEach(() => mockSpawn.mockReset());
+
+describe('buildCompactArgs', () => {
+  it('passes inputs and output dir by default', () => {
+    expect(buildCompactArgs('compact.py', ['a.csv', 'drops/'], { outputDir: 'out' }))
+      .toEqual(['compact.py', 'a.csv', 'drops/', '-o', 'out']);
+  });
+
+  it('maps every option to its flag', () => {
+    const args = buildCompactArgs('compact.py', ['drops/'], {
+      outputDir: 'out',
+      targetSize: 256,
+      rowGroupSize: 64,
+      sourceColumn: 'source_file',
+      workers: 4,
+      compression: 'zstd',
+      autoRepair: false,
+      autoNormalize: false,
+      overwrite: true,
+      verbose: true,
+    });
+    expect(args).toEqual([
+      'compact.py', 'drops/', '-o', 'out',
+      '--target-size', '256', '--row-group-size', '64', '--source-column', 'source_file',
+      '--workers', '4', '--compression', 'zstd', '--no-repair', '--no-normalize', '--overwrite', '-v',
+    ]);
+  });
+
+  it('defaults to python/compact.py', () => {
+    expect(defaultCompactScript()).toMatch(/python[\\/]compact\.py$/);
+  });
+});
+
+describe('compactFiles', () => {
+  it('resolves the parsed result', async () => {
+    mockSpawn.mockImplementation(() => fakeProc(0, JSON.stringify(RESULT)));
+    const result = await compactFiles(['drops/'], { outputDir: 'out' }, { python: 'py3', script: 'compact.py' });
+    expect(result.output_files).toHaveLength(1);
+    expect(result.failed[0].file).toBe('bad.csv');
+    expect(mockSpawn.mock.calls[0][0]).toBe('py3');
+  });
+
+  it('rejects with the Python error', async () => {
+    mockSpawn.mockImplementation(() => fakeProc(1, JSON.stringify({ success: false, error: 'Ninguna entrada se pudo leer' })));
+    await expect(compactFiles(['x.csv'], { outputDir: 'out' }, { python: 'py3', script: 'compact.py' }))
+      .rejects.toThrow('Ninguna entrada se pudo leer');
+  });
+
+  it('rejects without inputs', async () => {
+    await expect(compactFiles([], { outputDir: 'out' }, { python: 'py3' })).rejects.toThrow('No hay archivos');
+    expect(mockSpawn).not.toHaveBeenCalled();
+  });
+});
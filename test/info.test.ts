@@ -0,0 +1,75 @@
+/**
+ * Tests del runner de info: argumentos de file_info.py, un archivo frente a
+ * varios (un solo proceso) y errores por archivo.
+ */
+
+import { EventEmitter } from 'events';
+
+jest.mock('child_process');
+import { spawn } from 'child_process';
+import { buildInfoArgs, getFileInfo, getFilesInfo } from '../src/utils/info';
+
+const mockSpawn = spawn as unknown as jest.Mock;
+
+function fakeProc(code: number, stdout: string) {
+  const proc = new EventEmitter() as any;
+  proc.stdout = new EventEmitter();
+  proc.stderr = new EventEmitter();
+  process.nextTick(() => {
+    proc.stdout.emit('data', Buffer.from(stdout));
+    proc.emit('close', code);
+  });
+  return proc;
+}
+
+const PARQUET = {
+  success: true, file: 'out.parquet', size: 1000, modified: '2024-07-05T10:00:00',
+  format: 'parquet', exact: true, rows: 300, columns: 1, row_groups: 1,
+  schema: [{ name: 'id', type: 'int64', nullable: true }], elapsed_time: 0.002,
+};
+const CSV = {
+  success: true, file: 'big.csv', size: 80_000_000, modified: '2024-07-05T10:00:00',
+  format: 'csv', exact: false, rows: 199_973, sample_rows: 5242, delimiter: ',',
+  projected_parquet_size: 7_674_087, elapsed_time: 0.2,
+};
+const DEPS = { python: 'py3', script: 'file_info.py' };
+
+beforeEach(() => mockSpawn.mockReset());
+
+describe('buildInfoArgs', () => {
+  it('passes every file and the sample size in KB', () => {
+    expect(buildInfoArgs('file_info.py', ['a.csv', 'b.parquet'], { sampleBytes: 512 * 1024 }))
+      .toEqual(['file_info.py', 'a.csv', 'b.parquet', '--sample-bytes', '512']);
+  });
+});
+
+describe('getFileInfo', () => {
+  it('resolves footer metadata', async () => {
+    mockSpawn.mockImplementation(() => fakeProc(0, JSON.stringify(PARQUET)));
+    const info = await getFileInfo('out.parquet', {}, DEPS);
+    expect(info.rows).toBe(300);
+    expect(mockSpawn.mock.calls[0][1]).toEqual(['file_info.py', 'out.parquet']);
+  });
+
+  it('rejects with the Python error', async () => {
+    mockSpawn.mockImplementation(() => fakeProc(1, JSON.stringify({ success: false, error: 'Archivo no encontrado: x' })));
+    await expect(getFileInfo('x', {}, DEPS)).rejects.toThrow('Archivo no encontrado: x');
+  });
+});
+
+describe('getFilesInfo', () => {
+  it('runs a single process for many files', async () => {
+    const missing = { success: false, file: 'gone.csv', error: 'Archivo no encontrado: gone.csv' };
+    mockSpawn.mockImplementation(() => fakeProc(0, JSON.stringify({ success: true, files: [PARQUET, missing, CSV] })));
+    const infos = await getFilesInfo(['out.parquet', 'gone.csv', 'big.csv'], {}, DEPS);
+    expect(mockSpawn).toHaveBeenCalledTimes(1);
+    expect(infos.map((i) => i.success)).toEqual([true, false, true]);
+    expect(infos[2].exact).toBe(false);
+  });
+
+  it('turns a single-file failure into an entry', async () => {
+    mockSpawn.mockImplementation(() => fakeProc(1, JSON.stringify({ success: false, error: 'boom' })));
+    const infos = await getFilesInfo(['bad.csv'], {}, DEPS);
+    expect(infos).toEqual([{ success: false, file: 'bad.csv', error: 'boom' }]);
+  });
+});
@@ -16,7 +16,10 @@ import {
   PortablePythonBackend,
   PyodideBackend,
   CythonBackend,
+  convertStream,
+  getFileInfo,
 } from '../src/index';
+import { Readable } from 'stream';
 import { existsSync, writeFileSync, unlinkSync, mkdirSync } from 'fs';
 import { join } from 'path';
 import { describeIfPython, itIfPython } from './helpers/python-env';
@@ -71,6 +74,106 @@ describe('Integration Tests', () => {
       expect(result.success).toBe(true);
       expect(result.streaming_mode).toBe(true);
     }, 30000);
+
+    it('should transcode a Latin-1 export instead of dropping characters', async () => {
+      const latin = join(TEST_DIR, 'test_integration_latin1.csv');
+      const output = join(TEST_DIR, 'output_latin1.parquet');
+      writeFileSync(latin, Buffer.from('id,name,city\n1,José,Córdoba\n2,Zoë,Málaga\n3,Ñandú,Asunción\n', 'latin1'));
+      try {
+        const result = await convertToParquet(latin, { output });
+        expect(result.success).toBe(true);
+        expect(result.rows).toBe(3);
+        // cp1252 sin detector estadístico; con charset_normalizer puede nombrar otra de un byte
+        expect(result.encoding).not.toMatch(/^utf/);
+        expect(result.replaced_bytes).toBe(0);
+      } finally {
+        if (existsSync(latin))  unlinkSync(latin);
+        if (existsSync(output)) unlinkSync(output);
+      }
+    }, 30000);
+
+    it('should convert a narrow CSV piped through stdin without --format', async () => {
+      // Tres columnas: la detección por contenido la ve como txt y el delimitador se deduce
+      const output = join(TEST_DIR, 'output_stdin.parquet');
+      const rows = Array.from({ length: 100 }, (_, i) => `${i},${i * 2},v${i}`).join('\n');
+      try {
+        const result = await convertStream(Readable.from([Buffer.from(`id,a,b\n${rows}\n`)]), output);
+        expect(result.success).toBe(true);
+        expect(result.rows).toBe(100);
+        expect(result.columns).toBe(3);
+        expect(existsSync(output)).toBe(true);
+      } finally {
+        if (existsSync(output)) unlinkSync(output);
+      }
+    }, 30000);
+
+    it('should keep a date column as text when streaming values stop matching its format', async () => {
+      // La mitad de d son fechas y la otra mitad no: ningún valor puede quedar nulo
+      const drift = join(TEST_DIR, 'test_integration_date_drift.csv');
+      const output = join(TEST_DIR, 'output_date_drift.parquet');
+      const dates = Array.from({ length: 10000 }, (_, i) => `${i},2024-01-${String(i % 28 + 1).padStart(2, '0')}`);
+      const pending = Array.from({ length: 10000 }, (_, i) => `${10000 + i},pending${i}`);
+      writeFileSync(drift, `id,d\n${dates.join('\n')}\n${pending.join('\n')}\n`);
+      try {
+        const result = await convertToParquet(drift, { output, streaming: true });
+        expect(result.success).toBe(true);
+        expect(result.rows).toBe(20000);
+        expect(result.datetime_columns?.d).toBeUndefined();
+        const info = await getFileInfo(output);
+        expect(info.schema?.find(c => c.name === 'd')?.type).toBe('string');
+        expect(info.column_stats?.find(c => c.name === 'd')?.null_count).toBe(0);
+      } finally {
+        if (existsSync(drift))  unlinkSync(drift);
+        if (existsSync(output)) unlinkSync(output);
+      }
+    }, 30000);
+
+    it('should report the same date columns and timestamp unit on every engine', async () => {
+      // El lector Arrow del engine in-memory no tipa las fechas por su cuenta
+      const dated = join(TEST_DIR, 'test_integration_dates.csv');
+      const rows = Array.from({ length: 200 }, (_, i) =>
+        `${i},2024-01-${String(i % 28 + 1).padStart(2, '0')} 10:00:${String(i % 60).padStart(2, '0')}`);
+      writeFileSync(dated, `id,created_at\n${rows.join('\n')}\n`);
+      const outputs: string[] = [];
+      try {
+        for (const engine of ['in-memory', 'parallel', 'streaming'] as const) {
+          const output = join(TEST_DIR, `output_dates_${engine}.parquet`);
+          outputs.push(output);
+          const result = await convertToParquet(dated, { output, engine });
+          expect(result.success).toBe(true);
+          expect(result.datetime_columns).toEqual({ created_at: '%Y-%m-%d %H:%M:%S' });
+          const info = await getFileInfo(output);
+          expect(info.schema?.find(c => c.name === 'created_at')?.type).toBe('timestamp[us]');
+        }
+      } finally {
+        for (const file of [dated, ...outputs]) {
+          if (existsSync(file)) unlinkSync(file);
+        }
+      }
+    }, 60000);
+
+    it('should write a sample with the schema of the full conversion', async () => {
+      // empty no tiene valores: la conversión completa la elimina y la muestra también
+      const source = join(TEST_DIR, 'test_integration_sample.csv');
+      const full = join(TEST_DIR, 'output_sample_full.parquet');
+      const sample = join(TEST_DIR, 'output_sample.parquet');
+      const rows = Array.from({ length: 5000 }, (_, i) =>
+        `${i},${i % 3 ? 'OK' : 'KO'},${i * 1.5},2024-01-${String(i % 28 + 1).padStart(2, '0')} 10:00:00,`);
+      writeFileSync(source, `id,status,amount,created_at,empty\n${rows.join('\n')}\n`);
+      try {
+        const whole = await convertToParquet(source, { output: full });
+        const sampled = await convertToParquet(source, { output: sample, sample: 500, sampleSeed: 1 });
+        expect(whole.success).toBe(true);
+        expect(sampled.success).toBe(true);
+        expect(sampled.rows).toBe(500);
+        const [fullInfo, sampleInfo] = await Promise.all([getFileInfo(full), getFileInfo(sample)]);
+        expect(sampleInfo.schema).toEqual(fullInfo.schema);
+      } finally {
+        for (const file of [source, full, sample]) {
+          if (existsSync(file)) unlinkSync(file);
+        }
+      }
+    }, 60000);
   });
 
   // ── Backend Selection ─────────────────────────────────────────────────
@@ -322,5 +322,102 @@ describe('NativePythonBackend (mocked)', () => {
 
       warnSpy.mockRestore();
     });
+
+    it('should pass profiling flags', async () => {
+      mockSpawn.mockReturnValue(makeSuccessSpawn(MOCK_RESULT));
+
+      const backend = new NativePythonBackend();
+      await backend.convert(TEST_CSV, { profile: true, profileTrace: 'trace.json' });
+
+      const spawnArgs = mockSpawn.mock.calls[0][1] as string[];
+      expect(spawnArgs).toContain('--profile');
+      expect(spawnArgs[spawnArgs.indexOf('--profile-trace') + 1]).toBe('trace.json');
+    });
+
+    it('should pass the streaming memory limit', async () => {
+      mockSpawn.mockReturnValue(makeSuccessSpawn(MOCK_RESULT));
+
+      const backend = new NativePythonBackend();
+      await backend.convert(TEST_CSV, { streaming: true, memoryLimit: 256 });
+
+      const spawnArgs = mockSpawn.mock.calls[0][1] as string[];
+      expect(spawnArgs[spawnArgs.indexOf('--memory-limit') + 1]).toBe('256');
+    });
+
+    it('should pass the input encoding', async () => {
+      mockSpawn.mockReturnValue(makeSuccessSpawn(MOCK_RESULT));
+
+      const backend = new NativePythonBackend();
+      await backend.convert(TEST_CSV, { encoding: 'latin-1' });
+
+      const spawnArgs = mockSpawn.mock.calls[0][1] as string[];
+      expect(spawnArgs[spawnArgs.indexOf('--encoding') + 1]).toBe('latin-1');
+    });
+
+    it('should pass the sample spec and seed', async () => {
+      mockSpawn.mockReturnValue(makeSuccessSpawn(MOCK_RESULT));
+
+      const backend = new NativePythonBackend();
+      await backend.convert(TEST_CSV, { sample: '1%', sampleSeed: 0 });
+
+      const spawnArgs = mockSpawn.mock.calls[0][1] as string[];
+      expect(spawnArgs[spawnArgs.indexOf('--sample') + 1]).toBe('1%');
+      expect(spawnArgs[spawnArgs.indexOf('--seed') + 1]).toBe('0');
+    });
+
+    it('should pass the forced engine and explain flag', async () => {
+      mockSpawn.mockReturnValue(makeSuccessSpawn(MOCK_RESULT));
+
+      const backend = new NativePythonBackend();
+      await backend.convert(TEST_CSV, { engine: 'streaming', explain: true });
+
+      const spawnArgs = mockSpawn.mock.calls[0][1] as string[];
+      expect(spawnArgs[spawnArgs.indexOf('--engine') + 1]).toBe('streaming');
+      expect(spawnArgs).toContain('--explain');
+    });
+
+    it('should leave the engine to the planner when auto', async () => {
+      mockSpawn.mockReturnValue(makeSuccessSpawn(MOCK_RESULT));
+
+      const backend = new NativePythonBackend();
+      await backend.convert(TEST_CSV, { engine: 'auto' });
+
+      const spawnArgs = mockSpawn.mock.calls[0][1] as string[];
+      expect(spawnArgs).not.toContain('--engine');
+      expect(spawnArgs).not.toContain('--explain');
+    });
+
+    it('should pass column projection and row filter', async () => {
+      mockSpawn.mockReturnValue(makeSuccessSpawn(MOCK_RESULT));
+
+      const backend = new NativePythonBackend();
+      await backend.convert(TEST_CSV, { columns: ['id', 'amount'], filter: "status == 'OK'" });
+
+      const spawnArgs = mockSpawn.mock.calls[0][1] as string[];
+      expect(spawnArgs[spawnArgs.indexOf('--columns') + 1]).toBe('id,amount');
+      expect(spawnArgs[spawnArgs.indexOf('--filter') + 1]).toBe("status == 'OK'");
+    });
+
+    it('should not pass projection flags by default', async () => {
+      mockSpawn.mockReturnValue(makeSuccessSpawn(MOCK_RESULT));
+
+      const backend = new NativePythonBackend();
+      await backend.convert(TEST_CSV, { columns: [] });
+
+      const spawnArgs = mockSpawn.mock.calls[0][1] as string[];
+      expect(spawnArgs).not.toContain('--columns');
+      expect(spawnArgs).not.toContain('--filter');
+    });
+
+    it('should not pass profiling flags by default', async () => {
+      mockSpawn.mockReturnValue(makeSuccessSpawn(MOCK_RESULT));
+
+      const backend = new NativePythonBackend();
+      await backend.convert(TEST_CSV);
+
+      const spawnArgs = mockSpawn.mock.calls[0][1] as string[];
+      expect(spawnArgs).not.toContain('--profile');
+      expect(spawnArgs).not.toContain('--profile-trace');
+    });
   });
 });
\ No newline at end of file
@@ -0,0 +1,102 @@
+/**
+ * Tests del progreso en vivo: separación incremental de eventos en stderr,
+ * entrega durante la ejecución, --progress en los args y formato de la línea
+ * de estado.
+ */
+
+import { EventEmitter } from 'events';
+
+jest.mock('child_process');
+import { spawn } from 'child_process';
+import { createEventParser, runPythonJson, RunMessages } from '../src/utils/python-runner';
+import { buildPythonArgs } from '../src/backends/native-python';
+import { parseLastJsonLine } from '../src/utils/stream';
+import { formatProgressEvent } from '../src/utils/progress';
+import { ProgressEvent } from '../src/types';
+
+const mockSpawn = spawn as unknown as jest.Mock;
+
+const MSG: RunMessages = {
+  execError:   (m) => `exec: ${m}`,
+  parseError:  (e) => `parse: ${e.message}`,
+  nonZeroCode: (code) => `code ${code}`,
+};
+
+function event(overrides: Partial<ProgressEvent> = {}): ProgressEvent {
+  return {
+    event: 'progress', stage: 'pipeline', elapsed_s: 4, bytes_read: 50_000_000,
+    total_bytes: 100_000_000, rows_read: 1_000_000, rows_written: 800_000,
+    rows_per_s: 200_000, mb_per_s: 11.92, rss_mb: 310.4, percent: 45, eta_s: 4.9,
+    ...overrides,
+  };
+}
+
+beforeEach(() => mockSpawn.mockReset());
+
+describe('createEventParser', () => {
+  it('reassembles events split across chunks and returns the rest as text', () => {
+    const events: ProgressEvent[] = [];
+    const parser = createEventParser((e) => events.push(e));
+    const line = JSON.stringify(event());
+
+    expect(parser.push('[10:00:00] [INFO] Leyendo CSV\n' + line.slice(0, 20))).toBe('[10:00:00] [INFO] Leyendo CSV\n');
+    expect(events).toHaveLength(0);
+    expect(parser.push(line.slice(20) + '\nTraceback')).toBe('');
+    expect(events).toEqual([event()]);
+    expect(parser.flush()).toBe('Traceback\n');
+  });
+
+  it('keeps malformed event lines as stderr text', () => {
+    const parser = createEventParser(() => { throw new Error('no debería llamarse'); });
+    expect(parser.push('{"event": broken\n')).toBe('{"event": broken\n');
+  });
+});
+
+describe('runPythonJson with onEvent', () => {
+  it('delivers events before the process exits and keeps them out of stderr', async () => {
+    const proc = new EventEmitter() as any;
+    proc.stdout = new EventEmitter();
+    proc.stderr = new EventEmitter();
+    mockSpawn.mockImplementation(() => proc);
+
+    const seen: string[] = [];
+    const promise = runPythonJson('py', [], MSG, undefined, undefined, (e) => seen.push(e.stage));
+
+    proc.stderr.emit('data', Buffer.from(JSON.stringify(event({ stage: 'read' })) + '\n'));
+    expect(seen).toEqual(['read']);
+
+    proc.stdout.emit('data', Buffer.from('garbage'));
+    proc.stderr.emit('data', Buffer.from(JSON.stringify(event({ stage: 'failed' })) + '\nboom'));
+    proc.emit('close', 2);
+    // El error es el stderr sin los eventos
+    await expect(promise).rejects.toThrow(/^boom\s*$/);
+    expect(seen).toEqual(['read', 'failed']);
+  });
+});
+
+describe('progress options', () => {
+  it('adds --progress with onProgress and --metrics-file', () => {
+    const args = buildPythonArgs('conv.py', 'in.csv', { onProgress: () => {}, metricsFile: 'job.prom' });
+    expect(args).toEqual(expect.arrayContaining(['--progress', '--metrics-file', 'job.prom']));
+    expect(buildPythonArgs('conv.py', 'in.csv', {})).not.toContain('--progress');
+  });
+
+  it('parseLastJsonLine skips trailing progress events', () => {
+    const result = { success: true, rows: 3 };
+    const text = `${JSON.stringify(result)}\n${JSON.stringify(event({ stage: 'done' }))}\n`;
+    expect(parseLastJsonLine(text)).toEqual(result);
+  });
+});
+
+describe('formatProgressEvent', () => {
+  it('shows stage, rows, throughput, memory and ETA', () => {
+    expect(formatProgressEvent(event())).toBe(
+      'Procesando chunks | 800,000 filas | 200,000 filas/s | 11.9 MB/s | 310 MB RSS | ETA 5s');
+  });
+
+  it('omits what cannot be estimated yet', () => {
+    expect(formatProgressEvent(event({
+      stage: 'read', rows_read: 0, rows_written: 0, rows_per_s: null, mb_per_s: null, eta_s: null,
+    }))).toBe('Leyendo datos | 310 MB RSS');
+  });
+});
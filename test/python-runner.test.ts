@@ -12,6 +12,7 @@ import {
   preferredPythonCommand,
   findPython,
   runPythonToJson,
+  runPythonJson,
   RunMessages,
 } from '../src/utils/python-runner';
 
@@ -170,3 +171,23 @@ describe('runPythonToJson', () => {
     expect(mockSpawn).toHaveBeenCalledWith('py', ['x'], { stdio: ['pipe', 'pipe', 'pipe'], env: { A: '1' } });
   });
 });
+
+// ── runPythonJson ───────────────────────────────────────────────────────────
+
+describe('runPythonJson', () => {
+  it('returns the parsed JSON without tagging a backend', async () => {
+    mockSpawn.mockImplementation(() => fakeProc({ code: 0, stdout: okResult }));
+    const r = await runPythonJson('python3', ['s.py'], MSG);
+    expect(r).toEqual({ success: true, rows: 1 });
+  });
+
+  it('accepts extra exit codes as a result', async () => {
+    mockSpawn.mockImplementation(() => fakeProc({ code: 3, stdout: okResult }));
+    await expect(runPythonJson('python3', [], MSG, undefined, [0, 3])).resolves.toEqual({ success: true, rows: 1 });
+  });
+
+  it('still rejects exit codes outside okCodes', async () => {
+    mockSpawn.mockImplementation(() => fakeProc({ code: 3, stdout: '' }));
+    await expect(runPythonJson('python3', [], MSG)).rejects.toThrow('code 3');
+  });
+});
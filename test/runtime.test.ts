@@ -5,10 +5,13 @@
 
 import {
   PYODIDE_CDN,
+  PYODIDE_VERSION,
   isNodeRuntime,
   defaultIndexURL,
   loadPyodideSource,
+  defaultCacheDir,
 } from '../src/utils/runtime';
+import * as path from 'path';
 
 describe('isNodeRuntime', () => {
   it('is true under Node (jest)', () => {
@@ -44,6 +47,10 @@ describe('loadPyodideSource', () => {
   it('reads the real .py file under Node (default)', async () => {
     const src = await loadPyodideSource();
     expect(src).toContain('def upc_convert');
+    // projection.py va incluido: el mismo --filter que el conversor nativo
+    expect(src).toContain('class RowFilter');
+    // y widening.py: upc_merge ensancha los shards como el conversor nativo
+    expect(src).toContain('def _widen_schemas');
   });
 
   it('uses an injected readSource under Node', async () => {
@@ -51,24 +58,49 @@ describe('loadPyodideSource', () => {
     expect(src).toBe('FAKE_PY');
   });
 
-  it('fetches the source in the browser branch', async () => {
-    const fetchFn = jest.fn().mockResolvedValue({ text: async () => 'FETCHED_PY' });
+  it('fetches the source and its shared modules in the browser branch', async () => {
+    const fetchFn = jest.fn().mockImplementation(async (url: string) => ({
+      text: async () => (url === './x.py' ? 'FETCHED_PY' : 'MODULE_PY'),
+    }));
     const src = await loadPyodideSource({ node: false, fetchFn, url: './x.py' });
     expect(fetchFn).toHaveBeenCalledWith('./x.py');
-    expect(src).toBe('FETCHED_PY');
+    expect(fetchFn).toHaveBeenCalledWith('./projection.py');
+    expect(fetchFn).toHaveBeenCalledWith('./widening.py');
+    expect(src).toContain('_sys.modules["projection"] = _module');
+    expect(src).toContain('_sys.modules["widening"] = _module');
+    expect(src).toContain('"MODULE_PY"');
+    expect(src.endsWith('\nFETCHED_PY')).toBe(true);
   });
 
   it('uses the default url in the browser branch', async () => {
     const fetchFn = jest.fn().mockResolvedValue({ text: async () => 'D' });
     await loadPyodideSource({ node: false, fetchFn });
     expect(fetchFn).toHaveBeenCalledWith('./python/pyodide_convert.py');
+    expect(fetchFn).toHaveBeenCalledWith('./python/projection.py');
+    expect(fetchFn).toHaveBeenCalledWith('./python/widening.py');
   });
 
   it('falls back to global fetch when no fetchFn is injected (browser)', async () => {
     const original = (globalThis as any).fetch;
     (globalThis as any).fetch = jest.fn().mockResolvedValue({ text: async () => 'GLOBAL_PY' });
     const src = await loadPyodideSource({ node: false });
-    expect(src).toBe('GLOBAL_PY');
+    expect(src.endsWith('\nGLOBAL_PY')).toBe(true);
     (globalThis as any).fetch = original;
   });
 });
+
+describe('defaultCacheDir', () => {
+  it('honors UPC_PYODIDE_CACHE', () => {
+    expect(defaultCacheDir({ env: { UPC_PYODIDE_CACHE: '/x/cache' } })).toBe('/x/cache');
+  });
+
+  it('uses XDG_CACHE_HOME when set', () => {
+    const dir = defaultCacheDir({ env: { XDG_CACHE_HOME: '/xdg' } });
+    expect(dir).toBe(path.join('/xdg', 'ultra-parquet-converter', `pyodide-${PYODIDE_VERSION}`));
+  });
+
+  it('falls back to ~/.cache', () => {
+    const dir = defaultCacheDir({ env: {}, homedir: () => '/home/u' });
+    expect(dir.startsWith(path.join('/home/u', '.cache'))).toBe(true);
+  });
+});
@@ -2,7 +2,7 @@
  * Backend Selector Tests
  */
 
-import { BackendSelector } from '../src/backends/selector';
+import { BackendSelector, rankBackends, PYODIDE_HEAP_BYTES } from '../src/backends/selector';
 import { BackendType } from '../src/types';
 
 // ─── Mock: detectEnvironment ───────────────────────────────────────────────────
@@ -122,6 +122,52 @@ describe('BackendSelector', () => {
     });
   });
 
+  // ── Modelo de coste ──────────────────────────────────────────────────────────
+
+  describe('rankBackends', () => {
+
+    it('should rank only available backends, fastest first', () => {
+      const ranked = rankBackends(makeEnv({ hasCython: true }) as any, 500_000_000);
+      expect(ranked.map((c) => c.backend)).toEqual(['cython', 'native-python', 'portable-python', 'pyodide']);
+      expect(ranked[0].estimated_s).toBeLessThan(ranked[1].estimated_s);
+    });
+
+    it('should prefer native python over cython for small files (startup cost)', () => {
+      const ranked = rankBackends(makeEnv({ hasCython: true }) as any, 1_000_000);
+      expect(ranked[0].backend).toBe('native-python');
+    });
+
+    it('should mark pyodide as not fitting when the file exceeds the wasm heap', () => {
+      const ranked = rankBackends(makeEnv() as any, PYODIDE_HEAP_BYTES);
+      expect(ranked.find((c) => c.backend === 'pyodide')?.fits).toBe(false);
+      expect(ranked.find((c) => c.backend === 'native-python')?.fits).toBe(true);
+    });
+  });
+
+  describe('planBackend', () => {
+
+    it('should skip pyodide when the file does not fit its heap', async () => {
+      // Sin Python nativo en Node: portable-python es la alternativa que cabe
+      mockDetectEnvironment.mockResolvedValue(makeEnv({ hasPython: false }));
+      const plan = await selector.planBackend({ fileSize: 5 * 1024 ** 3 });
+      expect(plan.backend).toBe('portable-python');
+      expect(plan.candidates.length).toBe(2);
+    });
+
+    it('should still pick pyodide with a warning when it is the only backend', async () => {
+      mockDetectEnvironment.mockResolvedValue(makeEnv({
+        hasPython: false, isNode: false, isBrowser: true,
+      }));
+      const warnSpy = jest.spyOn(console, 'warn').mockImplementation(() => {});
+
+      const plan = await selector.planBackend({ fileSize: 5 * 1024 ** 3 });
+
+      expect(plan.backend).toBe('pyodide');
+      expect(warnSpy).toHaveBeenCalled();
+      warnSpy.mockRestore();
+    });
+  });
+
   // ── getAvailableBackends ─────────────────────────────────────────────────────
 
   describe('getAvailableBackends', () => {
@@ -206,6 +252,34 @@ describe('BackendSelector', () => {
       expect(selector.getCurrentBackend()).toBe('native-python');
     });
 
+    it('should re-plan the backend per file when it was chosen automatically', async () => {
+      mockDetectEnvironment.mockResolvedValue(makeEnv({ hasCython: true }));
+
+      const native = { convert: jest.fn().mockResolvedValue({ success: true }) };
+      const cython = { convert: jest.fn().mockResolvedValue({ success: true }) };
+      (selector as any).backends.set('native-python', native);
+      (selector as any).backends.set('cython', cython);
+
+      await selector.convert('small.csv', { fileSize: 1_000 });
+      expect(selector.getCurrentBackend()).toBe('native-python');
+
+      const result = await selector.convert('big.csv', { fileSize: 200_000_000, explain: true });
+      expect(selector.getCurrentBackend()).toBe('cython');
+      expect(result.backend_plan?.backend).toBe('cython');
+      expect(result.backend_plan?.file_size).toBe(200_000_000);
+    });
+
+    it('should keep a manually set backend across conversions', async () => {
+      const mockBackend = { convert: jest.fn().mockResolvedValue({ success: true }) };
+      (selector as any).backends.set('pyodide', mockBackend);
+      selector.setBackend('pyodide');
+
+      const result = await selector.convert('file.csv', { fileSize: 100_000_000, explain: true });
+
+      expect(selector.getCurrentBackend()).toBe('pyodide');
+      expect(result.backend_plan).toBeUndefined();
+    });
+
     // Cubre líneas 101-102: !backend → throw 'no disponible'
     it('should throw when backend is not in the map', async () => {
       // Fuerza currentBackend a un valor inexistente en el Map
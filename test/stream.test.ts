@@ -0,0 +1,101 @@
+/**
+ * Tests del conversor por streams: args con '-', parseo del resultado desde
+ * stderr (salida a stream) o stdout (salida a archivo) y conexión de pipes.
+ */
+
+import { EventEmitter } from 'events';
+import { PassThrough, Readable } from 'stream';
+
+jest.mock('child_process');
+import { spawn } from 'child_process';
+import { buildStreamArgs, convertStream, parseLastJsonLine } from '../src/utils/stream';
+
+const mockSpawn = spawn as unknown as jest.Mock;
+
+// Proceso falso: al cerrarse stdin "convierte" (eco) y emite el resultado
+function fakeProc(opts: { code?: number; stdout?: string; stderr?: string; echo?: boolean }) {
+  const proc = new EventEmitter() as any;
+  proc.stdin = new PassThrough();
+  proc.stdout = new PassThrough();
+  proc.stderr = new PassThrough();
+  proc.kill = jest.fn();
+  const input: Buffer[] = [];
+  proc.stdin.on('data', (d: Buffer) => input.push(d));
+  const finish = () => {
+    if (opts.echo) proc.stdout.write(Buffer.concat(input));
+    if (opts.stdout) proc.stdout.write(opts.stdout);
+    if (opts.stderr) proc.stderr.write(opts.stderr);
+    proc.stdout.end();
+    proc.stderr.end();
+    setImmediate(() => proc.emit('close', opts.code ?? 0));
+  };
+  if (opts.echo) proc.stdin.on('end', finish);
+  else process.nextTick(finish);
+  return proc;
+}
+
+const RESULT = { success: true, rows: 3, columns: 2, input_file: '<stdin>', output_file: '<stdout>' };
+
+beforeEach(() => mockSpawn.mockReset());
+
+describe('buildStreamArgs', () => {
+  it("uses '-' for stream input and output", () => {
+    const args = buildStreamArgs('conv.py', new PassThrough(), new PassThrough(), { inputFormat: 'ndjson' });
+    expect(args.slice(0, 2)).toEqual(['conv.py', '-']);
+    expect(args).toEqual(expect.arrayContaining(['-o', '-', '--format', 'ndjson']));
+  });
+
+  it('keeps file paths as they are', () => {
+    const args = buildStreamArgs('conv.py', 'in.csv', 'out.parquet');
+    expect(args.slice(0, 4)).toEqual(['conv.py', 'in.csv', '-o', 'out.parquet']);
+  });
+});
+
+describe('parseLastJsonLine', () => {
+  it('skips verbose logs and returns the last JSON object', () => {
+    const text = `[10:00:00] [INFO] Leyendo CSV\n{"a": 1}\n[10:00:01] [INFO] fin\n${JSON.stringify(RESULT)}\n`;
+    expect(parseLastJsonLine(text)).toEqual(RESULT);
+  });
+
+  it('returns null without JSON', () => {
+    expect(parseLastJsonLine('Traceback...\n')).toBeNull();
+  });
+});
+
+describe('convertStream', () => {
+  it('pipes input to Python and Parquet bytes to the output stream', async () => {
+    mockSpawn.mockImplementation(() => fakeProc({ echo: true, stderr: JSON.stringify(RESULT) + '\n' }));
+    const output = new PassThrough();
+    const chunks: Buffer[] = [];
+    output.on('data', (d: Buffer) => chunks.push(d));
+
+    const result = await convertStream(Readable.from([Buffer.from('a,b\n1,2\n')]), output, {}, { python: 'py3', script: 'conv.py' });
+
+    expect(result).toMatchObject({ ...RESULT, backend: 'native-python' });
+    expect(Buffer.concat(chunks).toString()).toBe('a,b\n1,2\n');
+    expect(mockSpawn.mock.calls[0][1].slice(0, 4)).toEqual(['conv.py', '-', '-o', '-']);
+    expect(mockSpawn.mock.calls[0][2].stdio).toEqual(['pipe', 'pipe', 'pipe']);
+  });
+
+  it('reads the result from stdout when the output is a file', async () => {
+    mockSpawn.mockImplementation(() => fakeProc({ echo: true, stdout: JSON.stringify(RESULT) }));
+    const result = await convertStream(Readable.from(['x']), 'out.parquet', {}, { python: 'py3', script: 'conv.py' });
+    expect(result.rows).toBe(3);
+  });
+
+  it('rejects with the Python error', async () => {
+    mockSpawn.mockImplementation(() => fakeProc({
+      code: 1,
+      stderr: JSON.stringify({ success: false, error: 'SQLite necesita un archivo en disco' }),
+    }));
+    await expect(convertStream('in.db', new PassThrough(), {}, { python: 'py3', script: 'conv.py' }))
+      .rejects.toThrow('SQLite necesita un archivo en disco');
+    expect(mockSpawn.mock.calls[0][2].stdio[0]).toBe('ignore');
+  });
+
+  it('rejects with stderr when there is no JSON', async () => {
+    mockSpawn.mockImplementation(() => fakeProc({ code: 1, stderr: 'Traceback: boom' }));
+    await expect(convertStream('in.csv', new PassThrough(), {}, { python: 'py3', script: 'conv.py' }))
+      .rejects.toThrow('Traceback: boom');
+  });
+});
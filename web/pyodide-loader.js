@@ -2,6 +2,10 @@
  * Ultra Parquet Converter — Pyodide Loader
  * Manages the Web Worker lifecycle and provides a clean async API
  * for the main thread to communicate with the worker.
+ *
+ * PyodideConverter   → one worker, one Pyodide instance.
+ * PyodideWorkerPool  → N warm workers; splits large CSV/NDJSON files at record
+ *                      boundaries and converts the shards in parallel.
  */
 
 'use strict';
@@ -13,6 +17,7 @@ class PyodideConverter {
     this._worker   = null;
     this._ready    = false;
     this._pending  = null;   // { resolve, reject } for current conversion
+    this._ack      = null;   // resolver for the next 'chunk-ack' (streamed uploads)
     this._onProgress = null; // progress callback
   }
 
@@ -43,6 +48,14 @@ class PyodideConverter {
             }
             break;
 
+          case 'chunk-ack':
+            if (this._ack) {
+              const ack = this._ack;
+              this._ack = null;
+              ack();
+            }
+            break;
+
           case 'result':
             if (this._pending) {
               this._pending.resolve(result);
@@ -52,6 +65,12 @@ class PyodideConverter {
 
           case 'error':
             const err = new Error(message);
+            // Unblock a streamed upload waiting for an ack; it sees `failed`
+            if (this._ack) {
+              const ack = this._ack;
+              this._ack = null;
+              ack();
+            }
             if (this._pending) {
               this._pending.reject(err);
               this._pending = null;
@@ -81,7 +100,8 @@ class PyodideConverter {
   /**
    * Converts data to Parquet format.
    * @param {string|ArrayBuffer} data  - Input data (text or binary)
-   * @param {object}             options - Conversion options
+   * @param {object}             options - Conversion options (compression, autoRepair,
+   *                                       columns: string[], filter: string)
    * @param {function}           onProgress - Progress callback
    * @returns {Promise<ConversionResult>}
    */
@@ -107,11 +127,91 @@ class PyodideConverter {
   }
 
   /**
-   * Reads a File object as text or ArrayBuffer based on file type.
+   * Streams a File/Blob to the worker in chunks and converts it to Parquet.
+   * Only one chunk is in flight at a time (the worker acks each write), so
+   * files larger than a single JS string can be converted.
+   * @param {File}     file
+   * @param {object}   options    - Conversion options
+   * @param {function} onProgress - Progress callback
+   * @returns {Promise<ConversionResult>}
+   */
+  async convertFile(file, options = {}, onProgress) {
+    if (!this._worker) {
+      throw new Error('Worker not initialized. Call init() first.');
+    }
+
+    if (this._pending) {
+      throw new Error('A conversion is already in progress.');
+    }
+
+    this._onProgress = onProgress || this._onProgress;
+    const mode = PyodideConverter.isBinaryFile(file) ? 'binary' : 'text';
+
+    const result = new Promise((resolve, reject) => {
+      this._pending = { resolve, reject };
+    });
+    // A failure mid-upload rejects `result`; stop streaming when that happens.
+    let failed = false;
+    result.catch(() => { failed = true; });
+
+    const send = (message, transfer = []) => new Promise((resolve) => {
+      this._ack = resolve;
+      this._worker.postMessage(message, transfer);
+    });
+
+    await send({ type: 'begin', mode, options });
+    const reader = file.stream().getReader();
+    let sent = 0;
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done || failed) break;
+      // Transfer instead of cloning. The view may cover only part of its
+      // buffer: then only that range is copied out and sent. The length is
+      // read first, since a transferred view reads as 0 bytes.
+      const length = value.byteLength;
+      const data = value.byteOffset === 0 && length === value.buffer.byteLength
+        ? value.buffer
+        : value.buffer.slice(value.byteOffset, value.byteOffset + length);
+      await send({ type: 'chunk', data }, [data]);
+      sent += length;
+      if (this._onProgress) {
+        this._onProgress({
+          stage: '📤 Uploading data to the Python engine...',
+          percent: Math.round((sent / Math.max(file.size, 1)) * 50),
+        });
+      }
+    }
+    if (!failed) this._worker.postMessage({ type: 'end' });
+    return result;
+  }
+
+  /**
+   * Stitches shard Parquet files (ArrayBuffers, transferred) into one file.
+   * @param {ArrayBuffer[]} parts
+   * @param {object}        options - Conversion options (compression)
+   * @returns {Promise<{rows, columns, row_groups, output_size, compression_used, parquet_bytes}>}
+   */
+  async merge(parts, options = {}) {
+    if (!this._worker) {
+      throw new Error('Worker not initialized. Call init() first.');
+    }
+
+    if (this._pending) {
+      throw new Error('A conversion is already in progress.');
+    }
+
+    return new Promise((resolve, reject) => {
+      this._pending = { resolve, reject };
+      this._worker.postMessage({ type: 'merge', parts, options }, parts);
+    });
+  }
+
+  /**
+   * Whether a File should be handed to Python as binary (Excel/Parquet/...).
    * @param {File} file
-   * @returns {Promise<{ data: string|ArrayBuffer, type: 'text'|'binary' }>}
+   * @returns {boolean}
    */
-  static async readFile(file) {
+  static isBinaryFile(file) {
     const BINARY_TYPES = [
       'application/vnd.ms-excel',
       'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
@@ -119,8 +219,17 @@ class PyodideConverter {
     ];
     const BINARY_EXTS = ['.xlsx', '.xls', '.parquet', '.feather', '.arrow', '.orc', '.avro', '.sqlite', '.db', '.sav', '.sas7bdat', '.dta'];
 
-    const ext    = '.' + file.name.split('.').pop().toLowerCase();
-    const isBin  = BINARY_TYPES.includes(file.type) || BINARY_EXTS.includes(ext);
+    const ext = '.' + file.name.split('.').pop().toLowerCase();
+    return BINARY_TYPES.includes(file.type) || BINARY_EXTS.includes(ext);
+  }
+
+  /**
+   * Reads a File object as text or ArrayBuffer based on file type.
+   * @param {File} file
+   * @returns {Promise<{ data: string|ArrayBuffer, type: 'text'|'binary' }>}
+   */
+  static async readFile(file) {
+    const isBin = PyodideConverter.isBinaryFile(file);
 
     return new Promise((resolve, reject) => {
       const reader = new FileReader();
@@ -149,8 +258,8 @@ class PyodideConverter {
       throw new Error('No parquet bytes in result');
     }
 
-    const bytes = new Uint8Array(result.parquet_bytes);
-    const blob  = new Blob([bytes], { type: 'application/octet-stream' });
+    // parquet_bytes arrives as a transferred Uint8Array — no copy needed
+    const blob  = new Blob([result.parquet_bytes], { type: 'application/octet-stream' });
     const url   = URL.createObjectURL(blob);
 
     const baseName = originalName.replace(/\.[^/.]+$/, '');
@@ -172,7 +281,191 @@ class PyodideConverter {
       this._worker  = null;
       this._ready   = false;
       this._pending = null;
+      this._ack     = null;
+    }
+  }
+}
+
+// ─── PyodideWorkerPool ─────────────────────────────────────────────────────────
+
+const SHARD_MIN_BYTES      = 8 * 1024 * 1024;   // below this one worker is faster
+const SHARD_MAX_BYTES      = 64 * 1024 * 1024;  // bounds the WASM heap per shard
+const BOUNDARY_PROBE_BYTES = 1024 * 1024;       // window scanned for the next '\n'
+
+class PyodideWorkerPool {
+  /**
+   * @param {number} [size] - Number of workers (default: cores - 1, min 1)
+   */
+  constructor(size) {
+    const cores = (typeof navigator !== 'undefined' && navigator.hardwareConcurrency) || 2;
+    this.size         = Math.max(1, size || cores - 1);
+    this._workers     = [];
+    this._initPromise = null;
+  }
+
+  /**
+   * Starts every worker once; later calls reuse the warm interpreters.
+   * @param {function} onProgress - Callback({ stage, percent }) for the first worker
+   * @returns {Promise<void>}
+   */
+  async init(onProgress) {
+    if (!this._initPromise) {
+      this._workers = Array.from({ length: this.size }, () => new PyodideConverter());
+      this._initPromise = Promise.all(
+        this._workers.map((w, i) => w.init(i === 0 ? onProgress : undefined)),
+      ).catch((err) => {
+        this.destroy();
+        throw err;
+      });
+    }
+    await this._initPromise;
+  }
+
+  /**
+   * Returns 'delimited' | 'ndjson' when the file can be split at line
+   * boundaries, or null (JSON arrays, binary formats).
+   * @param {File} file
+   */
+  static async sniffFormat(file) {
+    if (PyodideConverter.isBinaryFile(file)) return null;
+    const head      = (await file.slice(0, 4096).text()).replace(/^\uFEFF/, '').trimStart();
+    const firstLine = head.split('\n', 1)[0].trim();
+    if (head.startsWith('[')) return null;
+    if (firstLine.startsWith('{')) return firstLine.endsWith('}') ? 'ndjson' : null;
+    return 'delimited';
+  }
+
+  /** Offset just past the first '\n' at or after `pos` (file.size if none). */
+  static async nextLineStart(file, pos) {
+    while (pos < file.size) {
+      const window = new Uint8Array(await file.slice(pos, pos + BOUNDARY_PROBE_BYTES).arrayBuffer());
+      const idx = window.indexOf(10);
+      if (idx !== -1) return pos + idx + 1;
+      pos += window.length;
+    }
+    return file.size;
+  }
+
+  /**
+   * Splits the body of `file` into line-aligned [start, end) byte ranges.
+   * Delimited files keep their header apart so every shard can be prefixed.
+   * Note: quoted fields spanning several lines are not supported here.
+   */
+  async planShards(file, format) {
+    const headerEnd = format === 'delimited' ? await PyodideWorkerPool.nextLineStart(file, 0) : 0;
+    const body      = file.size - headerEnd;
+    const count     = Math.max(this.size, Math.ceil(body / SHARD_MAX_BYTES));
+    const target    = Math.max(1, Math.ceil(body / count));
+
+    const shards = [];
+    let start = headerEnd;
+    while (start < file.size) {
+      const end = await PyodideWorkerPool.nextLineStart(file, start + target - 1);
+      shards.push([start, end]);
+      start = end;
+    }
+    return { headerEnd, shards };
+  }
+
+  /**
+   * Converts a File using every worker. Small or non-splittable inputs go to a
+   * single worker. Shards are deduplicated independently (auto-repair), and
+   * their outputs are stitched into one Parquet file by concatenating row
+   * groups — or returned as a multi-file dataset with `shardOutput: 'dataset'`.
+   * @param {File}     file
+   * @param {object}   options    - Conversion options (+ shardOutput: 'file'|'dataset')
+   * @param {function} onProgress - Progress callback
+   * @returns {Promise<ConversionResult>}
+   */
+  async convertFile(file, options = {}, onProgress) {
+    await this.init();
+    const format = await PyodideWorkerPool.sniffFormat(file);
+    if (!format || this.size === 1 || file.size < SHARD_MIN_BYTES) {
+      return this._workers[0].convertFile(file, options, onProgress);
+    }
+
+    const startTime = Date.now();
+    const { headerEnd, shards } = await this.planShards(file, format);
+    const header  = file.slice(0, headerEnd);
+    const results = new Array(shards.length);
+    const silent  = () => {};
+    let next = 0;
+    let done = 0;
+
+    const report = (stage, percent) => {
+      if (onProgress) onProgress({ stage, percent });
+    };
+
+    // Each warm worker pulls the next shard until none are left
+    const drain = async (worker, workerIndex) => {
+      while (next < shards.length) {
+        const index = next++;
+        const [start, end] = shards[index];
+        const shard = new File([header, file.slice(start, end)], file.name);
+        const shardStart = Date.now();
+        const result = await worker.convertFile(shard, options, silent);
+        results[index] = { ...result, worker: workerIndex, elapsed_time: (Date.now() - shardStart) / 1000 };
+        done++;
+        report(`⚙️ Converted shard ${done}/${shards.length}`, Math.round((done / shards.length) * 85));
+      }
+    };
+    await Promise.all(this._workers.map(drain));
+
+    const shardStats = results.map((r, i) => ({
+      shard:        i,
+      worker:       r.worker,
+      rows:         r.rows,
+      input_size:   r.input_size,
+      output_size:  r.output_size,
+      elapsed_time: r.elapsed_time,
+    }));
+    const base = {
+      success:          true,
+      backend:          'pyodide',
+      file_type:        results[0].file_type,
+      input_size:       file.size,
+      compression_used: results[0].compression_used,
+      shards:           shardStats,
+      limitations:      results[0].limitations,
+    };
+
+    if (options.shardOutput === 'dataset') {
+      const outputSize = results.reduce((n, r) => n + r.output_size, 0);
+      report('✅ Done!', 100);
+      return {
+        ...base,
+        rows:              results.reduce((n, r) => n + r.rows, 0),
+        columns:           Math.max(...results.map((r) => r.columns)),
+        output_size:       outputSize,
+        compression_ratio: Math.round((1 - outputSize / Math.max(file.size, 1)) * 10000) / 100,
+        elapsed_time:      (Date.now() - startTime) / 1000,
+        parts:             results.map((r) => r.parquet_bytes),
+      };
     }
+
+    report('🧵 Stitching shards...', 90);
+    const merged = await this._workers[0].merge(results.map((r) => r.parquet_bytes.buffer), options);
+    report('✅ Done!', 100);
+    return {
+      ...base,
+      rows:              merged.rows,
+      columns:           merged.columns,
+      row_groups:        merged.row_groups,
+      output_size:       merged.output_size,
+      compression_used:  merged.compression_used,
+      compression_ratio: Math.round((1 - merged.output_size / Math.max(file.size, 1)) * 10000) / 100,
+      elapsed_time:      (Date.now() - startTime) / 1000,
+      parquet_bytes:     merged.parquet_bytes,
+    };
+  }
+
+  /**
+   * Terminates every worker in the pool.
+   */
+  destroy() {
+    for (const worker of this._workers) worker.destroy();
+    this._workers     = [];
+    this._initPromise = null;
   }
 }
 
@@ -215,7 +508,8 @@ function formatNumber(n) {
 
 // ─── Export ───────────────────────────────────────────────────────────────────
 
-window.PyodideConverter = PyodideConverter;
+window.PyodideConverter  = PyodideConverter;
+window.PyodideWorkerPool = PyodideWorkerPool;
 window.formatBytes      = formatBytes;
 window.formatTime       = formatTime;
 window.formatNumber     = formatNumber;
\ No newline at end of file
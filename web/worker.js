@@ -3,18 +3,41 @@
  * Runs Pyodide conversion in a background thread to avoid blocking the UI.
  *
  * The Python conversion code is NOT duplicated here: it is fetched from the
- * single source of truth at ../python/pyodide_convert.py and loaded into
- * Pyodide once. Data is passed via globals (text) and a typed array (binary),
- * never interpolated into source strings.
+ * single source of truth at ../python/pyodide_convert.py (plus the modules it
+ * shares with the native converter: projection.py, widening.py) and loaded into
+ * Pyodide once. Data moves through the Pyodide virtual FS: input is written
+ * in chunks, the Parquet output is read back as a Uint8Array whose buffer is
+ * transferred to the main thread (no JSON number arrays, no giant strings).
  *
- * Messages received:  { type: 'init' } | { type: 'convert', data, options }
- * Messages sent:      { type: 'ready' | 'progress' | 'result' | 'error', ... }
+ * Warm start: every fetch of a Pyodide CDN asset (packages/wheels included)
+ * goes through the Cache API, so pandas/pyarrow/numpy are downloaded once per
+ * browser.
+ *
+ * Messages received:
+ *   { type: 'init' }
+ *   { type: 'convert', data, options }          — whole payload at once
+ *   { type: 'begin', mode, options }            — start a streamed payload
+ *   { type: 'chunk', data }                     — ArrayBuffer | string
+ *   { type: 'end' }                             — convert the streamed payload
+ *   { type: 'merge', parts, options }           — stitch shard Parquet files
+ * Messages sent:
+ *   { type: 'ready' | 'progress' | 'chunk-ack' | 'result' | 'error', ... }
  */
 
 'use strict';
 
-const PYODIDE_CDN = 'https://cdn.jsdelivr.net/pyodide/v0.24.1/full/';
+const PYODIDE_VERSION = '0.24.1';
+const PYODIDE_CDN = `https://cdn.jsdelivr.net/pyodide/v${PYODIDE_VERSION}/full/`;
 const PY_SOURCE_URL = '../python/pyodide_convert.py';
+// Modules pyodide_convert.py imports, shared with the native converter
+const PY_MODULES = ['projection', 'widening'];
+
+// Cache API bucket: a new Pyodide version starts from an empty cache.
+const CACHE_NAME = `upc-pyodide-v${PYODIDE_VERSION}`;
+
+// Must match INPUT_PATH / OUTPUT_PATH in pyodide_convert.py
+const FS_INPUT_PATH  = '/upc/input';
+const FS_OUTPUT_PATH = '/upc/output.parquet';
 
 const LIMITATIONS = [
   'Pyodide is 10-50x slower than native Python',
@@ -25,9 +48,69 @@ const LIMITATIONS = [
 let pyodide = null;
 let initPromise = null;
 let sourceLoaded = false;
+let sourcePromise = null;
+
+// Streamed payload in progress: { stream, mode, options, bytes }
+let upload = null;
+const encoder = new TextEncoder();
+
+// ─── Warm cache ───────────────────────────────────────────────────────────────
+
+/** Cache-first fetch for Pyodide CDN assets; anything else goes to the network. */
+const networkFetch = self.fetch.bind(self);
+self.fetch = async function cachedFetch(input, init) {
+  const url = typeof input === 'string' ? input : input.url;
+  if (!url.startsWith(PYODIDE_CDN) || typeof caches === 'undefined') {
+    return networkFetch(input, init);
+  }
+  const cache = await caches.open(CACHE_NAME);
+  const hit = await cache.match(url);
+  if (hit) return hit;
+  const res = await networkFetch(input, init);
+  if (res.ok) await cache.put(url, res.clone());
+  return res;
+};
 
 // ─── Initialization ───────────────────────────────────────────────────────────
 
+/**
+ * One runnable source: each module is registered in sys.modules before
+ * pyodide_convert.py imports it (same as bundlePyodideSource in src/utils/runtime.ts).
+ */
+function bundleSource(main, modules) {
+  const lines = ['import sys as _sys, types as _types'];
+  for (const [name, source] of Object.entries(modules)) {
+    lines.push(
+      `_module = _types.ModuleType(${JSON.stringify(name)})`,
+      `exec(compile(${JSON.stringify(source)}, ${JSON.stringify(name + '.py')}, 'exec'), _module.__dict__)`,
+      `_sys.modules[${JSON.stringify(name)}] = _module`,
+    );
+  }
+  lines.push('del _sys, _types' + (Object.keys(modules).length ? ', _module' : ''));
+  return lines.join('\n') + '\n' + main;
+}
+
+async function fetchText(url) {
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(`Cannot fetch ${url}: ${res.status}`);
+  return res.text();
+}
+
+/** Fetches the .py sources once. */
+function fetchSource() {
+  if (!sourcePromise) {
+    const base = PY_SOURCE_URL.slice(0, PY_SOURCE_URL.lastIndexOf('/') + 1);
+    sourcePromise = Promise.all(
+      [PY_SOURCE_URL, ...PY_MODULES.map((name) => `${base}${name}.py`)].map(fetchText),
+    ).then(([main, ...modules]) => bundleSource(main,
+      Object.fromEntries(PY_MODULES.map((name, i) => [name, modules[i]])))).catch((err) => {
+      sourcePromise = null;
+      throw err;
+    });
+  }
+  return sourcePromise;
+}
+
 async function initPyodide() {
   if (pyodide) return pyodide;
   if (initPromise) return initPromise;
@@ -44,6 +127,7 @@ async function initPyodide() {
     postMessage({ type: 'ready' });
     return pyodide;
   })().catch((err) => {
+    pyodide = null;
     initPromise = null;
     throw err;
   });
@@ -51,41 +135,55 @@ async function initPyodide() {
   return initPromise;
 }
 
-/** Fetches and defines upc_convert() in the interpreter once. */
+/** Defines upc_convert() in the interpreter once. */
 async function ensureSource() {
   if (sourceLoaded) return;
-  const res = await fetch(PY_SOURCE_URL);
-  if (!res.ok) throw new Error(`Cannot fetch ${PY_SOURCE_URL}: ${res.status}`);
-  const source = await res.text();
-  await pyodide.runPythonAsync(source);
+  await pyodide.runPythonAsync(await fetchSource());
   sourceLoaded = true;
 }
 
 // ─── Conversion ───────────────────────────────────────────────────────────────
 
-async function convert(inputData, options = {}) {
-  const startTime = Date.now();
+function toBytes(chunk) {
+  if (typeof chunk === 'string') return encoder.encode(chunk);
+  return chunk instanceof Uint8Array ? chunk : new Uint8Array(chunk);
+}
 
-  postMessage({ type: 'progress', stage: '⚙️ Initializing Python engine...', percent: 10 });
+/** Opens the MEMFS input file for a new payload. */
+async function beginUpload(mode, options = {}) {
   await initPyodide();
   await ensureSource();
+  if (upload) pyodide.FS.close(upload.stream);
+  pyodide.runPython('prepare_workspace()');
+  upload = { stream: pyodide.FS.open(FS_INPUT_PATH, 'w'), mode, options, bytes: 0 };
+}
+
+/** Appends one chunk to the MEMFS input file. */
+function writeChunk(chunk) {
+  if (!upload) throw new Error('No upload in progress. Send "begin" first.');
+  const bytes = toBytes(chunk);
+  pyodide.FS.write(upload.stream, bytes, 0, bytes.length);
+  upload.bytes += bytes.length;
+}
+
+/** Closes the input file, runs upc_convert and reads the Parquet back. */
+async function finishUpload() {
+  if (!upload) throw new Error('No upload in progress. Send "begin" first.');
+  const { stream, mode, options } = upload;
+  pyodide.FS.close(stream);
+  upload = null;
 
+  const startTime = Date.now();
   postMessage({ type: 'progress', stage: '🐍 Running Python conversion...', percent: 60 });
 
   const autoRepair  = options.autoRepair !== false;
   const compression = options.compression || 'snappy';
 
-  let mode;
-  if (inputData instanceof ArrayBuffer) {
-    mode = 'binary';
-    pyodide.globals.set('_upc_bytes', pyodide.toPy(new Uint8Array(inputData)));
-  } else {
-    mode = 'text';
-    pyodide.globals.set('_upc_text', inputData);
-  }
-
-  const call = `upc_convert(${JSON.stringify(mode)}, ${autoRepair ? 'True' : 'False'}, ${JSON.stringify(compression)})`;
-  const raw = await pyodide.runPythonAsync(call);
+  // A JSON list/string is also a valid Python literal
+  let call = `upc_convert(${JSON.stringify(mode)}, ${autoRepair ? 'True' : 'False'}, ${JSON.stringify(compression)}`;
+  if (options.columns && options.columns.length) call += `, columns=${JSON.stringify(options.columns)}`;
+  if (options.filter)                            call += `, row_filter=${JSON.stringify(options.filter)}`;
+  const raw = await pyodide.runPythonAsync(call + ')');
 
   let parsed;
   try {
@@ -98,17 +196,67 @@ async function convert(inputData, options = {}) {
     throw new Error(parsed.error || 'Conversion failed in Python');
   }
 
+  // readFile returns a fresh copy → its buffer can be transferred, not cloned
+  const outputPath = parsed.output_path || FS_OUTPUT_PATH;
+  const parquetBytes = pyodide.FS.readFile(outputPath);
+  pyodide.FS.unlink(outputPath);
+  delete parsed.output_path;
+
   postMessage({ type: 'progress', stage: '✅ Done!', percent: 100 });
 
   return {
     ...parsed,
-    success:      true,
-    backend:      'pyodide',
-    elapsed_time: (Date.now() - startTime) / 1000,
-    limitations:  LIMITATIONS,
+    success:       true,
+    backend:       'pyodide',
+    elapsed_time:  (Date.now() - startTime) / 1000,
+    limitations:   LIMITATIONS,
+    parquet_bytes: parquetBytes,
   };
 }
 
+async function convert(inputData, options = {}) {
+  postMessage({ type: 'progress', stage: '⚙️ Initializing Python engine...', percent: 10 });
+  const mode = inputData instanceof ArrayBuffer ? 'binary' : 'text';
+  await beginUpload(mode, options);
+  writeChunk(inputData);
+  return finishUpload();
+}
+
+/** Writes shard Parquet files to MEMFS and stitches their row groups into one. */
+async function mergeParts(parts, options = {}) {
+  await initPyodide();
+  await ensureSource();
+  pyodide.runPython('prepare_workspace()');
+
+  const paths = parts.map((buffer, i) => {
+    const path = `/upc/part-${i}.parquet`;
+    pyodide.FS.writeFile(path, new Uint8Array(buffer));
+    return path;
+  });
+
+  postMessage({ type: 'progress', stage: '🧵 Stitching shards...', percent: 90 });
+  const compression = options.compression || 'snappy';
+  const raw = await pyodide.runPythonAsync(
+    `upc_merge(${JSON.stringify(paths)}, compression=${JSON.stringify(compression)})`,
+  );
+
+  const parsed = JSON.parse(raw);
+  if (!parsed.success) {
+    throw new Error(parsed.error || 'Merge failed in Python');
+  }
+
+  const outputPath = parsed.output_path || FS_OUTPUT_PATH;
+  const parquetBytes = pyodide.FS.readFile(outputPath);
+  pyodide.FS.unlink(outputPath);
+  delete parsed.output_path;
+
+  return { ...parsed, parquet_bytes: parquetBytes };
+}
+
+function postResult(result) {
+  postMessage({ type: 'result', result }, [result.parquet_bytes.buffer]);
+}
+
 // ─── Message Handler ──────────────────────────────────────────────────────────
 
 self.onmessage = async (event) => {
@@ -118,11 +266,23 @@ self.onmessage = async (event) => {
       case 'init':
         await initPyodide();
         break;
-      case 'convert': {
-        const result = await convert(data, options || {});
-        postMessage({ type: 'result', result });
+      case 'convert':
+        postResult(await convert(data, options || {}));
+        break;
+      case 'begin':
+        await beginUpload(event.data.mode || 'text', options || {});
+        postMessage({ type: 'chunk-ack', bytes: 0 });
+        break;
+      case 'chunk':
+        writeChunk(data);
+        postMessage({ type: 'chunk-ack', bytes: upload.bytes });
+        break;
+      case 'end':
+        postResult(await finishUpload());
+        break;
+      case 'merge':
+        postResult(await mergeParts(event.data.parts, options || {}));
         break;
-      }
       default:
         postMessage({ type: 'error', message: `Unknown message type: ${type}` });
     }